@@ -0,0 +1,329 @@
+"""
+基准用例注册表 - 答案模块中的热点函数
+
+每个用例由 @benchmark 注册：setup(n, workdir) 在计时之外准备规模为 n 的输入，
+返回一个无参函数，计时只覆盖这个函数（处理完整的 n 条输入）。
+"""
+
+from __future__ import annotations
+
+import csv
+import importlib
+import io
+import logging
+import os
+import sys
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Callable, Dict, Tuple
+
+import generators as gen
+
+EXERCISES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "interview_exercises")
+if EXERCISES_DIR not in sys.path:
+    sys.path.insert(0, EXERCISES_DIR)
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+
+@dataclass
+class Benchmark:
+    name: str
+    module: str
+    setup: Callable[[int, str], Callable[[], object]]
+    sizes: Tuple[int, ...] = DEFAULT_SIZES
+    description: str = ""
+
+
+REGISTRY: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, module: str, sizes: Tuple[int, ...] = DEFAULT_SIZES):
+    """注册一个基准用例（名称唯一，函数的文档字符串第一行作为说明）"""
+    def decorator(setup):
+        doc = (setup.__doc__ or "").strip().splitlines()
+        REGISTRY[name] = Benchmark(name, module, setup, sizes, doc[0] if doc else "")
+        return setup
+    return decorator
+
+
+def load(module: str):
+    return importlib.import_module(module)
+
+
+@benchmark("topk", "set_C_answers")
+def _topk(n, workdir):
+    """Counter + 小顶堆取前 10 个高频词"""
+    topk = load("set_C_answers").topk
+    words = gen.words(n)
+    return lambda: topk(words, 10)
+
+
+@benchmark("LRU", "set_C_answers")
+def _lru(n, workdir):
+    """容量 1000 的 LRU 上执行 n 次 get/put"""
+    LRU = load("set_C_answers").LRU
+    ops = gen.cache_ops(n, keys=2000)
+
+    def run():
+        cache = LRU(1000)
+        for op, key in ops:
+            if op == "get":
+                cache.get(key)
+            else:
+                cache.put(key, key)
+    return run
+
+
+@benchmark("Trie.mask", "set_I_answers")
+def _trie_mask(n, workdir):
+    """1000 个敏感词的 Trie 遮蔽长度为 n 的文本"""
+    trie = load("set_I_answers").Trie()
+    vocabulary = gen.sensitive_words(1000)
+    for word in vocabulary:
+        trie.insert(word)
+    text = gen.chinese_text(n, vocabulary)
+    return lambda: trie.mask(text)
+
+
+@benchmark("kmp_search", "set_I_answers")
+def _kmp_search(n, workdir):
+    """在长度为 n 的文本中查找不存在的模式串（扫描全文）"""
+    kmp_search = load("set_I_answers").kmp_search
+    text = gen.text(n)
+    pattern = "abcdabcdabce"
+    return lambda: kmp_search(text, pattern)
+
+
+@benchmark("UnionFind", "set_I_answers")
+def _union_find(n, workdir):
+    """n 个节点上合并 n 条随机边"""
+    UnionFind = load("set_I_answers").UnionFind
+    edges = gen.edges(n)
+
+    def run():
+        uf = UnionFind(n)
+        for a, b in edges:
+            uf.union(a, b)
+    return run
+
+
+@benchmark("calc_iit", "set_E_answers")
+def _calc_iit(n, workdir):
+    """n 个应纳税所得额逐个计算个税"""
+    calc_iit = load("set_E_answers").calc_iit
+    incomes = gen.taxable_incomes(n)
+    return lambda: [calc_iit(x) for x in incomes]
+
+
+@benchmark("net_vat", "set_E_answers")
+def _net_vat(n, workdir):
+    """n 张进销项发票汇总应纳增值税"""
+    net_vat = load("set_E_answers").net_vat
+    invoices = gen.typed_invoices(n)
+    return lambda: net_vat(invoices)
+
+
+@benchmark("dedupe_invoices", "set_J_answers")
+def _dedupe_invoices(n, workdir):
+    """n 行发票（20% 重复）按代码+号码去重"""
+    dedupe_invoices = load("set_J_answers").dedupe_invoices
+    rows = gen.invoice_rows(n)
+    return lambda: dedupe_invoices(rows)
+
+
+@benchmark("read_filter_jsonl", "set_J_answers")
+def _read_filter_jsonl(n, workdir):
+    """解析 n 行 JSON Lines 并按期间过滤"""
+    read_filter_jsonl = load("set_J_answers").read_filter_jsonl
+    text = gen.jsonl_lines(n)
+    return lambda: read_filter_jsonl(text, "2024-06")
+
+
+@benchmark("apply_rules", "set_Y_answers")
+def _apply_rules(n, workdir):
+    """20 条规则逐行作用于 n 行数据"""
+    apply_rules = load("set_Y_answers").apply_rules
+    rules = gen.rules(20)
+    rows = gen.rule_rows(n)
+    return lambda: [apply_rules(row, rules) for row in rows]
+
+
+@benchmark("transform_rows", "set_Z_answers")
+def _transform_rows(n, workdir):
+    """校验并转换 n 行发票（解析金额、税率、日期，计算价税）"""
+    transform_rows = load("set_Z_answers").transform_rows
+    rows = gen.invoice_rows(n, duplicate_rate=0)
+    return lambda: transform_rows(rows)
+
+
+@benchmark("AuditLogger.write", "set_X_answers", sizes=(100, 1_000, 10_000))
+def _audit_logger_write(n, workdir):
+    """写入 n 条审计事件（64KB 轮转，保留 3 个备份）"""
+    AuditLogger = load("set_X_answers").AuditLogger
+    logger = AuditLogger(os.path.join(workdir, f"audit-{n}", "audit.log"),
+                         max_bytes=64 * 1024, backups=3)
+    events = gen.audit_events(n)
+
+    def run():
+        for event in events:
+            logger.write(event)
+    return run
+
+
+@benchmark("process_csv", "set_A_answers")
+def _process_csv(n, workdir):
+    """读取 n 行发票 CSV，追加税额列后写出"""
+    process_csv = load("set_A_answers").process_csv
+    text = gen.invoice_csv(gen.invoice_rows(n, duplicate_rate=0))
+    return lambda: process_csv(io.StringIO(text), io.StringIO(), 0.13)
+
+
+@benchmark("sum_by_dept", "set_A_answers")
+def _sum_by_dept(n, workdir):
+    """n 条 (部门, 金额) 按 5 个部门汇总"""
+    sum_by_dept = load("set_A_answers").sum_by_dept
+    rows = gen.dept_amounts(n)
+    return lambda: sum_by_dept(rows)
+
+
+@benchmark("run_pipeline", "set_AA_answers", sizes=(1_000, 10_000))
+def _run_pipeline(n, workdir):
+    """n 行发票分散在 n/5 个 CSV 中，8 线程解析、落库并生成报表"""
+    run_pipeline = load("set_AA_answers").run_pipeline
+    root = os.path.join(workdir, f"aa-{n}")
+    os.makedirs(root)
+    rows = gen.invoice_rows(n, duplicate_rate=0)
+    for i in range(0, n, 5):
+        with open(os.path.join(root, f"f_{i // 5:05d}.csv"), "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows[i:i + 5])
+    logger = logging.getLogger("bench.run_pipeline")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    return lambda: run_pipeline(root, logger, max_workers=8)
+
+
+@benchmark("aggregate", "set_AB_answers")
+def _aggregate(n, workdir):
+    """n 行发票按期间+部门汇总金额与税额"""
+    aggregate = load("set_AB_answers").aggregate
+    rows = gen.invoice_rows(n, duplicate_rate=0)
+    return lambda: aggregate(rows)
+
+
+@benchmark("unique_keep_order", "set_D_answers")
+def _unique_keep_order(n, workdir):
+    """n 个单词保序去重"""
+    unique_keep_order = load("set_D_answers").unique_keep_order
+    words = gen.words(n)
+    return lambda: unique_keep_order(words)
+
+
+@benchmark("calc_tax_decimal", "set_F_answers")
+def _calc_tax_decimal(n, workdir):
+    """n 个金额用 Decimal 计算含税价中的税额"""
+    calc_tax_decimal = load("set_F_answers").calc_tax_decimal
+    pairs = gen.amount_strings(n)
+    return lambda: [calc_tax_decimal(amount, rate) for amount, rate in pairs]
+
+
+@benchmark("merge_sum", "set_F_answers")
+def _merge_sum(n, workdir):
+    """n 行发票（20% 重复）按代码+号码合并金额"""
+    merge_sum = load("set_F_answers").merge_sum
+    rows = gen.invoice_rows(n)
+    return lambda: merge_sum(rows)
+
+
+@benchmark("parse_kv", "set_K_answers")
+def _parse_kv(n, workdir):
+    """解析 n 行 key=value 文本"""
+    parse_kv = load("set_K_answers").parse_kv
+    text = gen.kv_text(n)
+    return lambda: parse_kv(text)
+
+
+@benchmark("aggregate_amounts", "set_M_answers")
+def _aggregate_amounts(n, workdir):
+    """n 笔交易按币种汇总 Decimal 金额"""
+    module = load("set_M_answers")
+    rows = [module.Transaction(tid, Decimal(amount), currency)
+            for tid, amount, currency in gen.currency_amounts(n)]
+    return lambda: module.aggregate_amounts(rows)
+
+
+@benchmark("shortest_path", "set_O_answers")
+def _shortest_path(n, workdir):
+    """约 n 个格子的网格（20% 障碍）上 BFS 求左上到右下的最短路"""
+    shortest_path = load("set_O_answers").shortest_path
+    side = int(n ** 0.5)
+    cells = gen.grid(side)
+    return lambda: shortest_path(cells, (0, 0), (side - 1, side - 1))
+
+
+@benchmark("count_levels", "set_O_answers")
+def _count_levels(n, workdir):
+    """n 行日志按 level 计数"""
+    count_levels = load("set_O_answers").count_levels
+    lines = gen.log_lines(n)
+    return lambda: count_levels(lines)
+
+
+@benchmark("mask_email", "set_Q_answers")
+def _mask_email(n, workdir):
+    """n 个邮箱脱敏"""
+    mask_email = load("set_Q_answers").mask_email
+    emails = [row["email"] for row in gen.people(n)]
+    return lambda: [mask_email(email) for email in emails]
+
+
+@benchmark("check_k_anonymity", "set_Q_answers")
+def _check_k_anonymity(n, workdir):
+    """n 条记录按 3 个准标识符检查 k 匿名"""
+    check_k_anonymity = load("set_Q_answers").check_k_anonymity
+    rows = gen.people(n)
+    return lambda: check_k_anonymity(rows, ["age", "zip", "gender"], 2)
+
+
+@benchmark("sum_by_dept_sql", "set_R_answers")
+def _sum_by_dept_sql(n, workdir):
+    """n 张发票与组织表写入 SQLite 后 LEFT JOIN 按部门汇总"""
+    module = load("set_R_answers")
+    rows = gen.invoice_rows(n, duplicate_rate=0)
+    invoices = [(r["code"], r["number"], float(r["amount"])) for r in rows]
+    org = [(r["code"], r["number"], r["dept"]) for r in rows[::2]]
+
+    def run():
+        con = module.setup_db()
+        module.insert_invoices(con, invoices)
+        module.insert_org(con, org)
+        module.sum_by_dept(con)
+        con.close()
+    return run
+
+
+@benchmark("handle_request", "set_S_answers")
+def _handle_request(n, workdir):
+    """处理 n 个 API 请求（加法、拆税、参数错误、404）"""
+    handle_request = load("set_S_answers").handle_request
+    requests = gen.api_requests(n)
+    return lambda: [handle_request(*request) for request in requests]
+
+
+@benchmark("extract_fields", "set_V_answers")
+def _extract_fields(n, workdir):
+    """n 行 OCR 文本清洗后抽取发票代码、号码与金额"""
+    module = load("set_V_answers")
+    lines = gen.ocr_lines(n)
+    return lambda: [module.extract_fields(module.normalize_text(line)) for line in lines]
+
+
+@benchmark("import_rows", "set_W_answers")
+def _import_rows(n, workdir):
+    """n 行发票校验后在一个事务内写入 SQLite"""
+    import_rows = load("set_W_answers").import_rows
+    rows = gen.invoice_rows(n)
+    return lambda: import_rows(rows)
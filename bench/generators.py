@@ -0,0 +1,249 @@
+"""
+基准测试的输入生成器
+
+每个生成器接收规模 n 与随机种子，相同参数总是生成相同的数据，
+保证不同时间、不同机器上的测量使用同样的输入。
+"""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+import random
+import string
+from typing import Any, Dict, List, Tuple
+
+SEED = 20240301
+
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)
+
+
+def words(n: int, vocabulary: int = 5000, seed: int = SEED) -> List[str]:
+    """n 个单词，词频近似 Zipf 分布（少数高频词 + 长尾）"""
+    rng = _rng(seed)
+    vocab = [f"w{i}" for i in range(vocabulary)]
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return rng.choices(vocab, weights=weights, k=n)
+
+
+def text(n: int, alphabet: str = "abcd", seed: int = SEED) -> str:
+    """长度为 n 的随机文本（小字母表，便于产生部分匹配）"""
+    rng = _rng(seed)
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def sensitive_words(count: int, seed: int = SEED) -> List[str]:
+    """敏感词表：count 个 2~6 个汉字的词"""
+    rng = _rng(seed)
+    chars = [chr(code) for code in range(0x4E00, 0x4E00 + 200)]
+    return ["".join(rng.choice(chars) for _ in range(rng.randint(2, 6))) for _ in range(count)]
+
+
+def chinese_text(n: int, vocabulary: List[str], hit_rate: float = 0.05,
+                 seed: int = SEED) -> str:
+    """长度约为 n 的中文文本，按 hit_rate 概率混入敏感词"""
+    rng = _rng(seed)
+    chars = [chr(code) for code in range(0x4E00, 0x4E00 + 200)]
+    parts: List[str] = []
+    length = 0
+    while length < n:
+        piece = rng.choice(vocabulary) if rng.random() < hit_rate else rng.choice(chars)
+        parts.append(piece)
+        length += len(piece)
+    return "".join(parts)[:n]
+
+
+def taxable_incomes(n: int, seed: int = SEED) -> List[float]:
+    """n 个年应纳税所得额，覆盖全部税率档"""
+    rng = _rng(seed)
+    return [round(rng.uniform(0, 1_200_000), 2) for _ in range(n)]
+
+
+def invoice_rows(n: int, duplicate_rate: float = 0.2, seed: int = SEED) -> List[Dict[str, str]]:
+    """
+    n 行发票（字段均为字符串，与读取 CSV 的结果一致）
+
+    按 duplicate_rate 概率重复之前的发票代码+号码（一半金额相同、一半不同）。
+    """
+    rng = _rng(seed)
+    rows: List[Dict[str, str]] = []
+    for i in range(n):
+        if rows and rng.random() < duplicate_rate:
+            base = rng.choice(rows)
+            amount = base["amount"] if rng.random() < 0.5 else f"{rng.uniform(1, 5000):.2f}"
+            rows.append(dict(base, amount=amount))
+            continue
+        rate = rng.choice(["0.13", "0.09", "0.06", "0.03"])
+        rows.append({
+            "code": f"{rng.randint(1000, 9999)}",
+            "number": f"{i:08d}",
+            "amount": f"{rng.uniform(1, 5000):.2f}",
+            "rate": rate,
+            "date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "dept": rng.choice(string.ascii_uppercase[:5]),
+        })
+    return rows
+
+
+def invoice_csv(rows: List[Dict[str, str]]) -> str:
+    """把 invoice_rows 的结果写成 CSV 文本（含表头）"""
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
+def typed_invoices(n: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """n 张带类型（sale / purchase）的发票"""
+    rng = _rng(seed)
+    return [{"amount": round(rng.uniform(1, 5000), 2), "rate": rng.choice([0.13, 0.09, 0.06]),
+             "type": rng.choice(["sale", "purchase"])} for _ in range(n)]
+
+
+def jsonl_lines(n: int, seed: int = SEED) -> str:
+    """n 行 JSON Lines（period 分布在 12 个月）"""
+    rng = _rng(seed)
+    return "\n".join(json.dumps({"id": i, "period": f"2024-{rng.randint(1, 12):02d}",
+                                 "amount": round(rng.uniform(1, 5000), 2)})
+                     for i in range(n))
+
+
+def rules(count: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """count 条规则（条件覆盖各比较运算，动作为赋值或计税）"""
+    rng = _rng(seed)
+    ops = ["eq", "ne", "gt", "gte", "lt", "lte", "in"]
+    out = []
+    for i in range(count):
+        op = rng.choice(ops)
+        if op == "in":
+            cond = {"field": "dept", "op": "in", "value": rng.sample("ABCDE", 2)}
+        elif op in ("eq", "ne"):
+            cond = {"field": "dept", "op": op, "value": rng.choice("ABCDE")}
+        else:
+            cond = {"field": "amount", "op": op, "value": rng.randint(0, 5000)}
+        action = ({"set": {f"flag{i}": True}} if rng.random() < 0.7
+                  else {"compute_tax": {"rate": rng.choice([0.13, 0.06])}})
+        out.append({"when": cond, "then": action})
+    return out
+
+
+def rule_rows(n: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """n 行待规则处理的数据"""
+    rng = _rng(seed)
+    return [{"amount": round(rng.uniform(0, 5000), 2), "dept": rng.choice("ABCDE")}
+            for _ in range(n)]
+
+
+def audit_events(n: int, seed: int = SEED) -> List[Dict[str, Any]]:
+    """n 条审计事件"""
+    rng = _rng(seed)
+    actions = ["login", "export", "approve", "reject", "delete"]
+    return [{"i": i, "user": f"u{rng.randint(1, 50)}", "action": rng.choice(actions),
+             "msg": "x" * rng.randint(10, 80)} for i in range(n)]
+
+
+def cache_ops(n: int, keys: int, seed: int = SEED) -> List[Tuple[str, int]]:
+    """n 次缓存操作（get/put 各半，键空间为 keys）"""
+    rng = _rng(seed)
+    return [(rng.choice(("get", "put")), rng.randrange(keys)) for _ in range(n)]
+
+
+def edges(n: int, seed: int = SEED) -> List[Tuple[int, int]]:
+    """n 个节点上的 n 条随机边"""
+    rng = _rng(seed)
+    return [(rng.randrange(n), rng.randrange(n)) for _ in range(n)]
+
+
+def dept_amounts(n: int, depts: int = 5, seed: int = SEED) -> List[Tuple[str, float]]:
+    """n 条 (部门, 金额)"""
+    rng = _rng(seed)
+    names = string.ascii_uppercase[:depts]
+    return [(rng.choice(names), round(rng.uniform(1, 5000), 2)) for _ in range(n)]
+
+
+def amount_strings(n: int, seed: int = SEED) -> List[Tuple[str, str]]:
+    """n 个 (金额, 税率) 字符串对"""
+    rng = _rng(seed)
+    return [(f"{rng.uniform(1, 50000):.2f}", rng.choice(["0.13", "0.09", "0.06", "0.03"]))
+            for _ in range(n)]
+
+
+def currency_amounts(n: int, seed: int = SEED) -> List[Tuple[str, str, str]]:
+    """n 条 (交易号, 金额, 币种)"""
+    rng = _rng(seed)
+    return [(f"t{i}", f"{rng.uniform(0, 5000):.2f}", rng.choice(["CNY", "USD", "EUR"]))
+            for i in range(n)]
+
+
+def log_lines(n: int, seed: int = SEED) -> List[str]:
+    """n 行日志，约 10% 不含 level 字段"""
+    rng = _rng(seed)
+    levels = ["info", "INFO", "warn", "ERROR", "debug"]
+    return [f"2024-03-01T00:00:{i % 60:02d} msg=event{i}" if rng.random() < 0.1
+            else f"2024-03-01T00:00:{i % 60:02d} level={rng.choice(levels)} msg=event{i}"
+            for i in range(n)]
+
+
+def kv_text(n: int, seed: int = SEED) -> str:
+    """n 行 key=value 配置文本（夹杂注释与空行）"""
+    rng = _rng(seed)
+    lines = []
+    for i in range(n):
+        roll = rng.random()
+        if roll < 0.05:
+            lines.append("# comment")
+        elif roll < 0.1:
+            lines.append("")
+        else:
+            lines.append(f"  key{rng.randrange(n)} = value{i}  ")
+    return "\n".join(lines)
+
+
+def grid(side: int, wall_rate: float = 0.2, seed: int = SEED) -> List[List[int]]:
+    """side×side 的网格（1 为障碍），左上与右下角保持可通行"""
+    rng = _rng(seed)
+    cells = [[1 if rng.random() < wall_rate else 0 for _ in range(side)] for _ in range(side)]
+    cells[0][0] = cells[-1][-1] = 0
+    return cells
+
+
+def people(n: int, seed: int = SEED) -> List[Dict[str, str]]:
+    """n 条含准标识符（年龄段、邮编前缀、性别）的个人记录"""
+    rng = _rng(seed)
+    return [{"name": f"user{i}", "email": f"user{i}@example{rng.randint(1, 9)}.com",
+             "age": f"{rng.randint(2, 6)}0-{rng.randint(2, 6)}9",
+             "zip": f"10{rng.randint(0, 9)}", "gender": rng.choice("MF")}
+            for i in range(n)]
+
+
+def ocr_lines(n: int, seed: int = SEED) -> List[str]:
+    """n 行模拟 OCR 识别结果（全角标点、RMB、数字中的字母 O）"""
+    rng = _rng(seed)
+    out = []
+    for _ in range(n):
+        amount = f"{rng.randint(1, 9999)}.{rng.randint(0, 99):02d}".replace("0", rng.choice("0O"))
+        out.append(f"票号：{rng.randint(10**7, 10**9)}  代 码：{rng.randint(10**9, 10**11)}"
+                   f"，金额：RMB {amount}")
+    return out
+
+
+def api_requests(n: int, seed: int = SEED) -> List[Tuple[str, str, str, str]]:
+    """n 个 (method, path, query, body) 请求，覆盖正常、参数错误与 404"""
+    rng = _rng(seed)
+    out = []
+    for _ in range(n):
+        roll = rng.random()
+        if roll < 0.4:
+            out.append(("GET", "/add", f"a={rng.randint(-999, 999)}&b={rng.randint(-999, 999)}", ""))
+        elif roll < 0.8:
+            body = json.dumps({"amount": round(rng.uniform(1, 5000), 2), "rate": 0.13})
+            out.append(("POST", "/split_tax", "", body))
+        elif roll < 0.9:
+            out.append(("GET", "/add", "a=x&b=1", ""))
+        else:
+            out.append(("GET", "/missing", "", ""))
+    return out
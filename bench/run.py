@@ -0,0 +1,242 @@
+"""
+答案模块基准测试（纯标准库，timeit 计时）
+
+用法：
+  python bench/run.py                      # 运行全部用例并打印结果
+  python bench/run.py -k mask -k kmp       # 只运行名称包含关键字的用例
+  python bench/run.py --max-size 10000     # 跳过大规模输入（快速检查）
+  python bench/run.py --save               # 结果写入基线 bench/baseline.json
+  python bench/run.py --compare            # 与基线对比，超过容差的变慢返回 1
+  python bench/run.py --compare --tolerance 0.2
+
+说明：
+- 每个用例按输入规模参数化（见 benchmarks.py），输入由固定种子生成；
+- 每个规模先用 autorange 确定循环次数（单轮不少于 0.2 秒），再重复 --repeat 轮，
+  取最快一轮的单次耗时作为结果（最不受系统噪声影响）；
+- 对比时当前耗时 > 基线 × (1 + 容差) 记为变慢，< 基线 × (1 - 容差) 记为变快；
+  疑似变慢的用例会复测一次取较快结果，以排除偶发噪声；
+  基线中有、按当前筛选条件本应运行却没有结果的用例（被删除或改名）标记为缺失；
+  基线与当前环境的 Python 版本不同时给出提示（跨版本的数字不可直接比较）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+from typing import Dict, List, Optional, Sequence, Set
+
+from benchmarks import REGISTRY
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_TOLERANCE = 0.10
+
+
+def environment() -> Dict[str, str]:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def case_key(name: str, size: int) -> str:
+    return f"{name}[{size}]"
+
+
+def measure(func, repeat: int) -> Dict[str, float]:
+    """返回单次调用的最快与中位耗时（秒）"""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    if number == 1:
+        # autorange 只跑一次就超过 0.2 秒，数据已足够，直接少跑几轮
+        repeat = min(repeat, 3)
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"best": min(times), "median": statistics.median(times), "loops": number}
+
+
+def selected(name: str, size: int, keywords: List[str], max_size: Optional[int]) -> bool:
+    """用例是否被 -k / --max-size 选中"""
+    if keywords and not any(k.lower() in name.lower() for k in keywords):
+        return False
+    return max_size is None or size <= max_size
+
+
+def run_benchmarks(keywords: List[str], max_size: Optional[int], repeat: int,
+                   only: Optional[Set[str]] = None) -> Dict[str, Dict]:
+    """运行匹配的用例（only 不为空时只运行其中列出的用例）"""
+    results: Dict[str, Dict] = {}
+    with tempfile.TemporaryDirectory(prefix="bench-") as workdir:
+        for bench in REGISTRY.values():
+            for size in bench.sizes:
+                if not selected(bench.name, size, keywords, max_size):
+                    continue
+                if only is not None and case_key(bench.name, size) not in only:
+                    continue
+                func = bench.setup(size, workdir)
+                stats = measure(func, repeat)
+                key = case_key(bench.name, size)
+                results[key] = {
+                    "name": bench.name,
+                    "module": bench.module,
+                    "size": size,
+                    "best_s": stats["best"],
+                    "median_s": stats["median"],
+                    "per_item_ns": stats["best"] / size * 1e9,
+                    "loops": stats["loops"],
+                }
+                print(f"  {key:<30} {format_time(stats['best']):>10}"
+                      f"  {stats['best'] / size * 1e9:>10.0f} ns/项", flush=True)
+    return results
+
+
+def format_time(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f}µs"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds:.3f}s"
+
+
+def save_baseline(path: str, results: Dict[str, Dict]):
+    """写入基线；只运行了部分用例时，保留基线中其余用例的旧结果"""
+    data = load_baseline(path) or {"results": {}}
+    data["results"].update(results)
+    data["environment"] = environment()
+    data["updated"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def suspects(baseline: Dict, results: Dict[str, Dict], tolerance: float) -> Set[str]:
+    """超过容差的用例"""
+    return {
+        key for key, current in results.items()
+        if key in baseline["results"]
+        and current["best_s"] > baseline["results"][key]["best_s"] * (1 + tolerance)
+    }
+
+
+def missing_cases(baseline: Dict, results: Dict[str, Dict],
+                  keywords: List[str], max_size: Optional[int]) -> List[str]:
+    """基线中存在、按当前筛选条件应运行却没有结果的用例（被删除或改名）"""
+    return [
+        key for key, base in baseline["results"].items()
+        if key not in results and selected(base["name"], base["size"], keywords, max_size)
+    ]
+
+
+def compare(baseline: Dict, results: Dict[str, Dict], tolerance: float,
+            missing: Sequence[str] = ()) -> List[str]:
+    """打印与基线的对比表（含基线中未运行的用例），返回变慢的用例"""
+    regressions: List[str] = []
+    print()
+    print(f"{'用例':<30} {'基线':>10} {'当前':>10} {'变化':>8}  结论")
+    print("-" * 72)
+    for key, current in results.items():
+        base = baseline["results"].get(key)
+        if base is None:
+            print(f"{key:<30} {'-':>10} {format_time(current['best_s']):>10} {'':>8}  新增")
+            continue
+        ratio = current["best_s"] / base["best_s"] - 1
+        if ratio > tolerance:
+            verdict = "❌ 变慢"
+            regressions.append(key)
+        elif ratio < -tolerance:
+            verdict = "🚀 变快"
+        else:
+            verdict = "✅ 持平"
+        print(f"{key:<30} {format_time(base['best_s']):>10} {format_time(current['best_s']):>10}"
+              f" {ratio:>+8.1%}  {verdict}")
+    for key in missing:
+        base = baseline["results"][key]
+        print(f"{key:<30} {format_time(base['best_s']):>10} {'-':>10} {'':>8}  ⚠️  缺失")
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="答案模块基准测试")
+    ap.add_argument("-k", dest="keywords", action="append", default=[],
+                    help="只运行名称包含该关键字的用例（可多次指定）")
+    ap.add_argument("--max-size", type=int, help="跳过输入规模大于该值的用例")
+    ap.add_argument("--repeat", type=int, default=5, help="每个规模重复的轮数（默认5）")
+    ap.add_argument("--baseline", default=BASELINE_FILE, help="基线文件路径")
+    mode = ap.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="把结果写入基线")
+    mode.add_argument("--compare", action="store_true", help="与基线对比，有变慢的用例时返回1")
+    ap.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                    help="对比容差（相对变化，默认0.10即10%%）")
+    ap.add_argument("--list", action="store_true", help="列出全部用例后退出")
+    args = ap.parse_args(argv)
+
+    if args.list:
+        for bench in REGISTRY.values():
+            sizes = ", ".join(str(size) for size in bench.sizes)
+            print(f"  {bench.name:<20} {bench.module:<15} [{sizes}]  {bench.description}")
+        return 0
+
+    baseline = None
+    if args.compare:
+        baseline = load_baseline(args.baseline)
+        if baseline is None:
+            print(f"❌ 基线不存在: {args.baseline}（先运行 --save 生成）")
+            return 2
+        base_env, env = baseline.get("environment", {}), environment()
+        if (base_env.get("python"), base_env.get("implementation")) != (env["python"], env["implementation"]):
+            print(f"⚠️  基线环境为 {base_env.get('implementation')} {base_env.get('python')}，"
+                  f"当前为 {env['implementation']} {env['python']}，对比结果仅供参考")
+
+    print(f"⏱️  基准测试（{platform.python_implementation()} {platform.python_version()}，"
+          f"每个规模 {args.repeat} 轮取最快）")
+    results = run_benchmarks(args.keywords, args.max_size, args.repeat)
+    if not results:
+        print("❌ 没有匹配的用例")
+        return 2
+
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"\n💾 基线已写入 {args.baseline}（{len(results)} 个用例）")
+        return 0
+
+    if baseline is not None:
+        # 疑似变慢的用例再测一次取较快的结果，排除偶发的系统噪声
+        recheck = suspects(baseline, results, args.tolerance)
+        if recheck:
+            print(f"\n🔁 复测 {len(recheck)} 个疑似变慢的用例")
+            for key, result in run_benchmarks(args.keywords, args.max_size, args.repeat,
+                                              only=recheck).items():
+                if result["best_s"] < results[key]["best_s"]:
+                    results[key] = result
+        missing = missing_cases(baseline, results, args.keywords, args.max_size)
+        regressions = compare(baseline, results, args.tolerance, missing)
+        if missing:
+            print(f"\n⚠️  基线中的 {len(missing)} 个用例本次没有运行（已删除或改名？）: {', '.join(missing)}"
+                  f"\n   确认无误后从 {args.baseline} 中删除这些条目")
+        if regressions:
+            print(f"\n❌ {len(regressions)} 个用例变慢超过 {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+        print(f"\n✅ 没有超过 {args.tolerance:.0%} 的性能退化")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
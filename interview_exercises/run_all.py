@@ -5,85 +5,525 @@
   python interview_exercises/run_all.py --mode answers   # 默认，运行答案版
   python interview_exercises/run_all.py --mode blank     # 运行空白版（未填写将失败）
   python interview_exercises/run_all.py --mode both      # 先空白后答案
+  python interview_exercises/run_all.py -j 4             # 4个并发（默认CPU核数）
+  python interview_exercises/run_all.py --fail-fast      # 出现失败后不再启动新的套题
+  python interview_exercises/run_all.py --only-changed   # 跳过内容与上次通过时相同的文件
+  python interview_exercises/run_all.py --json report.json --junit report.xml
+  python interview_exercises/run_all.py --runner fork    # 预导入重型依赖后为每个文件 fork 子进程
 
 说明：
-- B/E 套题依赖 pandas（可选 numpy），若未安装将自动跳过。
+- B/E/G 套题依赖 pandas（可选 numpy），ML1/NLP1/OCR1 依赖各自的第三方库，若未安装将自动跳过。
+- 每套题输出耗时与子进程峰值内存（支持 os.wait4 的平台）。
+- 每个通过的文件记录内容哈希到 .run_all_state.json，供 --only-changed 使用。
+- --runner process（默认）：每个文件启动新的解释器；
+  --runner fork（仅 POSIX）：父进程先导入各文件用到的 pandas/numpy/sklearn 等依赖，
+  再为每个文件 fork 子进程以 __main__ 运行，省去解释器启动与重型依赖的导入，
+  失败隔离与输出捕获与 process 模式相同（子进程峰值内存包含父进程已导入的部分）。
 """
 
 from __future__ import annotations
 
 import argparse
+import ast
+import hashlib
+import importlib
 import importlib.util
+import json
+import os
+import platform
+import runpy
+import selectors
+import signal
 import subprocess
 import sys
+import threading
+import time
+import traceback
+import xml.etree.ElementTree as ET
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 ROOT = Path(__file__).resolve().parent
+STATE_FILE = ROOT / ".run_all_state.json"
+
+SETS = [
+    "A","B","C","D","E","F","G","H","I","J",
+    "K","L","M","N","O","P","Q","R","S","T",
+    "U","V","W","X","Y","Z","AA","AB",
+    "ML1","NLP1","OCR1",
+]
+
+# 套题依赖的第三方库（缺少时跳过）
+REQUIRES = {
+    "B": ("pandas",),
+    "E": ("pandas",),
+    "G": ("pandas",),
+    "ML1": ("pandas", "numpy", "sklearn"),
+    "NLP1": ("jieba", "sklearn"),
+    "OCR1": ("cv2",),
+}
+
+DEFAULT_TIMEOUT = 300  # 单个文件的超时（秒）
+REAP_INTERVAL = 0.05  # fork 模式下轮询已关闭输出的子进程是否退出的间隔（秒）
+
+# 结果状态
+PASSED = "通过"
+FAILED = "失败"
+SKIPPED = "跳过"
+UNCHANGED = "未变化"  # --only-changed：内容与上次通过时相同
+NOT_RUN = "未运行"    # --fail-fast：出现失败后未启动
+
+# 检查结果与解释器有关，--only-changed 按解释器版本区分
+INTERPRETER = f"{sys.implementation.name}-{platform.python_version()}"
+
+
+@dataclass
+class SetResult:
+    """单个文件的运行结果"""
+    tag: str
+    kind: str
+    file: str
+    status: str
+    seconds: float = 0.0
+    peak_rss_kb: Optional[int] = None
+    returncode: Optional[int] = None
+    output: str = ""
+    reason: str = ""
+
+    @property
+    def name(self) -> str:
+        return f"套题{self.tag}-{self.kind}"
 
 
 def has_module(name: str) -> bool:
     return importlib.util.find_spec(name) is not None
 
 
-def run_file(pyfile: Path) -> tuple[bool, str]:
-    """运行单个 Python 文件，返回 (是否成功, 输出文本)。"""
-    proc = subprocess.run([sys.executable, str(pyfile)], capture_output=True, text=True)
-    ok = proc.returncode == 0
-    out = (proc.stdout or "") + (proc.stderr or "")
-    return ok, out
+def file_hash(pyfile: Path) -> str:
+    return hashlib.sha256(pyfile.read_bytes()).hexdigest()
+
+
+def _maxrss_kb(rusage) -> int:
+    # macOS 的 ru_maxrss 单位是字节，Linux 是 KB
+    return rusage.ru_maxrss // 1024 if sys.platform == "darwin" else rusage.ru_maxrss
+
+
+def run_process(pyfile: Path, timeout: float = DEFAULT_TIMEOUT) -> tuple[int, str, Optional[int]]:
+    """
+    在新的解释器进程中运行文件
+
+    Returns:
+        (退出码, 输出文本（stdout 与 stderr 按出现顺序合并）, 子进程峰值内存KB)
+    """
+    proc = subprocess.Popen([sys.executable, str(pyfile)], stdout=subprocess.PIPE,
+                            stderr=subprocess.STDOUT)
+    timed_out = threading.Event()
+
+    def kill():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, kill)
+    timer.start()
+    try:
+        out = proc.stdout.read()
+        proc.stdout.close()
+        if hasattr(os, "wait4"):
+            # wait4 同时取得子进程的资源使用（峰值内存）
+            _, status, rusage = os.wait4(proc.pid, 0)
+            proc.returncode = _exit_code(status)
+            peak = _maxrss_kb(rusage)
+        else:
+            proc.wait()
+            peak = None
+    finally:
+        timer.cancel()
+    text = out.decode("utf-8", errors="replace")
+    if timed_out.is_set():
+        text += f"\n[超时] 超过 {timeout:g} 秒，已终止"
+    return proc.returncode, text, peak
+
+
+def _exit_code(status: int) -> int:
+    return -os.WTERMSIG(status) if os.WIFSIGNALED(status) else os.WEXITSTATUS(status)
+
+
+def load_state() -> Dict[str, Dict]:
+    try:
+        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state: Dict[str, Dict]):
+    tmp = STATE_FILE.with_name(STATE_FILE.name + ".tmp")
+    tmp.write_text(json.dumps(state, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, STATE_FILE)
+
+
+def execute(tag: str, kind: str, pyfile: Path, timeout: float) -> SetResult:
+    """运行一个文件并计时"""
+    started = time.perf_counter()
+    returncode, out, peak = run_process(pyfile, timeout)
+    return SetResult(
+        tag=tag, kind=kind, file=pyfile.name,
+        status=PASSED if returncode == 0 else FAILED,
+        seconds=round(time.perf_counter() - started, 3),
+        peak_rss_kb=peak, returncode=returncode, output=out.strip(),
+    )
+
+
+# (结果序号, 套题, 版本, 文件, 内容哈希)
+Task = Tuple[int, str, str, Path, str]
+OnDone = Callable[[Task, SetResult], None]
+
+
+def run_in_processes(tasks: List[Task], jobs: int, timeout: float,
+                     on_done: OnDone, stop: Callable[[], bool]) -> List[Task]:
+    """
+    每个文件一个新的解释器进程，最多 jobs 个同时运行
+
+    Returns:
+        因 stop() 为真而未启动的任务
+    """
+    queue = list(tasks)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        running = {}
+        while queue or running:
+            while queue and len(running) < jobs and not stop():
+                task = queue.pop(0)
+                _, tag, kind, file, _ = task
+                running[executor.submit(execute, tag, kind, file, timeout)] = task
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                on_done(running.pop(future), future.result())
+    return queue
+
+
+def preload(files: List[Path]) -> List[str]:
+    """
+    在父进程中导入这些文件用到的重型依赖（REQUIRES 中的库及其子模块），fork 出的子进程直接复用
+
+    Returns:
+        成功导入的模块名
+    """
+    heavy = {name for names in REQUIRES.values() for name in names}
+    wanted: List[str] = []
+    for file in files:
+        try:
+            tree = ast.parse(file.read_text(encoding="utf-8"))
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                names = [node.module]
+            else:
+                continue
+            wanted.extend(name for name in names
+                          if name.split(".")[0] in heavy and name not in wanted)
+
+    loaded = []
+    for name in wanted:
+        try:
+            importlib.import_module(name)
+        except Exception:  # 缺少依赖或导入出错的模块留给子进程自己处理
+            continue
+        loaded.append(name)
+    return loaded
+
+
+def _run_child(pyfile: Path, write_fd: int):
+    """fork 出的子进程：输出重定向到管道，以 __main__ 运行文件后直接退出"""
+    os.dup2(write_fd, 1)
+    os.dup2(write_fd, 2)
+    os.close(write_fd)
+    code = 0
+    try:
+        sys.argv = [str(pyfile)]
+        sys.path[0] = str(pyfile.parent)
+        runpy.run_path(str(pyfile), run_name="__main__")
+    except SystemExit as e:
+        if isinstance(e.code, int):
+            code = e.code
+        elif e.code is not None:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException as e:
+        # 与直接运行文件时的回溯一致：去掉 runpy 与本脚本的栈帧
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != str(pyfile):
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def run_forked(tasks: List[Task], jobs: int, timeout: float,
+               on_done: OnDone, stop: Callable[[], bool]) -> List[Task]:
+    """
+    预导入重型依赖后为每个文件 fork 子进程，最多 jobs 个同时运行
+
+    只在主线程中 fork（不与线程池混用）；各子进程的输出通过管道由 selector 统一读取，
+    管道关闭后用非阻塞的 os.wait4 回收并取得峰值内存。关闭了输出却未退出的子进程
+    继续等待，超时照常终止。
+
+    Returns:
+        因 stop() 为真而未启动的任务
+    """
+    queue = list(tasks)
+    selector = selectors.DefaultSelector()
+    running: Dict[int, Dict] = {}
+
+    while queue or running:
+        while queue and len(running) < jobs and not stop():
+            task = queue.pop(0)
+            read_fd, write_fd = os.pipe()
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                os.close(read_fd)
+                _run_child(task[3], write_fd)
+            os.close(write_fd)
+            started = time.perf_counter()
+            running[pid] = {"task": task, "chunks": [], "eof": False, "timed_out": False,
+                            "started": started, "deadline": started + timeout}
+            selector.register(read_fd, selectors.EVENT_READ, pid)
+        if not running:
+            break
+
+        deadline = min(child["deadline"] for child in running.values())
+        wait_for = None if deadline == float("inf") else max(0.0, deadline - time.perf_counter())
+        if any(child["eof"] for child in running.values()):
+            # 管道已关闭的子进程不再产生事件，定期轮询其是否退出
+            wait_for = REAP_INTERVAL if wait_for is None else min(wait_for, REAP_INTERVAL)
+        for key, _ in selector.select(timeout=wait_for):
+            data = os.read(key.fd, 65536)
+            if data:
+                running[key.data]["chunks"].append(data)
+            else:
+                selector.unregister(key.fd)
+                os.close(key.fd)
+                running[key.data]["eof"] = True
+
+        now = time.perf_counter()
+        for pid, child in list(running.items()):
+            exited = 0
+            if child["eof"]:
+                exited, status, rusage = os.wait4(pid, os.WNOHANG)
+            if not exited:
+                if now >= child["deadline"]:
+                    os.kill(pid, signal.SIGKILL)
+                    child["timed_out"] = True
+                    child["deadline"] = float("inf")
+                continue
+            del running[pid]
+            _, tag, kind, file, _ = child["task"]
+            returncode = _exit_code(status)
+            out = b"".join(child["chunks"]).decode("utf-8", errors="replace")
+            if child["timed_out"]:
+                out += f"\n[超时] 超过 {timeout:g} 秒，已终止"
+            on_done(child["task"], SetResult(
+                tag=tag, kind=kind, file=file.name,
+                status=PASSED if returncode == 0 else FAILED,
+                seconds=round(time.perf_counter() - child["started"], 3),
+                peak_rss_kb=_maxrss_kb(rusage), returncode=returncode, output=out.strip(),
+            ))
+
+    selector.close()
+    return queue
+
+
+RUNNERS = {"process": run_in_processes, "fork": run_forked}
+
+
+def print_result(result: SetResult):
+    memory = f", {result.peak_rss_kb / 1024:.1f}MB" if result.peak_rss_kb else ""
+    print(f"\n=== {result.name} -> {result.status} ({result.seconds:.2f}s{memory}) ===")
+    if result.output:
+        print(result.output)
+
+
+def print_table(results: List[SetResult]):
+    """每套题的结果、耗时与峰值内存"""
+    print("\n--- 耗时 ---")
+    print(f"{'套题':<12}{'结果':<8}{'耗时(s)':>10}{'峰值内存(MB)':>16}")
+    for result in results:
+        if result.status in (SKIPPED, NOT_RUN):
+            continue
+        memory = f"{result.peak_rss_kb / 1024:.1f}" if result.peak_rss_kb else "-"
+        seconds = f"{result.seconds:.2f}" if result.status != UNCHANGED else "-"
+        print(f"{result.tag + '-' + result.kind:<12}{result.status:<8}{seconds:>10}{memory:>16}")
+
+
+def write_json(path: Path, results: List[SetResult], summary: Dict, meta: Dict):
+    report = dict(meta, summary=summary, results=[asdict(result) for result in results])
+    path.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def write_junit(path: Path, results: List[SetResult], summary: Dict, meta: Dict):
+    suite = ET.Element("testsuite", {
+        "name": "interview_exercises",
+        "tests": str(len(results)),
+        "failures": str(summary["failed"]),
+        "skipped": str(len(results) - summary["passed"] - summary["failed"]),
+        "time": f"{meta['seconds']:.3f}",
+        "timestamp": meta["started"],
+    })
+    for result in results:
+        case = ET.SubElement(suite, "testcase", {
+            "classname": f"interview_exercises.set_{result.tag}",
+            "name": result.kind,
+            "file": result.file,
+            "time": f"{result.seconds:.3f}",
+        })
+        if result.peak_rss_kb:
+            props = ET.SubElement(case, "properties")
+            ET.SubElement(props, "property",
+                          {"name": "peak_rss_kb", "value": str(result.peak_rss_kb)})
+        if result.status == FAILED:
+            failure = ET.SubElement(case, "failure",
+                                    {"message": f"退出码 {result.returncode}"})
+            failure.text = result.output
+        elif result.status in (SKIPPED, NOT_RUN, UNCHANGED):
+            ET.SubElement(case, "skipped", {"message": result.reason or result.status})
+        if result.output and result.status == PASSED:
+            ET.SubElement(case, "system-out").text = result.output
+    ET.ElementTree(suite).write(path, encoding="utf-8", xml_declaration=True)
 
 
 def main(argv: List[str] | None = None) -> int:
     ap = argparse.ArgumentParser(description="批量运行面试题自检")
     ap.add_argument("--mode", choices=["answers", "blank", "both"], default="answers")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                    help="并发运行的文件数（默认：CPU核数）")
+    ap.add_argument("--fail-fast", action="store_true", help="出现失败后不再启动新的套题")
+    ap.add_argument("--only-changed", action="store_true",
+                    help="跳过内容与上次通过时相同的文件")
+    ap.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT,
+                    help=f"单个文件的超时秒数（默认：{DEFAULT_TIMEOUT}）")
+    ap.add_argument("--runner", choices=sorted(RUNNERS), default="process",
+                    help="process：每个文件启动新解释器（默认）；fork：预导入依赖后 fork（仅 POSIX）")
+    ap.add_argument("--json", type=Path, metavar="PATH", help="输出 JSON 报告")
+    ap.add_argument("--junit", type=Path, metavar="PATH", help="输出 JUnit XML 报告")
     args = ap.parse_args(argv)
+    jobs = max(1, args.jobs)
+    if args.runner == "fork" and not hasattr(os, "fork"):
+        print("[提示] 当前平台不支持 fork，改用 process 模式")
+        args.runner = "process"
 
-    sets = [
-        "A","B","C","D","E","F","G","H","I","J",
-        "K","L","M","N","O","P","Q","R","S","T",
-        "U","V","W","X","Y","Z","AA","AB"
-    ]
     want_blank = args.mode in ("blank", "both")
     want_answers = args.mode in ("answers", "both")
+    kinds = [kind for kind, wanted in (("blank", want_blank), ("answers", want_answers)) if wanted]
+
+    state = load_state()
+    available: Dict[str, bool] = {}
 
-    pandas_ok = has_module("pandas")
-
-    total = 0
-    passed = 0
-    skipped = 0
-
-    def maybe_run(tag: str, kind: str):
-        nonlocal total, passed, skipped
-        # B/E/G 依赖 pandas
-        if tag in ("B", "E", "G") and not pandas_ok:
-            print(f"[跳过] 套题{tag}-{kind}: 未安装 pandas")
-            skipped += 1
-            return
-        file = ROOT / f"set_{tag}_{kind}.py"
-        if not file.exists():
-            print(f"[跳过] 文件不存在: {file}")
-            skipped += 1
-            return
-        total += 1
-        ok, out = run_file(file)
-        status = "通过" if ok else "失败"
-        print(f"\n=== 套题{tag}-{kind} -> {status} ===")
-        if out.strip():
-            print(out.strip())
-        if ok:
-            passed += 1
-
-    for tag in sets:
-        if want_blank:
-            maybe_run(tag, "blank")
-        if want_answers:
-            maybe_run(tag, "answers")
+    # 按顺序确定每个文件的处理方式：跳过 / 未变化 / 运行
+    results: List[Optional[SetResult]] = []
+    tasks: List[Task] = []
+    for tag in SETS:
+        for kind in kinds:
+            file = ROOT / f"set_{tag}_{kind}.py"
+            for name in REQUIRES.get(tag, ()):
+                if name not in available:
+                    available[name] = has_module(name)
+            missing = [name for name in REQUIRES.get(tag, ()) if not available[name]]
+            if missing:
+                results.append(SetResult(tag, kind, file.name, SKIPPED,
+                                         reason=f"未安装 {', '.join(missing)}"))
+                continue
+            if not file.exists():
+                results.append(SetResult(tag, kind, file.name, SKIPPED, reason="文件不存在"))
+                continue
+            digest = file_hash(file)
+            last = state.get(file.name)
+            if (args.only_changed and last
+                    and last.get("hash") == digest and last.get("python") == INTERPRETER):
+                results.append(SetResult(tag, kind, file.name, UNCHANGED,
+                                         reason="内容与上次通过时相同"))
+                continue
+            tasks.append((len(results), tag, kind, file, digest))
+            results.append(None)
 
+    for result in results:
+        if result is not None and result.status == SKIPPED:
+            print(f"[跳过] {result.name}: {result.reason}")
+
+    started_at = datetime.now()
+    started = time.perf_counter()
+    preloaded: List[str] = []
+    if args.runner == "fork" and tasks:
+        preloaded = preload([task[3] for task in tasks])
+        if preloaded:
+            print(f"[预导入] {', '.join(preloaded)}（{time.perf_counter() - started:.2f}s）")
+
+    failures = []
+
+    def on_done(task: Task, result: SetResult):
+        index, _, _, file, digest = task
+        results[index] = result
+        print_result(result)
+        if result.status == PASSED:
+            state[file.name] = {"hash": digest, "python": INTERPRETER}
+        else:
+            state.pop(file.name, None)
+            failures.append(result)
+
+    not_started = RUNNERS[args.runner](tasks, jobs, args.timeout, on_done,
+                                       lambda: args.fail_fast and bool(failures))
+    for index, tag, kind, file, _ in not_started:
+        results[index] = SetResult(tag, kind, file.name, NOT_RUN, reason="--fail-fast")
+    elapsed = time.perf_counter() - started
+    save_state(state)
+
+    ordered: List[SetResult] = [result for result in results if result is not None]
+    summary = {
+        "total": sum(1 for r in ordered if r.status in (PASSED, FAILED)),
+        "passed": sum(1 for r in ordered if r.status == PASSED),
+        "failed": sum(1 for r in ordered if r.status == FAILED),
+        "skipped": sum(1 for r in ordered if r.status == SKIPPED),
+        "unchanged": sum(1 for r in ordered if r.status == UNCHANGED),
+        "not_run": sum(1 for r in ordered if r.status == NOT_RUN),
+    }
+    meta = {
+        "mode": args.mode,
+        "python": INTERPRETER,
+        "jobs": jobs,
+        "runner": args.runner,
+        "preloaded": preloaded,
+        "started": started_at.isoformat(timespec="seconds"),
+        "seconds": round(elapsed, 3),
+    }
+
+    print_table(ordered)
     print("\n--- 总结 ---")
-    print(f"总计: {total}，通过: {passed}，跳过: {skipped}，失败: {total - passed}")
-    return 0 if passed == total else 1
+    print(f"总计: {summary['total']}，通过: {summary['passed']}，跳过: {summary['skipped']}，"
+          f"失败: {summary['failed']}")
+    if summary["unchanged"]:
+        print(f"未变化（上次已通过）: {summary['unchanged']}")
+    if summary["not_run"]:
+        print(f"未运行（--fail-fast）: {summary['not_run']}")
+    print(f"总耗时: {elapsed:.2f}s（{jobs} 个并发，{args.runner} 模式）")
+
+    if args.json:
+        write_json(args.json, ordered, summary, meta)
+    if args.junit:
+        write_junit(args.junit, ordered, summary, meta)
+    return 0 if summary["failed"] == 0 else 1
 
 
 if __name__ == "__main__":
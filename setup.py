@@ -5,7 +5,7 @@ pythonLearn 跨平台项目管理脚本
 
 使用方式:
     python setup.py setup      # 初始化项目
-    python setup.py web        # 启动Web平台
+    python setup.py web        # 启动Web平台（--prod 生产模式）
     python setup.py learn      # 开始学习
     python setup.py progress   # 查看进度
     python setup.py test       # 运行测试
@@ -96,9 +96,9 @@ class ProjectManager:
         else:
             print("⚠️  练习文件目录不存在")
     
-    def web(self):
-        """启动Web平台"""
-        print("🌐 启动Web学习平台...")
+    def web(self, prod=False):
+        """启动Web平台（prod=True 时使用 gunicorn 生产模式：单工作进程多线程）"""
+        print(f"🌐 启动Web学习平台（{'生产' if prod else '开发'}模式）...")
         print("="*60)
         
         # 安装Web依赖
@@ -122,7 +122,7 @@ class ProjectManager:
         
         # 切换到web目录并运行
         os.chdir(web_dir)
-        subprocess.run([str(self.python), 'app.py'])
+        subprocess.run([str(self.python), 'serve.py' if prod else 'app.py'])
     
     def learn(self, level='01'):
         """启动交互式学习"""
@@ -186,6 +186,7 @@ def main():
 示例:
   python setup.py setup              初始化项目
   python setup.py web                启动Web平台
+  python setup.py web --prod         生产模式启动Web平台（gunicorn）
   python setup.py learn --level 02   学习第2阶段
   python setup.py progress           查看进度
   python setup.py test               运行测试
@@ -203,6 +204,11 @@ def main():
         default='01',
         help='学习阶段（用于learn命令，默认: 01）'
     )
+    parser.add_argument(
+        '--prod',
+        action='store_true',
+        help='生产模式（用于web命令：gunicorn 单进程多线程服务，预加载并预热）'
+    )
     
     args = parser.parse_args()
     
@@ -212,7 +218,7 @@ def main():
         if args.command == 'setup':
             manager.setup()
         elif args.command == 'web':
-            manager.web()
+            manager.web(prod=args.prod)
         elif args.command == 'learn':
             manager.learn(args.level)
         elif args.command == 'progress':
@@ -4,19 +4,31 @@
 
 用法：
   python progress.py --show      # 显示学习进度
-  python progress.py --week      # 本周进度
+  python progress.py --week      # 本周进度（完成速度、连续学习天数、各阶段用时）
+  python progress.py --month     # 本月进度
   python progress.py --stats     # 详细统计
+  python progress.py --show --stats -j 4   # 一次扫描同时显示两者，4个并发检查
+  python progress.py --no-cache  # 忽略缓存，重新运行全部检查
+
+检查结果缓存在 .learning_progress.json 中，按文件内容哈希（git blob 哈希）与解释器版本区分，
+文件未修改的套题不会重复运行。每次扫描把完成状态的变化追加到 .learning_history.jsonl，
+--week / --month 由其索引统计（只读取上次之后新追加的部分）。空白版与原始模板（git HEAD
+中的版本，不在仓库中时为首次见到的内容）不同即记为"已开始"。
 """
 
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import os
+import platform
 import subprocess
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
 # 学习阶段配置（与 learn.py 保持一致）
 STAGES = {
@@ -32,6 +44,11 @@ STAGES = {
 
 PROGRESS_FILE = Path(".learning_progress.json")
 
+CHECK_TIMEOUT = 10  # 单个文件的检查超时（秒）
+
+# 检查结果与解释器有关（如 pandas 行为差异），缓存按解释器版本区分
+INTERPRETER = f"{sys.implementation.name}-{platform.python_version()}"
+
 
 def load_progress() -> Dict:
     """加载学习进度"""
@@ -48,24 +65,329 @@ def save_progress(progress: Dict):
         json.dump(progress, f, indent=2, ensure_ascii=False)
 
 
-def check_file_completion(filepath: Path) -> bool:
-    """检查文件是否完成（通过运行测试）"""
-    if not filepath.exists():
-        return False
+def blob_hash(data: bytes) -> str:
+    """git 的 blob 哈希（与 git hash-object 相同），既是检查缓存的键，也用于和原始模板比较"""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
 
+
+def git_blobs(paths: List[str]) -> Dict[str, str]:
+    """文件在 HEAD 中的 blob 哈希（不在 git 仓库中或 git 不可用时返回空字典）"""
+    try:
+        result = subprocess.run(["git", "ls-tree", "-r", "HEAD", "--", *paths],
+                                capture_output=True, text=True, timeout=CHECK_TIMEOUT)
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    if result.returncode != 0:
+        return {}
+    blobs = {}
+    for line in result.stdout.splitlines():
+        meta, _, path = line.partition("\t")
+        fields = meta.split()
+        if len(fields) == 3:
+            blobs[path] = fields[2]
+    return blobs
+
+
+def record_templates(files: List[Path], templates: Dict[str, str]):
+    """
+    记录空白版的原始模板哈希（已记录的不再改变）
+
+    优先取 HEAD 中的版本（全新副本首次扫描前已修改也能识别）；
+    不在 git 仓库中时以首次见到的内容为模板。
+    """
+    missing = [str(filepath) for filepath in files
+               if str(filepath) not in templates and filepath.exists()]
+    if not missing:
+        return
+    blobs = git_blobs(missing)
+    for key in missing:
+        templates[key] = blobs.get(key) or blob_hash(Path(key).read_bytes())
+
+
+def run_check(filepath: Path) -> Optional[bool]:
+    """
+    运行文件的自测，返回是否通过
+
+    超时或无法运行时返回 None（与运行环境有关，结果不缓存）
+    """
     try:
         result = subprocess.run(
             [sys.executable, str(filepath)],
             capture_output=True,
-            timeout=10,
+            timeout=CHECK_TIMEOUT,
         )
         return result.returncode == 0
     except Exception:
-        return False
-
+        return None
+
+
+def check_files(files: List[Path], cache: Optional[Dict[str, Dict]] = None,
+                jobs: Optional[int] = None,
+                digests: Optional[Dict[str, str]] = None) -> Dict[str, bool]:
+    """
+    并发检查多个文件，未修改的文件直接使用缓存结果
+
+    Args:
+        files: 要检查的文件
+        cache: 检查缓存（文件路径 -> {"hash", "python", "completed"}），原地更新
+        jobs: 并发数（默认 CPU 核数）
+        digests: 传入时填入各现存文件的内容哈希（blob_hash），调用方无需再读一遍文件
+
+    Returns:
+        文件路径 -> 是否完成
+    """
+    cache = {} if cache is None else cache
+    results: Dict[str, bool] = {}
+    pending: Dict[str, str] = {}  # 需要运行的文件 -> 内容哈希
+
+    for filepath in files:
+        key = str(filepath)
+        if not filepath.exists():
+            results[key] = False
+            cache.pop(key, None)
+            continue
+        digest = blob_hash(filepath.read_bytes())
+        if digests is not None:
+            digests[key] = digest
+        entry = cache.get(key)
+        if entry and entry.get("hash") == digest and entry.get("python") == INTERPRETER:
+            results[key] = entry["completed"]
+        else:
+            pending[key] = digest
+
+    if pending:
+        workers = min(len(pending), jobs or os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            outcomes = executor.map(run_check, [Path(key) for key in pending])
+            for (key, digest), completed in zip(pending.items(), outcomes):
+                results[key] = bool(completed)
+                if completed is None:
+                    cache.pop(key, None)
+                else:
+                    cache[key] = {"hash": digest, "python": INTERPRETER, "completed": completed}
+
+    return results
+
+
+HISTORY_FILE = Path(".learning_history.jsonl")
+HISTORY_INDEX_FILE = Path(".learning_history.index.json")
+
+# 历史事件
+STARTED = "started"      # 空白版首次与原始模板不同（时间为文件修改时间）
+COMPLETED = "completed"  # 自测通过（时间为通过时的文件修改时间）
+REVERTED = "reverted"    # 已完成的套题再次不通过
+
+_INDEX_VERSION = 1
+
+
+class LearningHistory:
+    """
+    学习历史：只追加的事件日志（每行一个 [时间戳, 套题, 事件]）+ 增量维护的索引
+
+    索引（按日汇总与各套题的开始/完成时间）连同已读取的日志偏移量保存在
+    .learning_history.index.json，加载时只解析偏移量之后新追加的部分；
+    日志被截断或替换时从头重建。
+    """
+
+    def __init__(self, path: Path = HISTORY_FILE, index_path: Path = HISTORY_INDEX_FILE):
+        self.path = path
+        self.index_path = index_path
+        self.index = self._empty_index()
+        self.load()
+
+    @staticmethod
+    def _empty_index() -> Dict:
+        # days: 日期 -> [事件数, 首次完成数]；sets: 套题 -> 开始/首次完成时间与当前状态
+        return {"version": _INDEX_VERSION, "offset": 0, "check": "", "days": {}, "sets": {}}
+
+    def _check(self, f, offset: int) -> str:
+        """偏移量之前最后一段内容的摘要，用于发现日志被替换"""
+        start = max(0, offset - 64)
+        f.seek(start)
+        return hashlib.sha256(f.read(offset - start)).hexdigest()[:16]
+
+    def load(self):
+        """读取索引快照，再解析日志中快照之后追加的事件"""
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            if index.get("version") != _INDEX_VERSION:
+                raise ValueError("索引版本不符")
+        except (OSError, ValueError):
+            index = self._empty_index()
+
+        if not self.path.exists():
+            self.index = self._empty_index()
+            return
+
+        with open(self.path, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            if index["offset"] > size or self._check(f, index["offset"]) != index["check"]:
+                index = self._empty_index()
+            if index["offset"] == size:
+                self.index = index
+                return
+            f.seek(index["offset"])
+            tail = f.read()
+            # 只处理完整的行（最后一行可能正在写入）
+            end = tail.rfind(b"\n") + 1
+            for line in tail[:end].splitlines():
+                try:
+                    ts, set_name, event = json.loads(line)
+                except ValueError:
+                    continue
+                self._apply(index, ts, set_name, event)
+            index["offset"] += end
+            index["check"] = self._check(f, index["offset"])
+
+        self.index = index
+        self._save_index()
+
+    def _save_index(self):
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        tmp.write_text(json.dumps(self.index, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def _apply(index: Dict, ts: float, set_name: str, event: str):
+        """把一个事件计入索引"""
+        day = index["days"].setdefault(datetime.fromtimestamp(ts).date().isoformat(), [0, 0])
+        day[0] += 1
+        info = index["sets"].setdefault(
+            set_name, {"started": None, "completed": None, "done": False})
+        if event == STARTED:
+            if info["started"] is None or ts < info["started"]:
+                info["started"] = ts
+        elif event == COMPLETED:
+            if info["completed"] is None:
+                info["completed"] = ts
+                day[1] += 1
+            info["done"] = True
+        elif event == REVERTED:
+            info["done"] = False
+
+    def append(self, events: List[Tuple[float, str, str]]):
+        """追加事件（写入日志并更新索引）"""
+        if not events:
+            return
+        self.load()  # 先读入其他进程追加的事件
+        data = "".join(json.dumps([round(ts, 3), set_name, event], separators=(",", ":")) + "\n"
+                       for ts, set_name, event in events).encode("utf-8")
+        with open(self.path, "ab") as f:
+            f.write(data)
+        for ts, set_name, event in events:
+            self._apply(self.index, ts, set_name, event)
+        with open(self.path, "rb") as f:
+            self.index["offset"] += len(data)
+            self.index["check"] = self._check(f, self.index["offset"])
+        self._save_index()
+
+    def record_scan(self, states: Dict[str, Dict], now: Optional[float] = None):
+        """
+        根据一次扫描的结果生成事件
+
+        Args:
+            states: 套题 -> {"completed": 是否通过, "changed": 内容是否与原始模板不同,
+                            "mtime": 文件修改时间}
+            now: 当前时间（REVERTED 事件的时间）
+        """
+        now = datetime.now().timestamp() if now is None else now
+        events = []
+        for set_name, state in states.items():
+            info = self.index["sets"].get(set_name, {})
+            if state["changed"] and not info.get("started"):
+                events.append((state["mtime"], set_name, STARTED))
+            if state["completed"] and not info.get("done"):
+                events.append((state["mtime"], set_name, COMPLETED))
+            elif not state["completed"] and info.get("done"):
+                events.append((now, set_name, REVERTED))
+        self.append(events)
+
+    def velocity(self, period: str = "week", count: int = 4,
+                 today: Optional[date] = None) -> List[Tuple[str, int]]:
+        """
+        最近 count 个周期（"week" 或 "month"）首次完成的套题数，按时间先后排列
+
+        Returns:
+            [(周期标签, 完成数), ...]
+        """
+        today = today or date.today()
+        if period == "week":
+            def key(day: date) -> str:
+                year, week, _ = day.isocalendar()
+                return f"{year}-W{week:02d}"
+            labels = [key(today - timedelta(weeks=i)) for i in range(count)]
+        else:
+            def key(day: date) -> str:
+                return f"{day.year}-{day.month:02d}"
+            labels = []
+            year, month = today.year, today.month
+            for _ in range(count):
+                labels.append(f"{year}-{month:02d}")
+                year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+
+        totals = dict.fromkeys(labels, 0)
+        for day, (_, completed) in self.index["days"].items():
+            label = key(date.fromisoformat(day))
+            if label in totals:
+                totals[label] += completed
+        return [(label, totals[label]) for label in reversed(labels)]
+
+    def streaks(self, today: Optional[date] = None) -> Tuple[int, int]:
+        """连续学习天数：(当前连续天数, 最长连续天数)，当天或前一天有事件才算连续中"""
+        today = today or date.today()
+        days = sorted(date.fromisoformat(day) for day in self.index["days"])
+        longest = run = 0
+        previous = None
+        for day in days:
+            run = run + 1 if previous is not None and (day - previous).days == 1 else 1
+            longest = max(longest, run)
+            previous = day
+        current = run if previous is not None and (today - previous).days <= 1 else 0
+        return current, longest
+
+    def stage_time(self) -> Dict[str, Dict]:
+        """
+        各阶段的用时：已完成且有开始记录的套题，从首次修改到首次通过的时长（小时）
+
+        Returns:
+            阶段编号 -> {"hours": 合计小时, "timed": 计入的套题数, "completed": 已完成套题数}
+        """
+        result = {}
+        for stage_id, stage_info in STAGES.items():
+            hours, timed, completed = 0.0, 0, 0
+            for set_name in stage_info["sets"]:
+                info = self.index["sets"].get(set_name)
+                if not info or info["completed"] is None:
+                    continue
+                completed += 1
+                if info["started"] is not None and info["started"] <= info["completed"]:
+                    hours += (info["completed"] - info["started"]) / 3600
+                    timed += 1
+            result[stage_id] = {"hours": hours, "timed": timed, "completed": completed}
+        return result
+
+
+def scan_progress(jobs: Optional[int] = None, use_cache: bool = True,
+                  history: Optional[LearningHistory] = None) -> Dict[str, Dict]:
+    """
+    扫描所有练习的完成情况，并把完成状态的变化追加到学习历史
+
+    Args:
+        jobs: 并发检查数（默认 CPU 核数）
+        use_cache: 是否使用 .learning_progress.json 中缓存的检查结果
+        history: 学习历史（默认读取 .learning_history.jsonl）
+    """
+    saved = load_progress()
+    cache = saved.get("checks", {}) if use_cache else {}
+    # 原始模板哈希与检查缓存分开保存，--no-cache 与检查超时都不影响"已开始"的判断
+    templates = saved.setdefault("templates", {})
+
+    files = [Path(f"interview_exercises/set_{set_name}_blank.py")
+             for stage_info in STAGES.values() for set_name in stage_info["sets"]]
+    record_templates(files, templates)
+    digests: Dict[str, str] = {}
+    results = check_files(files, cache, jobs, digests)
 
-def scan_progress() -> Dict[str, Dict]:
-    """扫描所有练习的完成情况"""
     progress = {}
 
     for stage_id, stage_info in STAGES.items():
@@ -78,7 +400,7 @@ def scan_progress() -> Dict[str, Dict]:
         for set_name in stage_info["sets"]:
             # 检查空白版是否完成
             blank_file = Path(f"interview_exercises/set_{set_name}_blank.py")
-            is_completed = check_file_completion(blank_file)
+            is_completed = results[str(blank_file)]
 
             stage_progress["sets"][set_name] = {
                 "completed": is_completed,
@@ -90,17 +412,34 @@ def scan_progress() -> Dict[str, Dict]:
 
         progress[stage_id] = stage_progress
 
+    states = {}
+    for stage in progress.values():
+        for set_name, info in stage["sets"].items():
+            key = info["file"]
+            exists = key in digests
+            states[set_name] = {
+                "completed": info["completed"],
+                "changed": exists and key in templates and digests[key] != templates[key],
+                "mtime": os.path.getmtime(key) if exists else datetime.now().timestamp(),
+            }
+    (history or LearningHistory()).record_scan(states)
+
+    saved["checks"] = cache
+    saved["completed"] = [set_name for stage in progress.values()
+                          for set_name, info in stage["sets"].items() if info["completed"]]
+    save_progress(saved)
     return progress
 
 
-def show_progress():
-    """显示学习进度"""
+def show_progress(progress: Optional[Dict[str, Dict]] = None):
+    """显示学习进度（progress 为已有的扫描结果时不再扫描）"""
     print("=" * 70)
     print("📊 学习进度总览")
     print("=" * 70)
     print()
 
-    progress = scan_progress()
+    if progress is None:
+        progress = scan_progress()
     total_sets = sum(len(s["sets"]) for s in STAGES.values())
     total_completed = sum(p["completed"] for p in progress.values())
     total_hours = sum(s["estimated_hours"] for s in STAGES.values())
@@ -174,14 +513,15 @@ def show_progress():
     print()
 
 
-def show_stats():
-    """显示详细统计"""
+def show_stats(progress: Optional[Dict[str, Dict]] = None):
+    """显示详细统计（progress 为已有的扫描结果时不再扫描）"""
     print("=" * 70)
     print("📊 详细统计")
     print("=" * 70)
     print()
 
-    progress = scan_progress()
+    if progress is None:
+        progress = scan_progress()
 
     # 按难度统计
     easy = sum(1 for s in ["A", "K", "L", "M", "X", "F"] if any(
@@ -226,20 +566,79 @@ def show_stats():
     print()
 
 
+def show_history(history: LearningHistory, period: str = "week"):
+    """显示本周/本月的学习情况：完成的套题、完成速度、连续学习天数、各阶段用时"""
+    today = date.today()
+    if period == "week":
+        title, count = "本周", 4
+        period_start = today - timedelta(days=today.weekday())
+    else:
+        title, count = "本月", 6
+        period_start = today.replace(day=1)
+
+    print("=" * 70)
+    print(f"📅 {title}学习情况")
+    print("=" * 70)
+    print()
+
+    sets = history.index["sets"]
+    finished = sorted(
+        (info["completed"], set_name) for set_name, info in sets.items()
+        if info["completed"] is not None
+        and datetime.fromtimestamp(info["completed"]).date() >= period_start
+    )
+    print(f"✅ {title}完成：{len(finished)} 套" +
+          (f"（{', '.join(set_name for _, set_name in finished)}）" if finished else ""))
+
+    current, longest = history.streaks(today)
+    print(f"🔥 连续学习：当前 {current} 天，最长 {longest} 天")
+    print()
+
+    unit = "周" if period == "week" else "月"
+    print(f"📈 最近{count}{unit}完成速度：")
+    rows = history.velocity(period, count, today)
+    peak = max((value for _, value in rows), default=0)
+    for label, value in rows:
+        bar = "█" * (round(value / peak * 20) if peak else 0)
+        print(f"  {label:<9} {bar:<20} {value}")
+    print()
+
+    print("⏱️  各阶段用时（从首次修改到自测通过）：")
+    stage_time = history.stage_time()
+    for stage_id, spent in stage_time.items():
+        if not spent["completed"]:
+            continue
+        stage_info = STAGES[stage_id]
+        timed = f"{spent['hours']:.1f} 小时（{spent['timed']} 套有记录）" if spent["timed"] else "无记录"
+        print(f"  第{stage_id}阶段 {stage_info['name']}：已完成 {spent['completed']}/{len(stage_info['sets'])} 套，"
+              f"用时 {timed}，预计 {stage_info['estimated_hours']:.1f} 小时")
+    if not any(spent["completed"] for spent in stage_time.values()):
+        print("  暂无完成记录")
+    print()
+
+
 def main(argv: List[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="学习进度追踪工具")
     parser.add_argument("--show", action="store_true", help="显示学习进度（默认）")
     parser.add_argument("--stats", action="store_true", help="显示详细统计")
-    parser.add_argument("--week", action="store_true", help="本周进度（暂未实现）")
+    parser.add_argument("--week", action="store_true", help="本周进度（完成速度、连续天数、阶段用时）")
+    parser.add_argument("--month", action="store_true", help="本月进度")
+    parser.add_argument("-j", "--jobs", type=int, help="并发检查数（默认：CPU核数）")
+    parser.add_argument("--no-cache", action="store_true", help="忽略缓存的检查结果，全部重新运行")
 
     args = parser.parse_args(argv)
 
+    # 各视图共用一次扫描（同时记录完成状态的变化）
+    history = LearningHistory()
+    progress = scan_progress(jobs=args.jobs, use_cache=not args.no_cache, history=history)
+    if args.show or not (args.stats or args.week or args.month):
+        show_progress(progress)
     if args.stats:
-        show_stats()
-    elif args.week:
-        print("📅 本周进度功能即将推出...")
-    else:
-        show_progress()
+        show_stats(progress)
+    if args.week:
+        show_history(history, "week")
+    if args.month:
+        show_history(history, "month")
 
     return 0
 
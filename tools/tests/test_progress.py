@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+学习进度测试 - 验证检查结果缓存、一次扫描共用、学习历史的增量索引与统计，
+以及修改空白版后记录"已开始"事件
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import progress
+from progress import (COMPLETED, REVERTED, STARTED, LearningHistory, check_files,
+                      scan_progress)
+
+BLANK = "def f():\n    pass\n\nraise SystemExit(1)\n"
+
+
+def _events(history: LearningHistory, event: str):
+    lines = history.path.read_text(encoding="utf-8").splitlines() if history.path.exists() else []
+    return [line for line in lines if f'"{event}"' in line]
+
+
+def _in_dir(path: str):
+    """切换到临时目录（progress.py 使用相对路径）"""
+    previous = os.getcwd()
+    os.chdir(path)
+    return previous
+
+
+class CountingCheck:
+    """替换 progress.run_check：记录运行过的文件，返回预设结果"""
+
+    def __init__(self, outcome=True):
+        self.outcome = outcome
+        self.calls = []
+
+    def __call__(self, filepath: Path):
+        self.calls.append(str(filepath))
+        return self.outcome
+
+    def __enter__(self):
+        self.saved = progress.run_check
+        progress.run_check = self
+        return self
+
+    def __exit__(self, *exc):
+        progress.run_check = self.saved
+
+
+def test_check_cache_hits_and_invalidation():
+    """测试未修改的文件命中缓存，内容或解释器变化后重新运行"""
+    with tempfile.TemporaryDirectory() as d:
+        first, second = Path(d, "set_A_blank.py"), Path(d, "set_B_blank.py")
+        first.write_text(BLANK, encoding="utf-8")
+        second.write_text(BLANK, encoding="utf-8")
+        missing = Path(d, "set_C_blank.py")
+        files = [first, second, missing]
+        cache = {}
+
+        with CountingCheck() as check:
+            results = check_files(files, cache, jobs=2)
+            assert sorted(check.calls) == sorted([str(first), str(second)]), "不存在的文件不运行"
+            assert results == {str(first): True, str(second): True, str(missing): False}
+            assert set(cache) == {str(first), str(second)}
+
+            check.calls.clear()
+            assert check_files(files, cache, jobs=2) == results
+            assert check.calls == [], "未修改的文件应直接使用缓存"
+
+            first.write_text(BLANK + "# 修改\n", encoding="utf-8")
+            check_files(files, cache, jobs=2)
+            assert check.calls == [str(first)], "只重新运行内容变化的文件"
+
+            check.calls.clear()
+            interpreter = progress.INTERPRETER
+            progress.INTERPRETER = "otherpython-0.0"
+            try:
+                check_files(files, cache, jobs=2)
+            finally:
+                progress.INTERPRETER = interpreter
+            assert sorted(check.calls) == sorted([str(first), str(second)]), "解释器变化后全部重新运行"
+    print("✅ 检查缓存命中，内容或解释器变化时失效")
+
+
+def test_check_timeout_not_cached():
+    """测试超时（run_check 返回 None）记为未完成且不写入缓存，下次重新运行"""
+    with tempfile.TemporaryDirectory() as d:
+        blank = Path(d, "set_A_blank.py")
+        blank.write_text(BLANK, encoding="utf-8")
+        cache = {str(blank): {"hash": "stale", "python": progress.INTERPRETER, "completed": True}}
+
+        with CountingCheck(outcome=None) as check:
+            assert check_files([blank], cache, jobs=1) == {str(blank): False}
+            assert cache == {}, "超时结果不缓存，并移除过期的缓存项"
+            check_files([blank], cache, jobs=1)
+            assert len(check.calls) == 2, "超时后再次检查应重新运行"
+
+        with CountingCheck(outcome=False) as check:
+            check_files([blank], cache, jobs=1)
+            assert cache[str(blank)]["completed"] is False, "确定的失败结果照常缓存"
+    print("✅ 超时结果不缓存")
+
+
+def test_show_and_stats_share_one_scan():
+    """测试 --show --stats 只扫描一次，每个文件只运行一次检查"""
+    with tempfile.TemporaryDirectory() as d:
+        previous = _in_dir(d)
+        scans = []
+        original_scan = progress.scan_progress
+
+        def counting_scan(*args, **kwargs):
+            scans.append(1)
+            return original_scan(*args, **kwargs)
+
+        try:
+            blank = Path("interview_exercises/set_A_blank.py")
+            blank.parent.mkdir()
+            blank.write_text(BLANK, encoding="utf-8")
+            progress.scan_progress = counting_scan
+            with CountingCheck() as check:
+                assert progress.main(["--show", "--stats", "-j", "2"]) == 0
+            assert len(scans) == 1, f"应只扫描一次，实际 {len(scans)} 次"
+            assert check.calls == [str(blank)]
+        finally:
+            progress.scan_progress = original_scan
+            os.chdir(previous)
+    print("✅ --show --stats 共用一次扫描")
+
+
+class CountingHistory(LearningHistory):
+    """记录加载时解析了哪些事件"""
+
+    def __init__(self, directory: str):
+        self.applied = []
+        super().__init__(Path(directory, "history.jsonl"), Path(directory, "history.index.json"))
+
+    def _apply(self, index, ts, set_name, event):
+        self.applied.append((set_name, event))
+        LearningHistory._apply(index, ts, set_name, event)
+
+
+def _ts(*args) -> float:
+    return datetime(*args).timestamp()
+
+
+def _append_raw(history: LearningHistory, text: str):
+    """绕过索引直接追加日志（模拟其他进程写入）"""
+    with open(history.path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+def test_history_tail_loading():
+    """测试加载时只解析索引偏移量之后新追加的事件"""
+    with tempfile.TemporaryDirectory() as d:
+        history = CountingHistory(d)
+        history.append([(_ts(2026, 3, 2, 9), "A", STARTED), (_ts(2026, 3, 2, 11), "A", COMPLETED)])
+
+        reloaded = CountingHistory(d)
+        assert reloaded.applied == [], "日志未变化时直接使用索引快照"
+        assert reloaded.index["sets"]["A"]["done"]
+
+        _append_raw(history, f'[{_ts(2026, 3, 3, 9)},"K","started"]\n')
+        reloaded = CountingHistory(d)
+        assert reloaded.applied == [("K", STARTED)], "只解析新追加的一行"
+        assert reloaded.index["offset"] == history.path.stat().st_size
+        assert set(reloaded.index["sets"]) == {"A", "K"}
+    print("✅ 学习历史增量加载")
+
+
+def test_history_rebuild_on_truncate_or_replace():
+    """测试日志被截断或替换（偏移量之前的内容变化）时从头重建索引"""
+    with tempfile.TemporaryDirectory() as d:
+        history = CountingHistory(d)
+        history.append([(_ts(2026, 3, 2, 9), "A", COMPLETED), (_ts(2026, 3, 2, 10), "K", COMPLETED)])
+
+        # 截断：日志比索引偏移量短
+        history.path.write_text(f'[{_ts(2026, 3, 5, 9)},"B","completed"]\n', encoding="utf-8")
+        reloaded = CountingHistory(d)
+        assert reloaded.applied == [("B", COMPLETED)]
+        assert set(reloaded.index["sets"]) == {"B"}
+
+        # 替换：长度不小于偏移量但内容不同，由 check 摘要发现
+        replaced = f'[{_ts(2026, 3, 6, 9)},"C","completed"]\n' * 2
+        assert len(replaced) >= reloaded.index["offset"]
+        history.path.write_text(replaced, encoding="utf-8")
+        reloaded = CountingHistory(d)
+        assert reloaded.applied == [("C", COMPLETED), ("C", COMPLETED)]
+        assert set(reloaded.index["sets"]) == {"C"}
+        assert reloaded.index["days"] == {"2026-03-06": [2, 1]}
+    print("✅ 日志截断或替换时重建索引")
+
+
+def test_history_skips_partial_line():
+    """测试最后一行尚未写完时不解析，写完后下次加载再计入"""
+    with tempfile.TemporaryDirectory() as d:
+        history = CountingHistory(d)
+        history.append([(_ts(2026, 3, 2, 9), "A", STARTED)])
+        line = f'[{_ts(2026, 3, 2, 11)},"A","completed"]\n'
+
+        _append_raw(history, line[:10])
+        reloaded = CountingHistory(d)
+        assert reloaded.applied == []
+        assert not reloaded.index["sets"]["A"]["done"]
+        assert reloaded.index["offset"] < history.path.stat().st_size
+
+        _append_raw(history, line[10:])
+        reloaded = CountingHistory(d)
+        assert reloaded.applied == [("A", COMPLETED)]
+        assert reloaded.index["sets"]["A"]["done"]
+    print("✅ 跳过写了一半的最后一行")
+
+
+def test_history_velocity():
+    """测试按周、按月统计首次完成数（含跨年），重复完成只计一次"""
+    with tempfile.TemporaryDirectory() as d:
+        history = CountingHistory(d)
+        history.append([
+            (_ts(2025, 11, 20, 9), "A", COMPLETED),
+            (_ts(2025, 12, 24, 9), "K", COMPLETED),   # 2025-W52
+            (_ts(2025, 12, 29, 9), "B", COMPLETED),   # 2026-W01（ISO 周跨年）
+            (_ts(2025, 12, 30, 9), "B", REVERTED),
+            (_ts(2025, 12, 31, 9), "B", COMPLETED),   # 再次完成不重复计数
+            (_ts(2026, 1, 2, 9), "G", COMPLETED),     # 2026-W01
+        ])
+
+        assert history.velocity("week", 4, today=date(2026, 1, 2)) == [
+            ("2025-W50", 0), ("2025-W51", 0), ("2025-W52", 1), ("2026-W01", 2)]
+        assert history.velocity("month", 3, today=date(2026, 1, 15)) == [
+            ("2025-11", 1), ("2025-12", 2), ("2026-01", 1)]
+        assert history.velocity("month", 2, today=date(2026, 3, 1)) == [
+            ("2026-02", 0), ("2026-03", 0)]
+    print("✅ 按周、按月统计完成速度（含跨年）")
+
+
+def test_history_streaks():
+    """测试当前与最长连续学习天数"""
+    with tempfile.TemporaryDirectory() as d:
+        history = CountingHistory(d)
+        assert history.streaks(today=date(2026, 1, 6)) == (0, 0)
+        history.append([(_ts(2025, 12, 31, 9), "A", STARTED), (_ts(2026, 1, 1, 9), "A", COMPLETED),
+                        (_ts(2026, 1, 2, 9), "K", STARTED),
+                        (_ts(2026, 1, 5, 9), "K", COMPLETED), (_ts(2026, 1, 6, 9), "B", STARTED)])
+
+        assert history.streaks(today=date(2026, 1, 6)) == (2, 3)
+        assert history.streaks(today=date(2026, 1, 7)) == (2, 3), "前一天有事件仍算连续中"
+        assert history.streaks(today=date(2026, 1, 8)) == (0, 3)
+    print("✅ 连续学习天数")
+
+
+def test_history_stage_time():
+    """测试各阶段用时：只计入有开始记录的已完成套题"""
+    with tempfile.TemporaryDirectory() as d:
+        history = CountingHistory(d)
+        history.append([
+            (_ts(2026, 3, 2, 9), "A", STARTED), (_ts(2026, 3, 2, 11), "A", COMPLETED),
+            (_ts(2026, 3, 3, 9), "K", COMPLETED),            # 无开始记录：计完成不计时
+            (_ts(2026, 3, 4, 9), "B", STARTED),               # 未完成
+            (_ts(2026, 3, 5, 9), "C", STARTED), (_ts(2026, 3, 5, 9, 30), "C", COMPLETED),
+        ])
+
+        spent = history.stage_time()
+        assert spent["01"] == {"hours": 2.0, "timed": 1, "completed": 2}
+        assert spent["02"] == {"hours": 0.0, "timed": 0, "completed": 0}
+        assert spent["03"] == {"hours": 0.5, "timed": 1, "completed": 1}
+        assert set(spent) == set(progress.STAGES)
+    print("✅ 各阶段用时")
+
+
+def test_started_against_first_seen_template():
+    """测试不在 git 仓库中时以首次见到的内容为模板，修改后记录 STARTED"""
+    with tempfile.TemporaryDirectory() as d:
+        previous = _in_dir(d)
+        try:
+            blank = Path("interview_exercises/set_A_blank.py")
+            blank.parent.mkdir()
+            blank.write_text(BLANK, encoding="utf-8")
+
+            history = LearningHistory()
+            scan_progress(jobs=1, history=history)
+            assert _events(history, STARTED) == [], "未修改的空白版不算开始"
+
+            blank.write_text(BLANK + "# 开始作答\n", encoding="utf-8")
+            scan_progress(jobs=1, use_cache=False, history=history)
+            assert len(_events(history, STARTED)) == 1
+            assert history.index["sets"]["A"]["started"] is not None
+
+            # 再次扫描不重复记录
+            scan_progress(jobs=1, history=history)
+            assert len(_events(history, STARTED)) == 1
+        finally:
+            os.chdir(previous)
+    print("✅ 修改空白版后记录开始事件")
+
+
+def test_started_on_first_scan_of_edited_copy():
+    """测试全新副本在首次扫描前已修改（且不使用缓存）时，按 git 中的原始版本识别为已开始"""
+    if shutil.which("git") is None:
+        print("⚠️  git 不可用，跳过")
+        return
+    with tempfile.TemporaryDirectory() as d:
+        previous = _in_dir(d)
+        try:
+            blank = Path("interview_exercises/set_K_blank.py")
+            blank.parent.mkdir()
+            blank.write_text(BLANK, encoding="utf-8")
+            git = ["git", "-c", "user.name=t", "-c", "user.email=t@example.com"]
+            subprocess.run(git + ["init", "-q"], check=True)
+            subprocess.run(git + ["add", "."], check=True)
+            subprocess.run(git + ["commit", "-q", "-m", "init"], check=True)
+            assert progress.git_blobs([str(blank)])[str(blank)] == progress.blob_hash(blank.read_bytes())
+
+            blank.write_text(BLANK + "# 开始作答\n", encoding="utf-8")
+            history = LearningHistory()
+            scan_progress(jobs=1, use_cache=False, history=history)
+            assert len(_events(history, STARTED)) == 1
+            assert "K" in history.index["sets"]
+        finally:
+            os.chdir(previous)
+    print("✅ 首次扫描即可识别已修改的空白版")
+
+
+if __name__ == '__main__':
+    test_check_cache_hits_and_invalidation()
+    test_check_timeout_not_cached()
+    test_show_and_stats_share_one_scan()
+    test_history_tail_loading()
+    test_history_rebuild_on_truncate_or_replace()
+    test_history_skips_partial_line()
+    test_history_velocity()
+    test_history_streaks()
+    test_history_stage_time()
+    test_started_against_first_seen_template()
+    test_started_on_first_scan_of_edited_copy()
+    print("\n🎉 所有测试通过！")
@@ -4,32 +4,79 @@ Python学习平台 - Web应用后端
 提供交互式学习界面和实时代码执行（安全沙箱模式）
 """
 
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, g, render_template, request, jsonify, send_from_directory, url_for
 from flask_cors import CORS
 import os
 import sys
 import json
+import functools
+import mimetypes
+import re
+import time
 import traceback
 from pathlib import Path
-from typing import Dict, List, Any
-import re
+from typing import Dict, List, Any, Optional
+
+from assets import ENCODING_SUFFIX, IMMUTABLE_CACHE_CONTROL, STATIC_DIR, AssetManifest
+from catalog import QuestionCatalog, CatalogEntry
+from compression import MIN_SIZE as COMPRESS_MIN_SIZE, choose_encoding, compress
+from extractor import extract_functions
+from jobs import HEARTBEAT_INTERVAL, JobManager, JobRejected
+from judge import Judge, JudgeError
+from grader import Grader, unsupported_sets
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, gauge, metrics
+from submissions import SubmissionStore, classify
 
 # 导入安全模块
 try:
     from security.sandbox import sandbox, SecurityError
-    from security.rate_limiter import rate_limiter
+    from security.rate_limiter import BackendUnavailable, rate_limiter
+    from security.admission import admission, AdmissionRejected
+    from security.usage import usage_stats
+    from security.result_cache import result_cache
+    from security import config as security_config
     SANDBOX_ENABLED = True
 except ImportError:
     SANDBOX_ENABLED = False
     rate_limiter = None
+    admission = None
     print("⚠️  警告: 安全沙箱未启用，代码执行存在风险！")
     print("   请运行: pip install -r web/requirements.txt")
 
+# 静态文件由 send_static 提供（需要按构建产物设置缓存头与预压缩编码），不使用 Flask 内置路由
 app = Flask(__name__,
-            static_folder='static',
+            static_folder=None,
             template_folder='templates')
 CORS(app)
 
+# 运行指标（/metrics）
+REQUEST_LATENCY = metrics.histogram(
+    'http_request_duration_seconds', '请求处理耗时（秒）', ('route', 'method', 'status'))
+QUEUE_WAIT = metrics.histogram(
+    'sandbox_queue_wait_seconds', '执行前在准入队列中的等待时间（秒）')
+EXECUTION_TIME = metrics.histogram(
+    'sandbox_execution_seconds', '沙箱执行耗时（秒，含进程创建与结果回传）', ('outcome',))
+RATE_LIMITED = metrics.counter(
+    'rate_limit_rejections_total', '被速率限制拒绝的请求数')
+SECURITY_VIOLATIONS = metrics.counter(
+    'security_violations_total', '未通过安全检查的提交数', ('kind',))
+
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_latency(response):
+    """按路由记录请求耗时（SSE 等流式响应只计到响应头返回）"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - started,
+                                route, request.method, str(response.status_code))
+    return response
+
 # 项目根目录
 ROOT_DIR = Path(__file__).parent.parent  # web/ -> pythonLearn/
 EXERCISES_DIR = ROOT_DIR / "interview_exercises"
@@ -73,29 +120,38 @@ def index():
     return render_template('index.html')
 
 
+# 静态资源构建产物（python assets.py build），模板中用 asset_url() 引用
+assets = AssetManifest(STATIC_DIR)
+app.jinja_env.globals['asset_url'] = assets.url
+
+
 @app.route('/static/<path:path>')
 def send_static(path):
-    """静态文件服务"""
-    return send_from_directory('static', path)
+    """静态文件服务：构建产物按 Accept-Encoding 返回预压缩文件并永久缓存"""
+    if not assets.is_built(path):
+        response = send_from_directory(STATIC_DIR, path)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    available = [encoding for encoding, suffix in ENCODING_SUFFIX.items()
+                 if (STATIC_DIR / (path + suffix)).is_file()]
+    encoding = choose_encoding(request.accept_encodings, available)
+    if encoding:
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        response = send_from_directory(STATIC_DIR, path + ENCODING_SUFFIX[encoding],
+                                       mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+    else:
+        response = send_from_directory(STATIC_DIR, path)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+    return response
 
 
 @app.route('/api/questions')
 def get_questions():
     """获取题目列表"""
-    questions = []
-    for set_id, meta in QUESTION_SETS.items():
-        blank_file = EXERCISES_DIR / f"set_{set_id}_blank.py"
-        if blank_file.exists():
-            questions.append({
-                "id": set_id,
-                "name": meta["name"],
-                "category": meta["category"],
-                "difficulty": meta["difficulty"],
-                "time": meta["time"],
-                "file": f"set_{set_id}_blank.py"
-            })
-    
-    return jsonify({"questions": questions})
+    return cached_json(catalog.listing())
 
 
 @app.route('/api/question/<set_id>')
@@ -103,119 +159,252 @@ def get_question(set_id):
     """获取题目详情"""
     if set_id not in QUESTION_SETS:
         return jsonify({"error": "题目不存在"}), 404
-    
-    blank_file = EXERCISES_DIR / f"set_{set_id}_blank.py"
-    answers_file = EXERCISES_DIR / f"set_{set_id}_answers.py"
-    
-    if not blank_file.exists():
+
+    entry = catalog.question(set_id)
+    if entry is None:
         return jsonify({"error": "题目文件不存在"}), 404
-    
-    # 读取题目代码
-    with open(blank_file, 'r', encoding='utf-8') as f:
-        code = f.read()
-    
-    # 读取答案（如果存在）
-    answer_code = None
-    if answers_file.exists():
-        with open(answers_file, 'r', encoding='utf-8') as f:
-            answer_code = f.read()
-    
-    # 提取函数列表
-    functions = extract_functions(code)
-    
-    return jsonify({
-        "id": set_id,
-        "meta": QUESTION_SETS[set_id],
-        "code": code,
-        "answer_code": answer_code,
-        "functions": functions
-    })
 
+    return cached_json(entry)
 
-def extract_functions(code: str) -> List[Dict[str, str]]:
-    """提取代码中的函数定义"""
-    functions = []
-    lines = code.split('\n')
-    current_func = None
-    
-    for i, line in enumerate(lines):
-        # 匹配函数定义
-        match = re.match(r'^def\s+(\w+)\s*\(([^)]*)\)', line)
-        if match:
-            func_name = match.group(1)
-            func_params = match.group(2)
-            
-            # 查找文档字符串
-            docstring = ""
-            if i + 1 < len(lines) and '"""' in lines[i + 1]:
-                doc_start = i + 1
-                doc_end = doc_start
-                for j in range(doc_start + 1, len(lines)):
-                    if '"""' in lines[j]:
-                        doc_end = j
-                        break
-                docstring = '\n'.join(lines[doc_start:doc_end + 1])
-            
-            functions.append({
-                "name": func_name,
-                "params": func_params,
-                "docstring": docstring,
-                "line": i + 1
-            })
-    
-    return functions
 
+@app.route('/api/question/<set_id>/answer')
+def get_answer(set_id):
+    """获取题目答案（点击"查看答案"时才请求）"""
+    if set_id not in QUESTION_SETS:
+        return jsonify({"error": "题目不存在"}), 404
 
-@app.route('/api/run', methods=['POST'])
-def run_code():
-    """执行代码并返回结果（安全沙箱模式）"""
-    # 1. 速率限制检查
+    entry = catalog.answer(set_id)
+    if entry is None:
+        return jsonify({"error": "该题目暂无答案"}), 404
+
+    return cached_json(entry)
+
+
+def cached_json(entry: CatalogEntry) -> Response:
+    """返回缓存的JSON响应体（按 Accept-Encoding 选用预压缩版本），支持 If-None-Match / 304"""
+    encoding = choose_encoding(request.accept_encodings, entry.encoded)
+    if encoding is None:
+        response = Response(entry.body, mimetype='application/json')
+        response.set_etag(entry.etag)
+    else:
+        response = Response(entry.encoded[encoding], mimetype='application/json')
+        response.headers['Content-Encoding'] = encoding
+        # 不同编码是不同的表示，ETag 需要区分
+        response.set_etag(f"{entry.etag}-{encoding}")
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+
+@app.after_request
+def compress_json(response):
+    """较大的 JSON 响应动态压缩（预压缩与流式响应除外）"""
+    if (response.status_code != 200
+            or response.mimetype != 'application/json'
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers):
+        return response
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    encoding = choose_encoding(request.accept_encodings)
+    response.vary.add('Accept-Encoding')
+    if encoding is not None:
+        response.set_data(compress(body, encoding, dynamic=True))
+        response.headers['Content-Encoding'] = encoding
+    return response
+
+
+# 题目目录缓存（启动时加载，文件变化后自动失效）
+catalog = QuestionCatalog(EXERCISES_DIR, QUESTION_SETS, extract=extract_functions)
+catalog.warm()
+
+
+def check_rate_limit():
+    """
+    速率限制检查，超出限制时返回 429 响应
+
+    计数存储不可用（如 SQLite 后端锁等待超时）时与准入控制一样拒绝执行，
+    返回带 Retry-After 的 503，而不是放行未计数的请求或抛出 500。
+    """
     if rate_limiter:
         client_ip = request.remote_addr or 'unknown'
-        allowed, reason = rate_limiter.is_allowed(client_ip)
+        try:
+            allowed, reason = rate_limiter.is_allowed(client_ip)
+        except BackendUnavailable as e:
+            app.logger.warning("速率限制检查失败: %s", e)
+            return busy_response("服务器繁忙：速率限制检查暂时不可用，请稍后重试",
+                                 security_config.RATE_LIMIT_RETRY_AFTER)
         if not allowed:
+            RATE_LIMITED.inc()
             return jsonify({
                 "success": False,
                 "error": reason,
                 "rate_limit": True
             }), 429
+    return None
+
+
+# 前端生成并保存在浏览器本地的客户端标识（X-Client-Id）
+CLIENT_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{8,64}$')
+
 
-    data = request.json
+def client_id() -> str:
+    """客户端标识：请求头 X-Client-Id，没有或格式不对时使用IP地址"""
+    value = request.headers.get('X-Client-Id', '')
+    if CLIENT_ID_PATTERN.match(value):
+        return value
+    return request.remote_addr or 'unknown'
+
+
+def submission_origin() -> Dict[str, Any]:
+    """提交来源（客户端标识与题目编号），用于提交记录"""
+    data = request.get_json(silent=True) or {}
+    set_id = data.get('set_id')
+    return {"client_id": client_id(), "set_id": set_id if set_id in QUESTION_SETS else None}
+
+
+def check_submission():
+    """
+    速率限制与代码校验（/api/run 与 /api/jobs 共用）
+
+    Returns:
+        (代码, 错误响应)，校验通过时错误响应为 None
+    """
+    # 1. 速率限制检查
+    error = check_rate_limit()
+    if error is not None:
+        return None, error
+
+    data = request.get_json(silent=True) or {}
     code = data.get('code', '')
 
     if not code:
-        return jsonify({"error": "代码不能为空"}), 400
+        return None, (jsonify({"error": "代码不能为空"}), 400)
 
     # 2. 代码长度限制
     if len(code) > 50000:  # 50KB
-        return jsonify({
+        return None, (jsonify({
             "success": False,
             "error": "代码长度超过限制（最大50KB）"
-        }), 400
+        }), 400)
+
+    if not SANDBOX_ENABLED:
+        # 降级模式：不执行代码
+        return None, (jsonify({
+            "success": False,
+            "error": "安全沙箱未启用，代码执行已禁用",
+            "warning": "请联系管理员启用安全沙箱"
+        }), 503)
+
+    return code, None
+
+
+def replay_output(result: Dict[str, Any], on_output=None):
+    """缓存命中时把保存的输出一次性推送给流式客户端"""
+    if on_output is None:
+        return
+    for stream in ('stdout', 'stderr'):
+        if result.get(stream):
+            on_output(stream, result[stream])
+
+
+def execute_submission(code: str, on_output=None,
+                       origin: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    在安全沙箱中执行代码（受并发数与排队长度限制，确定的结果直接取缓存）
+
+    Args:
+        code: 代码
+        on_output: 实时输出回调
+        origin: 提交来源（见 submission_origin），给出时写入提交记录
+    """
+    cached = result_cache.get(code)
+    if cached is not None:
+        replay_output(cached, on_output)
+        record_submission(origin, code, cached)
+        return cached
+
+    with admission.slot() as waited:
+        QUEUE_WAIT.observe(waited)
+        result = timed_execute(code, timeout=10, on_output=on_output)
+    usage_stats.record(result.get("usage"))
+    result_cache.put(code, result)
+    record_submission(origin, code, result, queue_wait=waited)
+    return result
+
+
+def record_submission(origin: Optional[Dict[str, Any]], code: str, result: Dict[str, Any],
+                      queue_wait: Optional[float] = None):
+    """写入提交记录（只入队，由后台线程批量写入）"""
+    if origin is None or submissions is None:
+        return
+    cached = bool(result.get("cached"))
+    usage = {} if cached else (result.get("usage") or {})
+    submissions.record(
+        origin["client_id"], origin["set_id"], code, classify(result),
+        queue_ms=round(queue_wait * 1000, 2) if queue_wait is not None else None,
+        run_ms=usage.get("wall_ms"),
+        peak_rss_kb=usage.get("peak_rss_kb"),
+        cached=cached,
+    )
+
+
+def timed_execute(code: str, timeout: float, on_output=None) -> Dict[str, Any]:
+    """执行并记录耗时（按结果分类：success / error / timeout / rejected）"""
+    started = time.perf_counter()
+    result = sandbox.execute_safe(code, timeout=timeout, on_output=on_output)
+    outcome = classify(result)
+    if outcome == 'rejected':
+        SECURITY_VIOLATIONS.inc('import' if result.get("error") == "安全检查失败" else 'pattern')
+    EXECUTION_TIME.observe(time.perf_counter() - started, outcome)
+    return result
+
+
+def security_violation(result: Dict[str, Any]) -> Dict[str, Any]:
+    """安全违规时返回给客户端的信息"""
+    return {
+        "success": False,
+        "error": result.get("error"),
+        "violations": result.get("violations"),
+        "security_warning": "代码包含不安全的操作，已被阻止"
+    }
+
+
+def busy_response(message: str, retry_after: int, queue_depth: Optional[int] = None) -> Response:
+    """503 繁忙响应（带 Retry-After）"""
+    body = {
+        "success": False,
+        "error": message,
+        "retry_after": retry_after
+    }
+    if queue_depth is not None:
+        body["queue_depth"] = queue_depth
+    response = jsonify(body)
+    response.status_code = 503
+    response.headers["Retry-After"] = str(retry_after)
+    return response
+
+
+@app.route('/api/run', methods=['POST'])
+def run_code():
+    """执行代码并返回结果（安全沙箱模式）"""
+    code, error = check_submission()
+    if error is not None:
+        return error
 
     try:
-        if SANDBOX_ENABLED:
-            # 使用安全沙箱执行
-            result = sandbox.execute_safe(code, timeout=10)
-
-            # 如果有安全违规，返回详细信息
-            if not result.get("success") and "violations" in result:
-                return jsonify({
-                    "success": False,
-                    "error": result.get("error"),
-                    "violations": result.get("violations"),
-                    "security_warning": "代码包含不安全的操作，已被阻止"
-                }), 403
-
-            return jsonify(result)
-
-        else:
-            # 降级模式：使用基本的subprocess执行（不推荐）
-            return jsonify({
-                "success": False,
-                "error": "安全沙箱未启用，代码执行已禁用",
-                "warning": "请联系管理员启用安全沙箱"
-            }), 503
+        result = execute_submission(code, origin=submission_origin())
+
+        # 如果有安全违规，返回详细信息
+        if not result.get("success") and "violations" in result:
+            return jsonify(security_violation(result)), 403
+
+        return jsonify(result)
+
+    except AdmissionRejected as e:
+        return busy_response(str(e), e.retry_after, admission.stats()["queue_depth"])
 
     except SecurityError as e:
         return jsonify({
@@ -230,11 +419,358 @@ def run_code():
         }), 500
 
 
+def run_job(code: str, on_output, origin: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """异步任务的执行函数：异常转换为与 /api/run 一致的错误结果"""
+    try:
+        result = execute_submission(code, on_output=on_output, origin=origin)
+    except AdmissionRejected as e:
+        return {"success": False, "error": str(e), "retry_after": e.retry_after}
+    except SecurityError as e:
+        return {"success": False, "error": f"安全检查失败: {str(e)}"}
+    if not result.get("success") and "violations" in result:
+        return security_violation(result)
+    return result
+
+
+# 提交记录（后台线程批量写入 SQLite）
+if SANDBOX_ENABLED:
+    submissions = SubmissionStore(
+        security_config.SUBMISSION_DB_PATH,
+        max_queue=security_config.SUBMISSION_QUEUE_SIZE,
+        retention_days=security_config.SUBMISSION_RETENTION_DAYS,
+    )
+else:
+    submissions = None
+
+
+# 异步执行任务
+if SANDBOX_ENABLED:
+    jobs = JobManager(
+        run_job,
+        workers=security_config.MAX_CONCURRENT_EXECUTIONS,
+        max_pending=security_config.JOB_MAX_PENDING,
+        ttl=security_config.JOB_RESULT_TTL,
+    )
+else:
+    jobs = JobManager(run_job, workers=1, max_pending=1)
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """提交异步执行任务，立即返回任务ID（202）"""
+    code, error = check_submission()
+    if error is not None:
+        return error
+
+    try:
+        job = jobs.submit(code, context={"origin": submission_origin()})
+    except JobRejected as e:
+        return busy_response(str(e), e.retry_after, jobs.stats()["pending"])
+
+    response = jsonify({
+        "job_id": job.id,
+        "status": job.status,
+        "status_url": url_for('get_job', job_id=job.id),
+        "events_url": url_for('job_events', job_id=job.id),
+    })
+    response.status_code = 202
+    response.headers["Location"] = url_for('get_job', job_id=job.id)
+    return response
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """轮询任务状态与已产生的输出"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "任务不存在或已过期"}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """SSE 事件流：status / stdout / stderr / result，支持 Last-Event-ID 断点续传"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "任务不存在或已过期"}), 404
+
+    try:
+        last_seq = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_seq = 0
+
+    def stream():
+        seq = last_seq
+        yield "retry: 1000\n\n"
+        while True:
+            events = job.events_after(seq, timeout=HEARTBEAT_INTERVAL)
+            if not events:
+                if job.done:
+                    return
+                yield ": heartbeat\n\n"
+                continue
+            for seq, event, data in events:
+                payload = json.dumps(data, ensure_ascii=False)
+                yield f"id: {seq}\nevent: {event}\ndata: {payload}\n\n"
+                if event == 'result':
+                    return
+
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 关闭反向代理缓冲
+    return response
+
+
+@app.route('/api/submissions')
+def get_submissions():
+    """当前客户端最近的提交记录（?limit=N，默认20，最多100）"""
+    if submissions is None:
+        return jsonify({"error": "提交记录未启用"}), 503
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+    return jsonify({"submissions": submissions.recent(client_id(), limit)})
+
+
+@app.route('/api/submissions/stats')
+def get_submission_stats():
+    """按题目统计提交数、通过率与提交人数（?set_id= 只看一套题）"""
+    if submissions is None:
+        return jsonify({"error": "提交记录未启用"}), 503
+    set_id = request.args.get('set_id')
+    if set_id is not None and set_id not in QUESTION_SETS:
+        return jsonify({"error": "题目不存在"}), 404
+    return jsonify({"sets": submissions.set_stats(set_id)})
+
+
+# 性能评测（学生实现与参考答案在同一沙箱中对比耗时与内存）
+judge = Judge(EXERCISES_DIR, run=execute_submission)
+
+
+@app.route('/api/judge')
+def get_judge_specs():
+    """获取可评测的函数列表"""
+    return jsonify({"specs": [spec.to_dict() for spec in judge.specs.values()]})
+
+
+@app.route('/api/judge', methods=['POST'])
+def judge_code():
+    """评测学生实现：正确性 + 相对参考答案的耗时与内存"""
+    code, error = check_submission()
+    if error is not None:
+        return error
+
+    data = request.get_json(silent=True) or {}
+    set_id = data.get('set_id', '')
+    function = data.get('function', '')
+
+    try:
+        return jsonify(judge.evaluate(set_id, function, code))
+
+    except JudgeError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+
+    except AdmissionRejected as e:
+        return busy_response(str(e), e.retry_after, admission.stats()["queue_depth"])
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"评测错误: {str(e)}"
+        }), 500
+
+
+def run_graded(program: str, timeout: float) -> Dict[str, Any]:
+    """批量评分中单套题的执行（调用方已占用执行名额）"""
+    cached = result_cache.get(program)
+    if cached is not None:
+        return cached
+    result = timed_execute(program, timeout=timeout)
+    usage_stats.record(result.get("usage"))
+    result_cache.put(program, result)
+    return result
+
+
+# 批量评分（整批占用一个执行名额）
+if SANDBOX_ENABLED:
+    grader = Grader(
+        run_graded,
+        set_timeout=security_config.GRADE_SET_TIMEOUT,
+        total_timeout=security_config.GRADE_TOTAL_TIMEOUT,
+    )
+else:
+    grader = Grader(run_graded)
+
+
+@functools.lru_cache(maxsize=None)
+def grade_unsupported() -> Dict[str, List[str]]:
+    """不支持评分的套题：参考答案无法通过沙箱安全检查（首次评分时计算）"""
+    return unsupported_sets(EXERCISES_DIR, QUESTION_SETS, sandbox.analyzer.analyze)
+
+
+@app.route('/api/grade')
+def get_grade_sets():
+    """获取支持批量评分的套题，以及不支持的套题和原因"""
+    if not SANDBOX_ENABLED:
+        return jsonify({"error": "安全沙箱未启用"}), 503
+    unsupported = grade_unsupported()
+    return jsonify({
+        "gradable": [set_id for set_id in QUESTION_SETS if set_id not in unsupported],
+        "unsupported": unsupported,
+    })
+
+
+@app.route('/api/grade', methods=['POST'])
+def grade_sets():
+    """批量评分：运行多套题的 _run_self_tests，返回每套题的通过情况与耗时"""
+    error = check_rate_limit()
+    if error is not None:
+        return error
+
+    data = request.get_json(silent=True) or {}
+    sets = data.get('sets')
+    if not isinstance(sets, dict) or not sets:
+        return jsonify({"error": "sets 不能为空，格式为 {套题ID: 代码}"}), 400
+
+    if len(sets) > len(QUESTION_SETS):
+        return jsonify({"success": False, "error": "套题数量超过限制"}), 400
+    for set_id, code in sets.items():
+        if set_id not in QUESTION_SETS:
+            return jsonify({"error": f"题目不存在: {set_id}"}), 404
+        if not isinstance(code, str) or not code.strip():
+            return jsonify({"success": False, "error": f"套题 {set_id} 的代码不能为空"}), 400
+        if len(code) > 50000:  # 50KB
+            return jsonify({
+                "success": False,
+                "error": f"套题 {set_id} 的代码长度超过限制（最大50KB）"
+            }), 400
+
+    if not SANDBOX_ENABLED:
+        return jsonify({
+            "success": False,
+            "error": "安全沙箱未启用，代码执行已禁用"
+        }), 503
+
+    try:
+        with admission.slot():
+            return jsonify(grader.grade(sets, unsupported=grade_unsupported()))
+
+    except AdmissionRejected as e:
+        return busy_response(str(e), e.retry_after, admission.stats()["queue_depth"])
+
+    except Exception as e:
+        return jsonify({
+            "success": False,
+            "error": f"评分错误: {str(e)}"
+        }), 500
+
+
+@app.route('/api/queue')
+def get_queue():
+    """获取执行队列状态"""
+    if not SANDBOX_ENABLED:
+        return jsonify({"error": "安全沙箱未启用"}), 503
+    return jsonify(dict(admission.stats(), jobs=jobs.stats()))
+
+
+@app.route('/api/usage')
+def get_usage():
+    """获取执行资源使用汇总（耗时/CPU/峰值内存/输出量的分位数）"""
+    if not SANDBOX_ENABLED:
+        return jsonify({"error": "安全沙箱未启用"}), 503
+    return jsonify(usage_stats.summary())
+
+
+@app.route('/api/cache')
+def get_cache_stats():
+    """获取各级缓存的命中情况（执行结果、安全检查、题目目录）"""
+    if not SANDBOX_ENABLED:
+        return jsonify({"error": "安全沙箱未启用"}), 503
+    return jsonify({
+        "results": result_cache.stats(),
+        "analysis": sandbox.analyzer.stats(),
+        "catalog": catalog.stats(),
+    })
+
+
+def collect_component_metrics():
+    """采集各组件 stats() 中的指标（仅在 /metrics 请求时调用）"""
+    executions = admission.stats()
+    executor = sandbox.stats()
+    cache = result_cache.stats()
+    analysis = sandbox.analyzer.stats()
+    questions = catalog.stats()
+    pending = jobs.stats()
+    recorded = submissions.stats()
+
+    if executor["mode"] == "pool":
+        processes = executor["alive"]
+    elif executor["mode"] == "zygote":
+        processes = int(executor["alive"]) + executor["active"]
+    else:
+        processes = executor["active"]
+
+    return [
+        gauge('sandbox_active_executions', '正在执行的代码数', executor["active"]),
+        gauge('sandbox_processes', '存活的沙箱进程数（工作进程/孵化进程及其子进程）', processes),
+        ('sandbox_spawn_seconds', 'summary', '沙箱进程创建耗时（秒）', [
+            ({}, executor["spawn_seconds"], '_sum'),
+            ({}, executor["spawned"], '_count'),
+        ]),
+        gauge('admission_queue_depth', '准入队列中等待的请求数', executions["queue_depth"]),
+        ('admission_rejections_total', 'counter', '准入控制拒绝的请求数', [
+            ({"reason": "queue_full"}, executions["rejected"]),
+            ({"reason": "queue_timeout"}, executions["timed_out"]),
+        ]),
+        gauge('jobs_pending', '未结束的异步任务数', pending["pending"]),
+        gauge('submissions_queue_depth', '等待写入的提交记录数', recorded["queue_depth"]),
+        ('submissions_total', 'counter', '提交记录数（按写入结果）', [
+            ({"result": "written"}, recorded["written"]),
+            ({"result": "dropped"}, recorded["dropped"]),
+            ({"result": "error"}, recorded["errors"]),
+        ]),
+        gauge('rate_limit_clients', '速率限制跟踪的客户端数',
+              rate_limiter.client_count() if rate_limiter else None),
+        ('cache_requests_total', 'counter', '缓存查找次数', [
+            ({"cache": "catalog", "result": "hit"}, questions["hits"]),
+            ({"cache": "catalog", "result": "miss"}, questions["misses"]),
+            ({"cache": "analysis", "result": "hit"}, analysis["hits"]),
+            ({"cache": "analysis", "result": "miss"}, analysis["misses"]),
+            ({"cache": "results", "result": "hit"}, cache["hits"]),
+            ({"cache": "results", "result": "miss"}, cache["misses"]),
+        ]),
+        ('cache_hit_ratio', 'gauge', '缓存命中率', [
+            ({"cache": "catalog"}, questions["hit_rate"]),
+            ({"cache": "results"}, cache["hit_rate"]),
+        ]),
+    ]
+
+
+if SANDBOX_ENABLED:
+    metrics.register_collector(collect_component_metrics)
+
+
+@app.route('/metrics')
+def get_metrics():
+    """Prometheus 文本格式的运行指标"""
+    return Response(metrics.render(), content_type=METRICS_CONTENT_TYPE)
+
+
+def warm_up():
+    """
+    接收请求前预热沙箱执行器（孵化进程预导入模块 / 启动工作进程池）
+
+    题目目录在导入时已预热；多进程部署时在每个工作进程 fork 后调用，
+    执行器不能在主进程中启动后再被 fork 共享。
+    """
+    if SANDBOX_ENABLED:
+        rate_limiter.start_evictor()
+        sandbox.warmup()
+
+
 if __name__ == '__main__':
     import os
     port = int(os.environ.get('PORT', 8080))
     print("🚀 Python学习平台启动中...")
     print(f"📖 访问地址: http://localhost:{port}")
-    print("💡 按 Ctrl+C 停止服务")
+    print("💡 按 Ctrl+C 停止服务（开发模式，生产环境请使用 serve.py）")
     app.run(debug=True, host='0.0.0.0', port=port)
 
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+静态资源构建 - 压缩、内容哈希命名、预压缩，生成 manifest
+
+- static/ 下的 .css/.js 压缩后写入 static/dist/，文件名带内容哈希（如 css/style.3f2a9c1b.css），
+  同时写出 .gz（及安装 Brotli 时的 .br）预压缩版本
+- static/dist/manifest.json 记录 源路径 -> 构建后路径，模板通过 asset_url() 引用，
+  内容变化即换文件名，因此构建产物可以永久缓存（Cache-Control: immutable）
+- 未构建时 asset_url() 返回源文件路径（开发模式，修改后刷新即生效）
+
+使用方式:
+    python assets.py build     # 构建（生产模式启动时自动执行）
+    python assets.py clean     # 删除构建产物
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from compression import ENCODINGS, compress
+
+STATIC_DIR = Path(__file__).parent / 'static'
+DIST_DIRNAME = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# 预压缩文件的扩展名
+ENCODING_SUFFIX = {'br': '.br', 'gzip': '.gz'}
+
+# 构建产物的缓存头（文件名随内容变化，可永久缓存）
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+# ---------- 压缩 ----------
+
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_SPACE = re.compile(r'\s+')
+_CSS_PUNCT = re.compile(r'\s*([{};,>])\s*')  # 不含 ':'，避免合并 "a :hover" 这类选择器
+_CSS_COLON = re.compile(r'([{;][^{};:]+):\s+')
+
+
+def minify_css(source: str) -> str:
+    """去掉注释与多余空白（不改写选择器与属性值）"""
+    text = _CSS_COMMENT.sub('', source)
+    text = _CSS_SPACE.sub(' ', text)
+    text = _CSS_PUNCT.sub(r'\1', text)
+    text = _CSS_COLON.sub(r'\1:', text)  # 声明中的 "color: red"
+    return text.replace(';}', '}').strip() + '\n'
+
+
+# 其后出现的 / 是正则字面量而不是除号
+_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^') | {''}
+
+
+def minify_js(source: str) -> str:
+    """
+    去掉注释、缩进与空行，连续空白合并为一个空格或一个换行
+
+    保留换行（不依赖自动分号插入规则的改写），字符串、模板字符串与正则字面量原样输出。
+    """
+    out = []
+    i, n = 0, len(source)
+    last = ''          # 上一个非空白输出字符
+    templates = []     # 模板字符串中 ${ 的花括号深度栈
+
+    def emit(text: str):
+        nonlocal last
+        out.append(text)
+        stripped = text.strip()
+        if stripped:
+            last = stripped[-1]
+
+    def space(sep: str):
+        """相邻的空白（含被删除的注释）合并为一个，有换行时保留换行"""
+        if out and out[-1] in (' ', '\n'):
+            if sep == '\n':
+                out[-1] = sep
+        else:
+            out.append(sep)
+
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1] if i + 1 < n else ''
+
+        if c == '/' and nxt == '/':
+            i = source.find('\n', i)
+            i = n if i < 0 else i
+            continue
+        if c == '/' and nxt == '*':
+            end = source.find('*/', i + 2)
+            end = n if end < 0 else end + 2
+            space('\n' if '\n' in source[i:end] else ' ')
+            i = end
+            continue
+
+        if c in '\'"' or (c == '/' and last in _REGEX_PRECEDERS):
+            j = i + 1
+            in_class = False
+            while j < n:
+                if source[j] == '\\':
+                    j += 2
+                    continue
+                if c == '/' and source[j] == '[':
+                    in_class = True
+                elif c == '/' and source[j] == ']':
+                    in_class = False
+                elif source[j] == c and not in_class:
+                    break
+                elif source[j] == '\n':
+                    break
+                j += 1
+            if c == '/':
+                j += 1
+                while j < n and source[j].isalpha():  # 正则标志
+                    j += 1
+                emit(source[i:j])
+            else:
+                emit(source[i:j + 1])
+                j += 1
+            i = j
+            continue
+
+        if c == '`' or (c == '}' and templates and templates[-1] == 0):
+            # 模板字符串（或 ${...} 结束后的剩余部分）原样输出到下一个 ` 或 ${
+            if c == '}':
+                templates.pop()
+            j = i + 1
+            while j < n:
+                if source[j] == '\\':
+                    j += 2
+                    continue
+                if source[j] == '`':
+                    j += 1
+                    break
+                if source[j] == '$' and j + 1 < n and source[j + 1] == '{':
+                    j += 2
+                    templates.append(0)
+                    break
+                j += 1
+            emit(source[i:j])
+            i = j
+            continue
+
+        if c in '{}' and templates:
+            templates[-1] += 1 if c == '{' else -1
+
+        if c.isspace():
+            j = i
+            while j < n and source[j].isspace():
+                j += 1
+            space('\n' if '\n' in source[i:j] else ' ')
+            i = j
+            continue
+
+        emit(c)
+        i += 1
+
+    return ''.join(out).strip() + '\n'
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+# ---------- 构建 ----------
+
+def _hashed_name(relative: Path, content: bytes) -> Path:
+    digest = hashlib.sha256(content).hexdigest()[:10]
+    return relative.with_name(f"{relative.stem}.{digest}{relative.suffix}")
+
+
+def build(static_dir: Path = STATIC_DIR, verbose: bool = False) -> Dict[str, str]:
+    """
+    构建全部 .css/.js，返回 manifest（源路径 -> 构建后路径，均相对 static/）
+
+    先写入临时目录再整体替换 dist/，运行中的服务不会读到一半的构建结果。
+    """
+    dist = static_dir / DIST_DIRNAME
+    staging = static_dir / f".{DIST_DIRNAME}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    manifest = {}
+    for path in sorted(static_dir.rglob('*')):
+        relative = path.relative_to(static_dir)
+        if (path.suffix not in MINIFIERS or not path.is_file()
+                or relative.parts[0] in (DIST_DIRNAME, staging.name)):
+            continue
+        source = path.read_text(encoding='utf-8')
+        content = MINIFIERS[path.suffix](source).encode('utf-8')
+        hashed = _hashed_name(relative, content)
+
+        target = staging / hashed
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(content)
+        for encoding in ENCODINGS:
+            target.with_name(target.name + ENCODING_SUFFIX[encoding]).write_bytes(
+                compress(content, encoding))
+
+        manifest[relative.as_posix()] = f"{DIST_DIRNAME}/{hashed.as_posix()}"
+        if verbose:
+            print(f"  {relative.as_posix()} -> {DIST_DIRNAME}/{hashed.as_posix()} "
+                  f"({len(source.encode('utf-8'))} -> {len(content)} 字节)")
+
+    (staging / MANIFEST_NAME).write_text(
+        json.dumps(manifest, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    shutil.rmtree(dist, ignore_errors=True)
+    staging.rename(dist)
+    return manifest
+
+
+def clean(static_dir: Path = STATIC_DIR):
+    """删除构建产物"""
+    shutil.rmtree(static_dir / DIST_DIRNAME, ignore_errors=True)
+
+
+# ---------- 运行时 ----------
+
+class AssetManifest:
+    """构建产物的路径映射（manifest 文件变化后自动重新读取）"""
+
+    def __init__(self, static_dir: Path = STATIC_DIR, url_prefix: str = '/static'):
+        """
+        Args:
+            static_dir: 静态文件目录
+            url_prefix: 静态文件的 URL 前缀
+        """
+        self.static_dir = static_dir
+        self.url_prefix = url_prefix.rstrip('/')
+        self.path = static_dir / DIST_DIRNAME / MANIFEST_NAME
+
+        self._lock = threading.Lock()
+        self._mapping: Dict[str, str] = {}
+        self._state: Optional[tuple] = None
+
+    def _load(self) -> Dict[str, str]:
+        try:
+            st = self.path.stat()
+            state = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            state = None
+        if state != self._state:
+            with self._lock:
+                try:
+                    mapping = json.loads(self.path.read_text(encoding='utf-8')) if state else {}
+                except (OSError, ValueError):
+                    mapping = {}
+                self._mapping, self._state = mapping, state
+        return self._mapping
+
+    def url(self, path: str) -> str:
+        """模板中引用静态资源：已构建时返回带哈希的路径，否则返回源文件路径"""
+        return f"{self.url_prefix}/{self._load().get(path, path)}"
+
+    def is_built(self, path: str) -> bool:
+        """是否为构建产物（位于 dist/ 且由 manifest 记录）"""
+        return path in self._load().values()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='静态资源构建')
+    parser.add_argument('command', choices=['build', 'clean'], help='要执行的命令')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        print("📦 构建静态资源...")
+        manifest = build(verbose=True)
+        print(f"✅ 完成：{len(manifest)} 个文件（{', '.join(ENCODINGS)} 预压缩）")
+    else:
+        clean()
+        print("✅ 已删除构建产物")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+题目目录缓存 - 启动时解析全部题目，按文件 mtime 失效，支持 ETag/304
+
+- 题目列表、题目详情与答案的 JSON 响应体预先序列化、预先压缩（gzip/brotli）并缓存
+- 答案单独缓存与下发（/api/question/<id>/answer），题目详情只带 has_answer 标记
+- 每隔 check_interval 秒最多检查一次文件 mtime/大小，期间的请求不访问磁盘
+- 文件变化后重新读取；内容哈希不变时沿用原 ETag
+"""
+
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from compression import precompress
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class CatalogEntry:
+    """一条缓存的 JSON 响应"""
+
+    __slots__ = ('payload', 'body', 'encoded', 'etag', 'sources')
+
+    def __init__(self, payload: Dict[str, Any], body: bytes, etag: str,
+                 sources: Dict[Path, Tuple[int, int]],
+                 encoded: Optional[Dict[str, bytes]] = None):
+        self.payload = payload
+        self.body = body
+        self.encoded = precompress(body) if encoded is None else encoded  # 编码 -> 压缩后的响应体
+        self.etag = etag
+        self.sources = sources  # 文件 -> (mtime_ns, size)，不存在为 None
+
+    def with_sources(self, sources: Dict[Path, Tuple[int, int]]) -> 'CatalogEntry':
+        """内容未变、仅文件状态变化时复用响应体与压缩结果"""
+        return CatalogEntry(self.payload, self.body, self.etag, sources, self.encoded)
+
+
+def _etag(*parts: Optional[bytes]) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part or b'')
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def _file_state(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class QuestionCatalog:
+    """题目目录缓存"""
+
+    def __init__(self, exercises_dir: Path, question_sets: Dict[str, Dict[str, str]],
+                 extract: Callable[[str], List[Dict[str, Any]]],
+                 check_interval: float = 2.0):
+        """
+        初始化题目目录
+
+        Args:
+            exercises_dir: 题目文件目录
+            question_sets: 题目元数据 {set_id: meta}
+            extract: 从题目代码提取函数列表的函数
+            check_interval: 检查文件变化的最小间隔（秒）
+        """
+        self.exercises_dir = exercises_dir
+        self.question_sets = question_sets
+        self.extract = extract
+        self.check_interval = check_interval
+
+        self._lock = threading.Lock()
+        self._questions: Dict[str, CatalogEntry] = {}
+        self._answers: Dict[str, CatalogEntry] = {}
+        self._listing: Optional[CatalogEntry] = None
+        self._last_check = 0.0
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _paths(self, set_id: str) -> Tuple[Path, Path]:
+        return (self.exercises_dir / f"set_{set_id}_blank.py",
+                self.exercises_dir / f"set_{set_id}_answers.py")
+
+    def warm(self):
+        """加载全部题目（启动时调用）"""
+        with self._lock:
+            self._reload_all()
+            self._last_check = time.monotonic()
+
+    def listing(self) -> CatalogEntry:
+        """题目列表"""
+        self._refresh_if_due()
+        return self._listing
+
+    def question(self, set_id: str) -> Optional[CatalogEntry]:
+        """题目详情；题目不存在或文件缺失时返回 None"""
+        if self._refresh_if_due():
+            self.misses += 1
+        else:
+            self.hits += 1
+        return self._questions.get(set_id)
+
+    def answer(self, set_id: str) -> Optional[CatalogEntry]:
+        """题目答案；题目没有答案文件时返回 None"""
+        if self._refresh_if_due():
+            self.misses += 1
+        else:
+            self.hits += 1
+        return self._answers.get(set_id)
+
+    def _refresh_if_due(self) -> bool:
+        """到达检查间隔时检查文件变化，返回是否重新加载"""
+        now = time.monotonic()
+        if self._listing is not None and now - self._last_check < self.check_interval:
+            return False
+        with self._lock:
+            if self._listing is not None and now - self._last_check < self.check_interval:
+                return False
+            reload = self._listing is None or self._changed()
+            if reload:
+                self._reload_all()
+            self._last_check = now
+            return reload
+
+    def _changed(self) -> bool:
+        """是否有题目文件发生变化"""
+        for set_id in self.question_sets:
+            entry = self._questions.get(set_id)
+            paths = self._paths(set_id)
+            if entry is None:
+                if _file_state(paths[0]) is not None:
+                    return True
+                continue
+            for path in paths:
+                if _file_state(path) != entry.sources.get(path):
+                    return True
+        return False
+
+    def _reload_all(self):
+        """重新构建变化的题目条目与题目列表（调用方持有锁）"""
+        questions = {}
+        answers = {}
+        for set_id, meta in self.question_sets.items():
+            old = self._questions.get(set_id)
+            blank_file, answers_file = self._paths(set_id)
+            sources = {blank_file: _file_state(blank_file),
+                       answers_file: _file_state(answers_file)}
+            if sources[blank_file] is None:
+                continue
+            if old is not None and old.sources == sources:
+                questions[set_id] = old
+                if set_id in self._answers:
+                    answers[set_id] = self._answers[set_id]
+                continue
+            loaded = self._load_question(set_id, meta, sources, old, self._answers.get(set_id))
+            if loaded is not None:
+                questions[set_id], answer = loaded
+                if answer is not None:
+                    answers[set_id] = answer
+                self.reloads += 1
+
+        self._questions = questions
+        self._answers = answers
+        listing = {"questions": [
+            {
+                "id": set_id,
+                "name": meta["name"],
+                "category": meta["category"],
+                "difficulty": meta["difficulty"],
+                "time": meta["time"],
+                "file": f"set_{set_id}_blank.py"
+            }
+            for set_id, meta in self.question_sets.items() if set_id in questions
+        ]}
+        body = _dumps(listing)
+        self._listing = CatalogEntry(listing, body, hashlib.sha256(body).hexdigest()[:32], {})
+
+    def _load_question(self, set_id: str, meta: Dict[str, str],
+                       sources: Dict[Path, Optional[Tuple[int, int]]],
+                       old: Optional[CatalogEntry], old_answer: Optional[CatalogEntry]
+                       ) -> Optional[Tuple[CatalogEntry, Optional[CatalogEntry]]]:
+        """加载题目详情与答案两个条目；内容未变（仅 mtime 变化）时沿用原条目"""
+        blank_file, answers_file = self._paths(set_id)
+        try:
+            raw_code = blank_file.read_bytes()
+            raw_answer = answers_file.read_bytes() if sources[answers_file] else None
+        except OSError:
+            return None
+
+        answer = None
+        if raw_answer is not None:
+            answer_etag = _etag(raw_answer)
+            if old_answer is not None and old_answer.etag == answer_etag:
+                answer = old_answer.with_sources(sources)
+            else:
+                payload = {"id": set_id, "answer_code": raw_answer.decode('utf-8')}
+                answer = CatalogEntry(payload, _dumps(payload), answer_etag, sources)
+
+        etag = _etag(raw_code, b'1' if raw_answer is not None else b'0')
+        if old is not None and old.etag == etag:
+            return old.with_sources(sources), answer
+
+        code = raw_code.decode('utf-8')
+        payload = {
+            "id": set_id,
+            "meta": meta,
+            "code": code,
+            "has_answer": raw_answer is not None,
+            "functions": self.extract(code)
+        }
+        return CatalogEntry(payload, _dumps(payload), etag, sources), answer
+
+    def stats(self) -> Dict[str, Any]:
+        """缓存命中统计"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._questions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
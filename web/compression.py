@@ -0,0 +1,67 @@
+"""
+响应压缩 - gzip（标准库）与 brotli（可选依赖，未安装时只用 gzip）
+
+- 缓存的响应体（题目列表、题目详情、答案）在加载时按最高压缩率预先压缩，
+  请求时按 Accept-Encoding 直接选用，不再重复压缩
+- 其他较大的 JSON 响应在返回前以较低压缩级别动态压缩
+- 小于 MIN_SIZE 的响应体不压缩（收益小于压缩头部与 CPU 开销）
+"""
+
+import gzip
+from typing import Dict, Iterable, Mapping, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_SIZE = 1024
+
+# 客户端同时支持时优先使用的顺序
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+# 预压缩（加载时一次）与动态压缩（每次响应）的压缩级别
+_PRECOMPRESS_LEVEL = {'br': 11, 'gzip': 9}
+_DYNAMIC_LEVEL = {'br': 4, 'gzip': 5}
+
+
+def compress(body: bytes, encoding: str, dynamic: bool = False) -> bytes:
+    """按指定编码压缩"""
+    level = (_DYNAMIC_LEVEL if dynamic else _PRECOMPRESS_LEVEL)[encoding]
+    if encoding == 'br':
+        return brotli.compress(body, quality=level)
+    if encoding == 'gzip':
+        # mtime=0：相同内容得到相同的压缩结果
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    raise ValueError(f"不支持的压缩编码: {encoding}")
+
+
+def precompress(body: bytes) -> Dict[str, bytes]:
+    """预先压缩为所有可用编码（只保留确实变小的结果）"""
+    if len(body) < MIN_SIZE:
+        return {}
+    encoded = {}
+    for encoding in ENCODINGS:
+        data = compress(body, encoding)
+        if len(data) < len(body):
+            encoded[encoding] = data
+    return encoded
+
+
+def choose_encoding(accept: Mapping[str, float],
+                    available: Iterable[str] = ENCODINGS) -> Optional[str]:
+    """
+    按客户端的 Accept-Encoding 选择编码
+
+    Args:
+        accept: 编码 -> 权重（werkzeug 的 request.accept_encodings，未列出的编码为 0）
+        available: 可用的编码
+
+    Returns:
+        选中的编码，客户端不支持任何可用编码时返回 None
+    """
+    available = set(available)
+    for encoding in ENCODINGS:
+        if encoding in available and accept[encoding] > 0:
+            return encoding
+    return None
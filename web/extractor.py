@@ -0,0 +1,151 @@
+"""
+函数提取 - 基于AST解析题目代码中的类、方法与函数
+
+- 支持多行签名、async def、类与方法、单行文档字符串
+- 结果按代码内容哈希缓存，同一版本的文件只解析一次
+- 代码存在语法错误时（题目未填写完整）退回逐行正则扫描
+"""
+
+import ast
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+_CACHE_SIZE = 256
+_cache: "OrderedDict[str, List[Dict[str, Any]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def extract_functions(code: str) -> List[Dict[str, Any]]:
+    """
+    提取代码中的类、方法与函数定义
+
+    Returns:
+        按行号排序的定义列表，每项包含 name / params / signature / docstring /
+        line / end_line / kind / parent / decorators。
+        结果会被缓存共享，调用方不应修改。
+    """
+    digest = hashlib.sha256(code.encode('utf-8')).hexdigest()
+    with _cache_lock:
+        cached = _cache.get(digest)
+        if cached is not None:
+            _cache.move_to_end(digest)
+            return cached
+
+    try:
+        functions = _extract_ast(code)
+    except SyntaxError:
+        functions = _extract_regex(code)
+
+    with _cache_lock:
+        _cache[digest] = functions
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return functions
+
+
+def _extract_ast(code: str) -> List[Dict[str, Any]]:
+    tree = ast.parse(code)
+    functions: List[Dict[str, Any]] = []
+    _visit_body(tree.body, None, functions)
+    functions.sort(key=lambda f: f["line"])
+    return functions
+
+
+def _visit_body(body: List[ast.stmt], parent: Optional[str], out: List[Dict[str, Any]]):
+    """收集模块级与类体内的定义（不进入函数体内部）"""
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            out.append(_describe_function(node, parent))
+        elif isinstance(node, ast.ClassDef):
+            out.append(_describe_class(node, parent))
+            qualname = f"{parent}.{node.name}" if parent else node.name
+            _visit_body(node.body, qualname, out)
+
+
+def _describe_function(node, parent: Optional[str]) -> Dict[str, Any]:
+    is_async = isinstance(node, ast.AsyncFunctionDef)
+    params = ast.unparse(node.args)
+    signature = f"{'async ' if is_async else ''}def {node.name}({params})"
+    if node.returns is not None:
+        signature += f" -> {ast.unparse(node.returns)}"
+
+    kind = "method" if parent else "function"
+    if is_async:
+        kind = f"async_{kind}"
+
+    return {
+        "name": node.name,
+        "params": params,
+        "signature": signature,
+        "docstring": ast.get_docstring(node) or "",
+        "line": node.lineno,
+        "end_line": node.end_lineno,
+        "kind": kind,
+        "parent": parent,
+        "decorators": [ast.unparse(d) for d in node.decorator_list],
+    }
+
+
+def _describe_class(node: ast.ClassDef, parent: Optional[str]) -> Dict[str, Any]:
+    bases = [ast.unparse(b) for b in node.bases]
+    bases += [ast.unparse(k) for k in node.keywords]
+    params = ", ".join(bases)
+    signature = f"class {node.name}({params})" if params else f"class {node.name}"
+
+    return {
+        "name": node.name,
+        "params": params,
+        "signature": signature,
+        "docstring": ast.get_docstring(node) or "",
+        "line": node.lineno,
+        "end_line": node.end_lineno,
+        "kind": "class",
+        "parent": parent,
+        "decorators": [ast.unparse(d) for d in node.decorator_list],
+    }
+
+
+def _extract_regex(code: str) -> List[Dict[str, Any]]:
+    """逐行扫描顶层函数（用于无法解析的代码）"""
+    functions = []
+    lines = code.split('\n')
+
+    for i, line in enumerate(lines):
+        match = re.match(r'^(async\s+)?def\s+(\w+)\s*\(([^)]*)\)', line)
+        if not match:
+            continue
+        is_async = bool(match.group(1))
+        name, params = match.group(2), match.group(3)
+
+        # 查找文档字符串
+        docstring = ""
+        if i + 1 < len(lines):
+            stripped = lines[i + 1].strip()
+            if stripped.startswith('"""'):
+                if stripped.count('"""') >= 2 and len(stripped) > 3:
+                    docstring = stripped.strip('"')
+                else:
+                    doc_lines = [stripped[3:]]
+                    for j in range(i + 2, len(lines)):
+                        if '"""' in lines[j]:
+                            doc_lines.append(lines[j].split('"""')[0].strip())
+                            break
+                        doc_lines.append(lines[j].strip())
+                    docstring = '\n'.join(doc_lines).strip()
+
+        functions.append({
+            "name": name,
+            "params": params,
+            "signature": f"{'async ' if is_async else ''}def {name}({params})",
+            "docstring": docstring,
+            "line": i + 1,
+            "end_line": i + 1,
+            "kind": "async_function" if is_async else "function",
+            "parent": None,
+            "decorators": [],
+        })
+
+    return functions
@@ -0,0 +1,183 @@
+"""
+批量评分 - 一次请求运行多套题的 _run_self_tests
+
+- 每套题单独执行（孵化进程下每套 fork 一个子进程），互不影响，各自有超时
+- 整批只占用一个执行名额，复用已预热的执行器，不再每套题一次往返、一次进程创建
+- 去掉 `from __future__` 与 `if __name__ == "__main__"` 样板代码后再做安全检查，
+  末尾追加 `_run_self_tests()` 调用（异步版本用 asyncio.run）
+- 参考答案本身无法通过沙箱安全检查的套题（用到 os/threading/asyncio、双下划线方法等）
+  不支持在线评分，直接标记为 unsupported，不执行
+"""
+
+import ast
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+RunFunction = Callable[[str, float], Dict[str, Any]]
+
+SELF_TEST = '_run_self_tests'
+
+# 每套题的评分状态
+PASSED = 'passed'        # 自检断言全部通过
+FAILED = 'failed'        # 断言失败或运行出错
+TIMEOUT = 'timeout'      # 超时
+REJECTED = 'rejected'    # 未通过安全检查
+INVALID = 'invalid'      # 语法错误或缺少 _run_self_tests
+SKIPPED = 'skipped'      # 整批时间预算用完，未执行
+UNSUPPORTED = 'unsupported'  # 参考答案无法通过沙箱安全检查，该套题不支持评分
+
+
+class GradeError(Exception):
+    """提交的代码无法评分"""
+    pass
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    """是否为 `if __name__ == "__main__":` 语句"""
+    return (isinstance(node, ast.If)
+            and isinstance(node.test, ast.Compare)
+            and isinstance(node.test.left, ast.Name)
+            and node.test.left.id == '__name__')
+
+
+def prepare_program(code: str) -> str:
+    """
+    生成评分用程序：去掉样板代码，末尾调用 _run_self_tests()
+
+    Raises:
+        GradeError: 语法错误或缺少 _run_self_tests
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        raise GradeError(f"语法错误: {e}")
+
+    self_test = next((node for node in tree.body
+                      if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+                      and node.name == SELF_TEST), None)
+    if self_test is None:
+        raise GradeError(f"缺少 {SELF_TEST}()")
+
+    dropped = set()
+    for node in tree.body:
+        if (isinstance(node, ast.ImportFrom) and node.module == '__future__') \
+                or _is_main_guard(node):
+            dropped.update(range(node.lineno, node.end_lineno + 1))
+
+    lines = [line for number, line in enumerate(code.splitlines(), 1)
+             if number not in dropped]
+    if isinstance(self_test, ast.AsyncFunctionDef):
+        lines += ['', 'import asyncio', f'asyncio.run({SELF_TEST}())', '']
+    else:
+        lines += ['', f'{SELF_TEST}()', '']
+    return '\n'.join(lines)
+
+
+def unsupported_sets(exercises_dir: Path, set_ids: Iterable[str],
+                     analyze: Callable[[str], Any]) -> Dict[str, List[str]]:
+    """
+    找出不支持评分的套题：参考答案（set_<ID>_answers.py）按评分方式处理后无法通过安全检查
+
+    Args:
+        exercises_dir: 题目目录
+        set_ids: 要检查的套题
+        analyze: 安全分析函数（SecurityAnalyzer.analyze）
+
+    Returns:
+        {set_id: 违规项}，只包含不支持评分的套题
+    """
+    unsupported: Dict[str, List[str]] = {}
+    for set_id in set_ids:
+        path = exercises_dir / f"set_{set_id}_answers.py"
+        try:
+            program = prepare_program(path.read_text(encoding='utf-8'))
+        except (OSError, GradeError) as e:
+            unsupported[set_id] = [f"参考答案不可用: {e}"]
+            continue
+        analysis = analyze(program)
+        if not analysis.safe:
+            violations = list(analysis.import_violations) + list(analysis.pattern_violations)
+            unsupported[set_id] = list(dict.fromkeys(violations)) or [analysis.syntax_error]
+    return unsupported
+
+
+class Grader:
+    """批量评分器"""
+
+    def __init__(self, run: RunFunction, set_timeout: float = 10,
+                 total_timeout: float = 120):
+        """
+        Args:
+            run: 在沙箱中执行代码的函数 run(code, timeout) -> 结果字典
+            set_timeout: 每套题的超时时间（秒）
+            total_timeout: 整批的时间预算（秒），用完后剩余题目标记为 skipped
+        """
+        self.run = run
+        self.set_timeout = set_timeout
+        self.total_timeout = total_timeout
+
+    def grade(self, submissions: Dict[str, str],
+              unsupported: Optional[Mapping[str, Sequence[str]]] = None) -> Dict[str, Any]:
+        """
+        依次评分
+
+        Args:
+            submissions: {set_id: 代码}
+            unsupported: 不支持评分的套题及原因（见 unsupported_sets），这些套题不执行
+
+        Returns:
+            {"results": [每套题的结果], "passed", "total", "seconds"}
+        """
+        unsupported = unsupported or {}
+        started = time.monotonic()
+        results: List[Dict[str, Any]] = []
+        for set_id, code in submissions.items():
+            if set_id in unsupported:
+                results.append({"set_id": set_id, "status": UNSUPPORTED, "passed": False,
+                                "seconds": 0.0, "violations": list(unsupported[set_id]),
+                                "error": "该套题的参考答案无法通过沙箱安全检查，不支持在线评分"})
+                continue
+            remaining = self.total_timeout - (time.monotonic() - started)
+            if remaining <= 0:
+                results.append({"set_id": set_id, "status": SKIPPED, "passed": False,
+                                "seconds": 0.0, "error": "超出整批评分时间"})
+                continue
+            results.append(self._grade_one(set_id, code, min(self.set_timeout, remaining)))
+
+        return {
+            "results": results,
+            "passed": sum(1 for r in results if r["passed"]),
+            "total": len(results),
+            "seconds": round(time.monotonic() - started, 3),
+        }
+
+    def _grade_one(self, set_id: str, code: str, timeout: float) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {"set_id": set_id}
+        try:
+            program = prepare_program(code)
+        except GradeError as e:
+            entry.update(status=INVALID, passed=False, seconds=0.0, error=str(e))
+            return entry
+
+        started = time.monotonic()
+        result = self.run(program, timeout)
+        entry["seconds"] = round(time.monotonic() - started, 3)
+        if result.get("usage"):
+            entry["usage"] = result["usage"]
+
+        if result.get("success"):
+            entry.update(status=PASSED, passed=True, stdout=result.get("stdout", ""))
+            return entry
+
+        error = result.get("error") or "未知错误"
+        if "violations" in result:
+            status = REJECTED
+            entry["violations"] = result["violations"]
+        elif "超时" in error:
+            status = TIMEOUT
+        else:
+            status = FAILED
+        entry.update(status=status, passed=False, error=error,
+                     stdout=result.get("stdout", ""), stderr=result.get("stderr", ""))
+        return entry
@@ -0,0 +1,205 @@
+"""
+异步执行任务 - 提交后立即返回任务ID，客户端轮询状态或订阅 SSE 事件流
+
+- 任务在有界线程池中执行，Web 工作线程不再阻塞等待代码运行结束
+- 每个任务保存按序号排列的事件（status / stdout / stderr / result），
+  SSE 断线重连时按 Last-Event-ID 从断点继续推送
+- 结束的任务保留 ttl 秒后清理
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 任务状态
+QUEUED = 'queued'
+RUNNING = 'running'
+FINISHED = 'finished'
+
+HEARTBEAT_INTERVAL = 15  # SSE 无新事件时发送心跳的间隔（秒）
+
+# run(code, on_output, **context) -> 结果字典
+RunFunction = Callable[..., Dict[str, Any]]
+
+
+class JobRejected(Exception):
+    """待执行任务过多，拒绝提交"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Job:
+    """一次异步执行"""
+
+    def __init__(self, job_id: str, code: str, context: Optional[Dict[str, Any]] = None):
+        self.id = job_id
+        self.code = code
+        self.context = context or {}
+        self.status = QUEUED
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+
+        self._events: List[Tuple[int, str, Any]] = []
+        self._output = {'stdout': [], 'stderr': []}
+        self._cond = threading.Condition()
+
+    def _push(self, event: str, data: Any, status: Optional[str] = None):
+        """追加事件；同时更新状态，保证读到结束状态时结果事件已经存在"""
+        with self._cond:
+            if status is not None:
+                self.status = status
+            self._events.append((len(self._events) + 1, event, data))
+            self._cond.notify_all()
+
+    def events_after(self, seq: int, timeout: Optional[float] = None) -> List[Tuple[int, str, Any]]:
+        """
+        返回序号大于 seq 的事件，没有新事件时最多等待 timeout 秒
+
+        Args:
+            seq: 已收到的最后一个事件序号（0 表示从头开始）
+            timeout: 等待时间（秒），None 表示不等待
+        """
+        with self._cond:
+            if timeout and len(self._events) <= seq and self.status != FINISHED:
+                self._cond.wait(timeout)
+            return self._events[seq:]
+
+    @property
+    def done(self) -> bool:
+        return self.status == FINISHED
+
+    def to_dict(self) -> Dict[str, Any]:
+        """任务状态（用于轮询接口）"""
+        with self._cond:
+            info = {
+                "job_id": self.id,
+                "status": self.status,
+                "created": self.created,
+                "started": self.started,
+                "finished": self.finished,
+                "stdout": ''.join(self._output['stdout']),
+                "stderr": ''.join(self._output['stderr']),
+                "events": len(self._events),
+            }
+        if self.result is not None:
+            info["result"] = self.result
+        return info
+
+
+class JobManager:
+    """异步任务管理器"""
+
+    def __init__(self, run: RunFunction, workers: int = 5, max_pending: int = 15,
+                 ttl: float = 300):
+        """
+        初始化任务管理器
+
+        Args:
+            run: 执行函数 run(code, on_output, **context) -> 结果字典
+            workers: 同时执行的任务数
+            max_pending: 未结束任务（排队+执行中）的上限，超出时拒绝提交
+            ttl: 结束的任务保留时间（秒）
+        """
+        self.run = run
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl = ttl
+
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+
+        # 统计
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+
+    def submit(self, code: str, context: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        提交任务
+
+        Args:
+            code: 代码
+            context: 传给执行函数的额外关键字参数（如提交来源）
+
+        Raises:
+            JobRejected: 未结束任务已达上限
+        """
+        with self._lock:
+            self._cleanup_locked(time.time())
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise JobRejected("服务器繁忙：待执行任务过多，请稍后重试",
+                                  max(1, self._pending // max(1, self.workers)))
+            job = Job(uuid.uuid4().hex, code, context)
+            self._jobs[job.id] = job
+            self._pending += 1
+            self.submitted += 1
+
+        job._push('status', {"status": QUEUED})
+        self._executor.submit(self._execute, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """查找任务（已过期或不存在返回 None）"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _execute(self, job: Job):
+        job.started = time.time()
+        job._push('status', {"status": RUNNING}, status=RUNNING)
+
+        def on_output(stream: str, text: str):
+            with job._cond:
+                job._output[stream].append(text)
+            job._push(stream, text)
+
+        try:
+            result = self.run(job.code, on_output, **job.context)
+        except Exception as e:
+            result = {"success": False, "error": f"执行错误: {e}"}
+
+        # 独立进程执行时没有实时输出，这里补齐轮询接口的输出
+        with job._cond:
+            if not job._output['stdout'] and result.get('stdout'):
+                job._output['stdout'].append(result['stdout'])
+            if not job._output['stderr'] and result.get('stderr'):
+                job._output['stderr'].append(result['stderr'])
+
+        job.result = result
+        job.finished = time.time()
+        job._push('result', result, status=FINISHED)
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def _cleanup_locked(self, now: float):
+        """清理过期的已结束任务（调用方持有锁）"""
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.done and now - job.finished > self.ttl]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, int]:
+        """任务统计"""
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": self.completed,
+            }
+
+    def shutdown(self):
+        """停止接收任务并等待执行中的任务结束"""
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,339 @@
+"""
+性能评测 - 在放大规模的生成输入上对比学生实现与参考答案
+
+- 从提交代码与 set_*_answers.py 中只提取被测函数及模块级 import，
+  两者拼接同一段评测脚本，在同一个沙箱中以相同条件执行
+- 评测脚本按固定种子生成输入，每个用例取多次运行的最短耗时，
+  再用 tracemalloc 单独测一次峰值内存；输出只回传摘要，不回传大结果
+- 正确性：各用例输出摘要与参考答案一致
+- 效率：耗时、峰值内存与参考答案之比不超过阈值
+- 参考答案的测量结果按代码哈希缓存，答案文件变化后自动重新测量
+"""
+
+import ast
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+RunFunction = Callable[[str], Dict[str, Any]]
+
+RESULT_MARKER = "JUDGE_RESULT "
+
+# 比值计算的下限，避免极短耗时/极小内存的测量噪声放大比值
+MIN_SECONDS = 0.001
+MIN_PEAK_BYTES = 64 * 1024
+
+_HARNESS = '''
+
+import copy as _judge_copy
+import hashlib as _judge_hashlib
+import json as _judge_json
+import random as _judge_random
+import time as _judge_time
+import tracemalloc as _judge_tracemalloc
+
+{generator}
+
+def _judge_run(fn, cases, repeat):
+    report = []
+    for label, args in cases:
+        best = None
+        for _ in range(repeat):
+            call_args = _judge_copy.deepcopy(args)
+            start = _judge_time.perf_counter()
+            out = fn(*call_args)
+            elapsed = _judge_time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        call_args = _judge_copy.deepcopy(args)
+        _judge_tracemalloc.start()
+        fn(*call_args)
+        peak = _judge_tracemalloc.get_traced_memory()[1]
+        _judge_tracemalloc.stop()
+        text = repr(out)
+        report.append({{
+            "case": label,
+            "seconds": best,
+            "peak_bytes": peak,
+            "digest": _judge_hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "preview": text[:200],
+        }})
+    print({marker!r} + _judge_json.dumps(report))
+
+_judge_run({function}, cases(_judge_random.Random({seed})), {repeat})
+'''
+
+
+class JudgeError(Exception):
+    """无法评测（题目不支持、代码缺少被测函数、参考答案异常等）"""
+    pass
+
+
+class JudgeSpec:
+    """一个可评测函数的定义"""
+
+    def __init__(self, set_id: str, function: str, description: str, generator: str,
+                 requires: Sequence[str] = (), time_ratio: float = 3.0,
+                 memory_ratio: float = 3.0, repeat: int = 3, seed: int = 20240101):
+        """
+        Args:
+            set_id: 题目套题ID
+            function: 被测函数名
+            description: 评测说明
+            generator: 定义 cases(rng) 的源码，返回 [(用例名, 参数元组), ...]
+            requires: 被测函数可能依赖的其他模块级定义（存在时一并提取）
+            time_ratio: 允许的耗时倍数（相对参考答案）
+            memory_ratio: 允许的峰值内存倍数（相对参考答案）
+            repeat: 每个用例的计时次数（取最短）
+            seed: 输入生成的随机种子
+        """
+        self.set_id = set_id
+        self.function = function
+        self.description = description
+        self.generator = generator.strip()
+        self.requires = tuple(requires)
+        self.time_ratio = time_ratio
+        self.memory_ratio = memory_ratio
+        self.repeat = repeat
+        self.seed = seed
+
+    @property
+    def key(self) -> str:
+        return f"{self.set_id}.{self.function}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "set_id": self.set_id,
+            "function": self.function,
+            "description": self.description,
+            "time_ratio": self.time_ratio,
+            "memory_ratio": self.memory_ratio,
+        }
+
+
+JUDGE_SPECS: Dict[str, JudgeSpec] = {spec.key: spec for spec in [
+    JudgeSpec("C", "topk", "约50万词的词频统计取前k（堆 vs 全排序）", '''
+def cases(rng):
+    # 前200个词的频次互不相同且高于其余词，前k的边界上没有并列
+    words = []
+    for i in range(20000):
+        count = 100 + 7 * i if i < 200 else rng.randint(1, 50)
+        words.extend(["w%d" % i] * count)
+    rng.shuffle(words)
+    return [
+        ("sample", (list("aaabbc"), 2)),
+        ("ties-inside", (["a", "a", "b", "b", "c"], 2)),
+        ("large-k10", (words, 10)),
+        ("large-k100", (words, 100)),
+    ]
+'''),
+    JudgeSpec("I", "kmp_search", "20万字符文本中的模式匹配（含最坏情况输入）", '''
+def cases(rng):
+    text = "".join(rng.choice("ab") for _ in range(200000))
+    return [
+        ("sample", ("hello world", "world")),
+        ("missing", ("abc", "d")),
+        ("empty-pattern", ("abc", "")),
+        ("random-200k", (text, text[150000:150040])),
+        ("adversarial-200k", ("a" * 200000 + "b", "a" * 20000 + "b")),
+    ]
+'''),
+    JudgeSpec("O", "shortest_path", "300x300 随机迷宫最短路（BFS）", '''
+def cases(rng):
+    n = 300
+    maze = [[1 if rng.random() < 0.25 else 0 for _ in range(n)] for _ in range(n)]
+    maze[0][0] = maze[n - 1][n - 1] = 0
+    return [
+        ("sample", ([[0, 0, 0], [1, 1, 0], [0, 0, 0]], (0, 0), (2, 0))),
+        ("blocked", ([[0, 1], [1, 0]], (0, 0), (1, 1))),
+        ("maze-300", (maze, (0, 0), (n - 1, n - 1))),
+    ]
+'''),
+]}
+
+
+def extract_program(code: str, names: Sequence[str], optional: Sequence[str] = ()) -> str:
+    """
+    从模块源码中提取指定的顶层定义及模块级 import
+
+    `from __future__` 与 `if __name__ == ...` 等其余语句全部丢弃。
+
+    Args:
+        code: 模块源码
+        names: 必须存在的定义
+        optional: 存在时一并提取的定义（学生实现可能不依赖它们）
+
+    Raises:
+        JudgeError: 语法错误或缺少必须的定义
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        raise JudgeError(f"语法错误: {e}")
+
+    lines = code.splitlines()
+    wanted = set(names)
+    extra = set(optional)
+    parts: List[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.Import) or (
+                isinstance(node, ast.ImportFrom) and node.module != '__future__'):
+            parts.append('\n'.join(lines[node.lineno - 1:node.end_lineno]))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)) \
+                and (node.name in wanted or node.name in extra):
+            start = min([d.lineno for d in node.decorator_list] + [node.lineno])
+            parts.append('\n'.join(lines[start - 1:node.end_lineno]))
+            wanted.discard(node.name)
+
+    if wanted:
+        raise JudgeError(f"未找到函数: {', '.join(sorted(wanted))}")
+    return '\n\n'.join(parts)
+
+
+def build_program(spec: JudgeSpec, code: str) -> str:
+    """拼接被测代码与评测脚本"""
+    program = extract_program(code, (spec.function,), optional=spec.requires)
+    return program + _HARNESS.format(
+        generator=spec.generator,
+        function=spec.function,
+        seed=spec.seed,
+        repeat=spec.repeat,
+        marker=RESULT_MARKER,
+    )
+
+
+def parse_report(result: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """从执行输出中取出评测报告，执行失败时返回 None"""
+    if not result.get("success"):
+        return None
+    for line in reversed(result.get("stdout", "").splitlines()):
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    return None
+
+
+class Judge:
+    """性能评测器"""
+
+    def __init__(self, exercises_dir: Path, run: RunFunction,
+                 specs: Optional[Dict[str, JudgeSpec]] = None):
+        """
+        Args:
+            exercises_dir: 题目文件目录（读取 set_*_answers.py）
+            run: 在沙箱中执行代码的函数 run(code) -> 结果字典
+            specs: 可评测函数，默认 JUDGE_SPECS
+        """
+        self.exercises_dir = exercises_dir
+        self.run = run
+        self.specs = specs if specs is not None else JUDGE_SPECS
+
+        self._reference: Dict[str, List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get_spec(self, set_id: str, function: str) -> JudgeSpec:
+        spec = self.specs.get(f"{set_id}.{function}")
+        if spec is None:
+            raise JudgeError(f"不支持评测: {set_id}.{function}")
+        return spec
+
+    def reference(self, spec: JudgeSpec) -> List[Dict[str, Any]]:
+        """参考答案的测量结果（按评测程序哈希缓存）"""
+        answers_file = self.exercises_dir / f"set_{spec.set_id}_answers.py"
+        try:
+            answer_code = answers_file.read_text(encoding='utf-8')
+        except OSError:
+            raise JudgeError(f"参考答案不存在: {answers_file.name}")
+
+        program = build_program(spec, answer_code)
+        digest = hashlib.sha256(program.encode('utf-8')).hexdigest()
+        with self._lock:
+            cached = self._reference.get(digest)
+        if cached is not None:
+            return cached
+
+        result = self.run(program)
+        report = parse_report(result)
+        if report is None:
+            raise JudgeError(f"参考答案执行失败: {result.get('error', '未返回评测结果')}")
+        with self._lock:
+            self._reference[digest] = report
+        return report
+
+    def evaluate(self, set_id: str, function: str, code: str) -> Dict[str, Any]:
+        """
+        评测学生实现
+
+        Returns:
+            {passed, verdict, correct, time_ratio, memory_ratio, thresholds, cases, ...}
+
+        Raises:
+            JudgeError: 无法评测
+        """
+        spec = self.get_spec(set_id, function)
+        program = build_program(spec, code)
+        reference = self.reference(spec)
+
+        result = self.run(program)
+        report = parse_report(result)
+        summary = {
+            "set_id": set_id,
+            "function": function,
+            "thresholds": {"time_ratio": spec.time_ratio, "memory_ratio": spec.memory_ratio},
+        }
+        if report is None:
+            error = result.get("error") or "未返回评测结果"
+            verdict = "timeout" if "超时" in error else "error"
+            summary.update({
+                "passed": False,
+                "verdict": verdict,
+                "error": error,
+                "stderr": result.get("stderr", ""),
+                "violations": result.get("violations"),
+            })
+            return summary
+
+        cases = []
+        correct = True
+        time_ratio = memory_ratio = 0.0
+        for mine, ref in zip(report, reference):
+            case_correct = mine["digest"] == ref["digest"]
+            correct = correct and case_correct
+            case_time = max(mine["seconds"], MIN_SECONDS) / max(ref["seconds"], MIN_SECONDS)
+            case_memory = (max(mine["peak_bytes"], MIN_PEAK_BYTES)
+                           / max(ref["peak_bytes"], MIN_PEAK_BYTES))
+            time_ratio = max(time_ratio, case_time)
+            memory_ratio = max(memory_ratio, case_memory)
+            case = {
+                "case": mine["case"],
+                "correct": case_correct,
+                "seconds": round(mine["seconds"], 6),
+                "reference_seconds": round(ref["seconds"], 6),
+                "time_ratio": round(case_time, 2),
+                "peak_bytes": mine["peak_bytes"],
+                "reference_peak_bytes": ref["peak_bytes"],
+                "memory_ratio": round(case_memory, 2),
+            }
+            if not case_correct:
+                case["output"] = mine["preview"]
+                case["expected"] = ref["preview"]
+            cases.append(case)
+
+        if not correct:
+            verdict = "wrong_answer"
+        elif time_ratio > spec.time_ratio:
+            verdict = "too_slow"
+        elif memory_ratio > spec.memory_ratio:
+            verdict = "too_much_memory"
+        else:
+            verdict = "accepted"
+
+        summary.update({
+            "passed": verdict == "accepted",
+            "verdict": verdict,
+            "correct": correct,
+            "time_ratio": round(time_ratio, 2),
+            "memory_ratio": round(memory_ratio, 2),
+            "cases": cases,
+        })
+        return summary
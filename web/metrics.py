@@ -0,0 +1,246 @@
+"""
+运行指标 - Prometheus 文本格式的 /metrics
+
+- Counter / Histogram 按线程分片：每个线程只写自己的分片，记录时不加锁，
+  采集时再把各分片相加；已退出线程的分片在采集或新线程注册时并入汇总
+- 各组件已有的 stats()（准入控制、沙箱、缓存等）通过采集函数在采集时读取，
+  不在热路径上重复计数
+"""
+
+import bisect
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# 默认的耗时分桶（秒）
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)
+
+# 采集函数返回的样本：(指标名, 类型, 说明, [(标签, 值), ...])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+Collector = Callable[[], Iterable[Sample]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ''
+    body = ','.join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return '{' + body + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _ShardedMetric:
+    """按线程分片的指标基类，分片为 {标签值元组: 数据}"""
+
+    # 已注册分片数超过该值时，新线程注册时顺便合并已退出线程的分片
+    FOLD_THRESHOLD = 64
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, Dict[tuple, Any]]] = []
+        self._retired: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def _shard(self) -> Dict[tuple, Any]:
+        """当前线程的分片（首次使用时注册）"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                if len(self._shards) >= self.FOLD_THRESHOLD:
+                    self._fold_locked()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _fold_locked(self):
+        """把已退出线程的分片并入汇总（调用方持有锁）"""
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                for key, value in shard.items():
+                    self._merge(self._retired, key, value)
+        self._shards = alive
+
+    def _snapshot(self) -> Dict[tuple, Any]:
+        """各分片相加后的数据"""
+        with self._lock:
+            self._fold_locked()
+            total: Dict[tuple, Any] = {}
+            for key, value in self._retired.items():
+                self._merge(total, key, value)
+            shards = [shard for _, shard in self._shards]
+        for shard in shards:
+            for key, value in shard.copy().items():
+                self._merge(total, key, value)
+        return total
+
+    def _key(self, labels: Sequence[str]) -> tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} 需要标签: {', '.join(self.labelnames)}")
+        return tuple(str(value) for value in labels)
+
+    def _merge(self, total: Dict[tuple, Any], key: tuple, value: Any):
+        raise NotImplementedError
+
+    def collect(self) -> Sample:
+        raise NotImplementedError
+
+
+class Counter(_ShardedMetric):
+    """只增计数器"""
+
+    def inc(self, *labels: str, amount: float = 1):
+        """计数加 amount，labels 按 labelnames 顺序给出"""
+        shard = self._shard()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def _merge(self, total, key, value):
+        total[key] = total.get(key, 0) + value
+
+    def value(self, *labels: str) -> float:
+        return self._snapshot().get(self._key(labels), 0)
+
+    def collect(self) -> Sample:
+        samples = [(dict(zip(self.labelnames, key)), value)
+                   for key, value in sorted(self._snapshot().items())]
+        return self.name, 'counter', self.documentation, samples
+
+
+class Histogram(_ShardedMetric):
+    """分桶直方图（每个标签组合保存各桶计数、总和与次数）"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str):
+        """记录一次观测值，labels 按 labelnames 顺序给出"""
+        shard = self._shard()
+        key = self._key(labels)
+        data = shard.get(key)
+        if data is None:
+            # [各桶计数..., +Inf 桶计数, 总和]
+            data = shard[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        data[bisect.bisect_left(self.buckets, value)] += 1
+        data[-1] += value
+
+    def _merge(self, total, key, value):
+        current = total.get(key)
+        if current is None:
+            total[key] = list(value)
+        else:
+            for i, item in enumerate(value):
+                current[i] += item
+
+    def count(self, *labels: str) -> int:
+        data = self._snapshot().get(self._key(labels))
+        return sum(data[:-1]) if data else 0
+
+    def collect(self) -> Sample:
+        samples = []
+        for key, data in sorted(self._snapshot().items()):
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), data[:-1]):
+                cumulative += count
+                samples.append((dict(labels, le=_format_value(float(bound))), cumulative,
+                                '_bucket'))
+            samples.append((labels, data[-1], '_sum'))
+            samples.append((labels, cumulative, '_count'))
+        return self.name, 'histogram', self.documentation, samples
+
+
+class MetricsRegistry:
+    """指标注册表"""
+
+    def __init__(self, namespace: str = ''):
+        """
+        Args:
+            namespace: 指标名前缀（如 'pylearn' 得到 pylearn_http_requests_total）
+        """
+        self.namespace = namespace
+        self._metrics: List[_ShardedMetric] = []
+        self._collectors: List[Collector] = []
+        self._lock = threading.Lock()
+
+    def _name(self, name: str) -> str:
+        return f"{self.namespace}_{name}" if self.namespace else name
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(self._name(name), documentation, labelnames)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(self._name(name), documentation, labelnames, buckets)
+        with self._lock:
+            self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Collector):
+        """
+        注册采集函数（采集时调用，返回 (指标名, 类型, 说明, 样本) 列表，指标名不含前缀）
+        """
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Prometheus 文本格式"""
+        with self._lock:
+            metrics = list(self._metrics)
+            collectors = list(self._collectors)
+
+        families: List[Sample] = [metric.collect() for metric in metrics]
+        for collector in collectors:
+            try:
+                families.extend((self._name(name), kind, doc, samples)
+                                for name, kind, doc, samples in collector())
+            except Exception as e:  # 单个组件出错不影响其余指标
+                families.append((self._name('collector_errors'), 'gauge',
+                                 f'采集失败: {type(e).__name__}', [({}, 1)]))
+
+        lines = []
+        for name, kind, documentation, samples in families:
+            lines.append(f"# HELP {name} {_escape(documentation)}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample in samples:
+                labels, value = sample[0], sample[1]
+                if value is None:
+                    continue
+                suffix = sample[2] if len(sample) > 2 else ''
+                lines.append(f"{name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def gauge(name: str, documentation: str, value: Optional[float],
+          labels: Optional[Dict[str, str]] = None) -> Sample:
+    """采集函数中构造单值 gauge（value 为 None 时不输出样本）"""
+    samples = [] if value is None else [(labels or {}, value)]
+    return name, 'gauge', documentation, samples
+
+
+# 全局指标注册表
+metrics = MetricsRegistry(namespace='pylearn')
@@ -0,0 +1,127 @@
+"""
+执行准入控制 - 限制并发执行数，超出部分短暂排队，队列满时快速失败
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from . import config
+
+
+class AdmissionRejected(Exception):
+    """执行请求被拒绝（队列已满或排队超时）"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """有界并发 + 有界等待队列"""
+
+    def __init__(self, max_concurrent: int = 5, max_queue: int = 10,
+                 queue_timeout: float = 5.0):
+        """
+        初始化准入控制器
+
+        Args:
+            max_concurrent: 最大并发执行数
+            max_queue: 最大排队数，超出立即拒绝
+            queue_timeout: 最长排队时间（秒），超时拒绝
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+
+        self._cond = threading.Condition()
+        self.active = 0
+        self.waiting = 0
+
+        # 统计
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._avg_duration = 1.0  # 执行耗时的指数移动平均（秒）
+
+    @contextmanager
+    def slot(self) -> Iterator[float]:
+        """
+        占用一个执行名额
+
+        Yields:
+            排队等待时间（秒）
+
+        Raises:
+            AdmissionRejected: 队列已满或排队超时
+        """
+        waited = self.acquire()
+        started = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(time.monotonic() - started)
+
+    def acquire(self) -> float:
+        """获取执行名额，返回排队等待时间（秒）"""
+        with self._cond:
+            if self.active < self.max_concurrent and self.waiting == 0:
+                self.active += 1
+                self.admitted += 1
+                return 0.0
+
+            if self.waiting >= self.max_queue:
+                self.rejected += 1
+                raise AdmissionRejected("服务器繁忙：执行队列已满，请稍后重试", self._retry_after())
+
+            self.waiting += 1
+            start = time.monotonic()
+            deadline = start + self.queue_timeout
+            try:
+                while self.active >= self.max_concurrent:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.timed_out += 1
+                        raise AdmissionRejected("服务器繁忙：排队超时，请稍后重试", self._retry_after())
+                    self._cond.wait(remaining)
+                self.active += 1
+                self.admitted += 1
+            finally:
+                self.waiting -= 1
+            return time.monotonic() - start
+
+    def release(self, duration: Optional[float] = None):
+        """释放执行名额"""
+        with self._cond:
+            self.active -= 1
+            if duration is not None:
+                self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+            self._cond.notify()
+
+    def _retry_after(self) -> int:
+        """按平均执行耗时估算队列清空所需时间（秒，至少1秒）"""
+        rounds = (self.waiting + 1) / max(1, self.max_concurrent)
+        return max(1, math.ceil(rounds * self._avg_duration))
+
+    def stats(self) -> Dict[str, int]:
+        """当前并发与排队状态"""
+        with self._cond:
+            return {
+                "active": self.active,
+                "queue_depth": self.waiting,
+                "max_concurrent": self.max_concurrent,
+                "max_queue": self.max_queue,
+                "admitted": self.admitted,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+
+# 全局准入控制器实例
+admission = AdmissionController(
+    max_concurrent=config.MAX_CONCURRENT_EXECUTIONS,
+    max_queue=config.EXECUTION_QUEUE_SIZE,
+    queue_timeout=config.EXECUTION_QUEUE_TIMEOUT,
+)
@@ -0,0 +1,135 @@
+"""
+代码安全分析 - 一次解析得到全部违规项，并按代码哈希缓存结论与编译结果
+
+- AST 只解析、遍历一次，同时检查危险导入与危险函数调用
+- 危险文本模式使用C实现的子串查找（实测比合并正则一次扫描更快）
+- 通过检查的代码直接从 AST 编译，并以 marshal 字节缓存，
+  相同代码再次提交时跳过解析与编译
+"""
+
+import ast
+import hashlib
+import marshal
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class Analysis:
+    """一次安全分析的结论"""
+
+    __slots__ = ('digest', 'import_violations', 'pattern_violations',
+                 'syntax_error', 'compiled')
+
+    def __init__(self, digest: str, import_violations: Tuple[str, ...] = (),
+                 pattern_violations: Tuple[str, ...] = (),
+                 syntax_error: Optional[str] = None,
+                 compiled: Optional[bytes] = None):
+        self.digest = digest
+        self.import_violations = import_violations
+        self.pattern_violations = pattern_violations
+        self.syntax_error = syntax_error
+        self.compiled = compiled  # marshal 后的代码对象，可安全跨进程传递
+
+    @property
+    def safe(self) -> bool:
+        return not (self.syntax_error or self.import_violations or self.pattern_violations)
+
+
+class SecurityAnalyzer:
+    """单次遍历的安全分析器（带LRU缓存）"""
+
+    def __init__(self, dangerous_modules: Iterable[str], dangerous_builtins: Iterable[str],
+                 dangerous_patterns: Iterable[Tuple[str, str]], cache_size: int = 256):
+        """
+        Args:
+            dangerous_modules: 禁止导入的模块
+            dangerous_builtins: 禁止调用的函数名
+            dangerous_patterns: (文本模式, 违规提示) 列表
+            cache_size: 缓存的分析结论数量
+        """
+        self.dangerous_modules = frozenset(dangerous_modules)
+        self.dangerous_builtins = frozenset(dangerous_builtins)
+        self.patterns: List[Tuple[str, str]] = list(dangerous_patterns)
+        self.cache_size = cache_size
+
+        self._cache: "OrderedDict[str, Analysis]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # 统计
+        self.hits = 0
+        self.misses = 0
+
+    def analyze(self, code: str) -> Analysis:
+        """分析代码（命中缓存时直接返回之前的结论）"""
+        digest = hashlib.sha256(code.encode('utf-8')).hexdigest()
+        with self._lock:
+            cached = self._cache.get(digest)
+            if cached is not None:
+                self._cache.move_to_end(digest)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        analysis = self._analyze(code, digest)
+
+        with self._lock:
+            self._cache[digest] = analysis
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return analysis
+
+    def _analyze(self, code: str, digest: str) -> Analysis:
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            return Analysis(digest, syntax_error=f"语法错误: {e}")
+        except (RecursionError, MemoryError):
+            # 嵌套过深的表达式会让解析器在 Web 进程内耗尽栈或内存
+            return Analysis(digest, syntax_error="语法错误: 代码嵌套过深")
+
+        import_violations = tuple(self._check_tree(tree))
+        pattern_violations = tuple(self._check_patterns(code))
+        if import_violations or pattern_violations:
+            return Analysis(digest, import_violations, pattern_violations)
+
+        try:
+            compiled = marshal.dumps(compile(tree, '<string>', 'exec'))
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            # 编译期错误（如函数外的 return、嵌套过深）留到执行时按原样报告
+            compiled = None
+        return Analysis(digest, compiled=compiled)
+
+    def _check_tree(self, tree: ast.AST) -> List[str]:
+        """遍历一次AST，检查导入语句与函数调用"""
+        violations = []
+        for node in ast.walk(tree):
+            # 检查 import 语句
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    module = alias.name.split('.')[0]
+                    if module in self.dangerous_modules:
+                        violations.append(f"禁止导入危险模块: {module}")
+
+            # 检查 from ... import 语句
+            elif isinstance(node, ast.ImportFrom):
+                if node.module:
+                    module = node.module.split('.')[0]
+                    if module in self.dangerous_modules:
+                        violations.append(f"禁止导入危险模块: {module}")
+
+            # 检查函数调用
+            elif isinstance(node, ast.Call):
+                if isinstance(node.func, ast.Name):
+                    if node.func.id in self.dangerous_builtins:
+                        violations.append(f"禁止使用危险函数: {node.func.id}")
+        return violations
+
+    def _check_patterns(self, code: str) -> List[str]:
+        """检查危险文本模式（按模式列表顺序返回提示）"""
+        return [message for pattern, message in self.patterns if pattern in code]
+
+    def stats(self) -> Dict[str, int]:
+        """缓存统计"""
+        with self._lock:
+            return {"size": len(self._cache), "hits": self.hits, "misses": self.misses}
@@ -2,6 +2,14 @@
 安全配置 - 可根据部署环境调整
 """
 
+import os
+
+# 运行时数据目录（速率限制计数等），可通过环境变量 WEB_DATA_DIR 修改
+DATA_DIR = os.environ.get(
+    'WEB_DATA_DIR',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data'),
+)
+
 # 资源限制
 MAX_MEMORY_MB = 256  # 最大内存（MB）
 MAX_CPU_TIME = 10    # 最大CPU时间（秒）
@@ -9,12 +17,53 @@ MAX_EXECUTION_TIME = 10  # 最大执行时间（秒）
 MAX_OUTPUT_SIZE = 10000  # 最大输出大小（字节）
 MAX_CODE_SIZE = 50000    # 最大代码大小（字节）
 
+# 安全分析缓存（代码哈希 -> 检查结论与编译结果）
+ANALYSIS_CACHE_SIZE = 512
+
 # 并发限制
 MAX_CONCURRENT_EXECUTIONS = 5  # 最大并发执行数
+EXECUTION_QUEUE_SIZE = 10      # 最大排队数，队列满时返回503
+EXECUTION_QUEUE_TIMEOUT = 5    # 最长排队时间（秒）
+
+# 资源使用统计（/api/usage）
+USAGE_SAMPLE_SIZE = 1000  # 保留最近多少次执行的样本用于计算分位数
+
+# 执行结果缓存（相同代码且结果确定时跳过执行）
+# 存储：sqlite（多个工作进程共享，默认）/ memory（单进程）
+RESULT_CACHE_BACKEND = os.environ.get('RESULT_CACHE_BACKEND', 'sqlite')
+RESULT_CACHE_DB_PATH = os.path.join(DATA_DIR, 'result_cache.db')
+RESULT_CACHE_SIZE = 1024   # 最多缓存的结果数（LRU淘汰）
+RESULT_CACHE_TTL = 3600    # 结果有效期（秒）
+
+# 提交记录（/api/submissions）：后台线程批量写入 SQLite
+SUBMISSION_DB_PATH = os.path.join(DATA_DIR, 'submissions.db')
+SUBMISSION_QUEUE_SIZE = 10000     # 等待写入的记录上限，超出时丢弃
+SUBMISSION_RETENTION_DAYS = 30    # 记录保留天数（0表示不清理）
+
+# 批量评分（/api/grade）
+GRADE_SET_TIMEOUT = 10     # 每套题的超时时间（秒）
+GRADE_TOTAL_TIMEOUT = 120  # 整批的时间预算（秒）
+
+# 异步执行任务（/api/jobs）
+JOB_MAX_PENDING = MAX_CONCURRENT_EXECUTIONS + EXECUTION_QUEUE_SIZE  # 未结束任务上限，超出返回503
+JOB_RESULT_TTL = 300           # 结束的任务保留时间（秒）
+
+# 沙箱工作进程池
+SANDBOX_POOL_SIZE = MAX_CONCURRENT_EXECUTIONS  # 预启动的工作进程数（0表示每次执行创建新进程）
+SANDBOX_WORKER_MAX_RUNS = 50  # 每个工作进程最多执行次数，达到后回收
+
+# 沙箱孵化进程（仅支持 fork 的平台，否则使用上面的工作进程池）
+SANDBOX_ZYGOTE = True  # 预导入重型模块，每次执行 fork 子进程
+SANDBOX_PRELOAD_MODULES = ('numpy', 'pandas', 'sklearn', 'jieba')  # 孵化进程预导入的模块
 
 # 速率限制
 RATE_LIMIT_PER_MINUTE = 30  # 每分钟最大请求数
 RATE_LIMIT_PER_HOUR = 500   # 每小时最大请求数
+# 计数后端：memory（单进程）/ sqlite（多个工作进程共享计数）
+RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+RATE_LIMIT_DB_PATH = os.path.join(DATA_DIR, 'rate_limit.db')
+# 计数存储暂时不可用（如 SQLite 锁等待超时）时返回 503，建议客户端的重试间隔（秒）
+RATE_LIMIT_RETRY_AFTER = 1
 
 # 安全模式
 STRICT_MODE = True  # 严格模式：禁止所有未明确允许的操作
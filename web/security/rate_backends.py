@@ -0,0 +1,303 @@
+"""
+速率限制存储后端
+
+- MemoryBackend: 进程内存储（单进程部署，最快）
+- SQLiteBackend: SQLite WAL 文件存储，多个工作进程共享同一份计数
+
+后端只负责计数，限额与提示信息由 RateLimiter 决定。
+存储暂时不可用时抛出 BackendUnavailable，由调用方决定如何响应。
+"""
+
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+# 分钟窗口：12个5秒桶；小时窗口：60个1分钟桶
+MINUTE_WINDOW, MINUTE_BUCKETS = 60, 12
+HOUR_WINDOW, HOUR_BUCKETS = 3600, 60
+
+
+class BackendUnavailable(Exception):
+    """计数存储暂时不可用（如 SQLite 锁等待超时、磁盘错误）"""
+
+
+class _WindowCounter:
+    """
+    分桶滑动窗口计数器
+
+    窗口被切分为固定数量的子窗口（桶），维护滚动总数。
+    每次请求只清理已过期的桶，均摊 O(1)，内存固定。
+    """
+
+    __slots__ = ('bucket_seconds', 'counts', 'total', 'head')
+
+    def __init__(self, window_seconds: float, buckets: int):
+        self.bucket_seconds = window_seconds / buckets
+        self.counts = [0] * buckets
+        self.total = 0
+        self.head = 0  # 最新桶的绝对序号
+
+    def advance(self, now: float):
+        """推进到当前时间，清空已滑出窗口的桶"""
+        index = int(now // self.bucket_seconds)
+        elapsed = index - self.head
+        if elapsed <= 0:
+            return
+        n = len(self.counts)
+        if elapsed >= n:
+            self.counts = [0] * n
+            self.total = 0
+        else:
+            for i in range(self.head + 1, index + 1):
+                slot = i % n
+                self.total -= self.counts[slot]
+                self.counts[slot] = 0
+        self.head = index
+
+    def add(self):
+        """在当前桶计数一次（调用前需先 advance）"""
+        self.counts[self.head % len(self.counts)] += 1
+        self.total += 1
+
+
+class _ClientState:
+    """单个客户端的分钟/小时计数"""
+
+    __slots__ = ('minute', 'hour', 'last_seen')
+
+    def __init__(self):
+        self.minute = _WindowCounter(MINUTE_WINDOW, MINUTE_BUCKETS)
+        self.hour = _WindowCounter(HOUR_WINDOW, HOUR_BUCKETS)
+        self.last_seen = 0.0
+
+    def advance(self, now: float):
+        self.minute.advance(now)
+        self.hour.advance(now)
+        self.last_seen = now
+
+
+class MemoryBackend:
+    """进程内计数（分段锁）"""
+
+    def __init__(self, stripes: int = 64):
+        """
+        Args:
+            stripes: 锁分段数量，不同客户端落在不同分段时互不阻塞
+        """
+        self._locks: List[threading.Lock] = [threading.Lock() for _ in range(stripes)]
+        self._clients: List[Dict[str, _ClientState]] = [{} for _ in range(stripes)]
+
+    def _stripe(self, client_id: str) -> int:
+        return zlib.crc32(client_id.encode('utf-8')) % len(self._locks)
+
+    def hit(self, client_id: str, now: float,
+            max_per_minute: int, max_per_hour: int) -> Optional[str]:
+        """
+        未超限时计数一次
+
+        Returns:
+            超出的窗口（'minute' / 'hour'），未超限返回 None
+        """
+        stripe = self._stripe(client_id)
+        with self._locks[stripe]:
+            clients = self._clients[stripe]
+            state = clients.get(client_id)
+            if state is None:
+                state = clients[client_id] = _ClientState()
+            state.advance(now)
+
+            if state.minute.total >= max_per_minute:
+                return 'minute'
+            if state.hour.total >= max_per_hour:
+                return 'hour'
+
+            state.minute.add()
+            state.hour.add()
+            return None
+
+    def counts(self, client_id: str, now: float) -> Tuple[int, int]:
+        """返回 (最近一分钟, 最近一小时) 请求数"""
+        stripe = self._stripe(client_id)
+        with self._locks[stripe]:
+            state = self._clients[stripe].get(client_id)
+            if state is None:
+                return 0, 0
+            state.minute.advance(now)
+            state.hour.advance(now)
+            return state.minute.total, state.hour.total
+
+    def evict_idle(self, now: float, idle_timeout: float) -> int:
+        """清理空闲客户端，返回清理数量"""
+        cutoff = now - idle_timeout
+        evicted = 0
+        for lock, clients in zip(self._locks, self._clients):
+            with lock:
+                idle = [cid for cid, state in clients.items() if state.last_seen < cutoff]
+                for cid in idle:
+                    del clients[cid]
+                evicted += len(idle)
+        return evicted
+
+    def client_count(self) -> int:
+        """当前跟踪的客户端数量"""
+        return sum(len(clients) for clients in self._clients)
+
+    def reset(self, client_id: Optional[str] = None):
+        if client_id:
+            stripe = self._stripe(client_id)
+            with self._locks[stripe]:
+                self._clients[stripe].pop(client_id, None)
+        else:
+            for lock, clients in zip(self._locks, self._clients):
+                with lock:
+                    clients.clear()
+
+
+class SQLiteBackend:
+    """
+    SQLite WAL 共享计数
+
+    每次请求在一个 BEGIN IMMEDIATE 事务内完成"读取窗口总数 + 原子自增"，
+    多个工作进程看到同一份计数。WAL 模式下读不阻塞写，
+    synchronous=NORMAL 避免每次提交都 fsync。
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS rate_buckets (
+            client TEXT NOT NULL,
+            kind   TEXT NOT NULL,      -- 'm' 分钟窗口桶 / 'h' 小时窗口桶
+            bucket INTEGER NOT NULL,   -- 桶序号 = 时间 // 桶宽
+            hits   INTEGER NOT NULL,
+            PRIMARY KEY (client, kind, bucket)
+        ) WITHOUT ROWID
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        """
+        Args:
+            path: 数据库文件路径（所有工作进程使用同一路径）
+            busy_timeout: 等待其他进程释放写锁的最长时间（秒），超时抛出 BackendUnavailable
+        """
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._minute_width = MINUTE_WINDOW // MINUTE_BUCKETS
+        self._hour_width = HOUR_WINDOW // HOUR_BUCKETS
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(self._SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """每个线程一个连接（sqlite3 连接不可跨线程共享）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _window_totals(self, conn, client_id: str, now: float) -> Tuple[int, int]:
+        minute_from = int(now // self._minute_width) - MINUTE_BUCKETS + 1
+        hour_from = int(now // self._hour_width) - HOUR_BUCKETS + 1
+        row = conn.execute(
+            """
+            SELECT
+                COALESCE(SUM(CASE WHEN kind = 'm' AND bucket >= ? THEN hits END), 0),
+                COALESCE(SUM(CASE WHEN kind = 'h' AND bucket >= ? THEN hits END), 0)
+            FROM rate_buckets WHERE client = ?
+            """,
+            (minute_from, hour_from, client_id),
+        ).fetchone()
+        return row[0], row[1]
+
+    def hit(self, client_id: str, now: float,
+            max_per_minute: int, max_per_hour: int) -> Optional[str]:
+        """
+        Raises:
+            BackendUnavailable: 事务无法开始或提交（如其他进程长时间持有写锁）
+        """
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                limited = self._hit(conn, client_id, now, max_per_minute, max_per_hour)
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            raise BackendUnavailable(f"速率限制存储不可用: {e}") from e
+        return limited
+
+    def _hit(self, conn: sqlite3.Connection, client_id: str, now: float,
+             max_per_minute: int, max_per_hour: int) -> Optional[str]:
+        """在事务内检查窗口计数，未超限时计入本次请求"""
+        minute, hour = self._window_totals(conn, client_id, now)
+        if minute >= max_per_minute:
+            return 'minute'
+        if hour >= max_per_hour:
+            return 'hour'
+        conn.executemany(
+            """
+            INSERT INTO rate_buckets (client, kind, bucket, hits) VALUES (?, ?, ?, 1)
+            ON CONFLICT (client, kind, bucket) DO UPDATE SET hits = hits + 1
+            """,
+            [
+                (client_id, 'm', int(now // self._minute_width)),
+                (client_id, 'h', int(now // self._hour_width)),
+            ],
+        )
+        return None
+
+    def counts(self, client_id: str, now: float) -> Tuple[int, int]:
+        return self._window_totals(self._conn(), client_id, now)
+
+    def evict_idle(self, now: float, idle_timeout: float) -> int:
+        """删除已滑出窗口的桶，返回删除行数"""
+        conn = self._conn()
+        cur = conn.execute(
+            """
+            DELETE FROM rate_buckets
+            WHERE (kind = 'm' AND bucket < ?) OR (kind = 'h' AND bucket < ?)
+            """,
+            (
+                int((now - MINUTE_WINDOW) // self._minute_width),
+                int((now - max(idle_timeout, HOUR_WINDOW)) // self._hour_width),
+            ),
+        )
+        return cur.rowcount
+
+    def client_count(self) -> int:
+        row = self._conn().execute("SELECT COUNT(DISTINCT client) FROM rate_buckets").fetchone()
+        return row[0]
+
+    def reset(self, client_id: Optional[str] = None):
+        conn = self._conn()
+        if client_id:
+            conn.execute("DELETE FROM rate_buckets WHERE client = ?", (client_id,))
+        else:
+            conn.execute("DELETE FROM rate_buckets")
+
+
+def create_backend(kind: str = 'memory', path: Optional[str] = None):
+    """
+    根据配置创建后端
+
+    Args:
+        kind: 'memory' 或 'sqlite'
+        path: SQLite 数据库路径（kind='sqlite' 时必填）
+    """
+    if kind == 'sqlite':
+        if not path:
+            raise ValueError("SQLite速率限制后端需要数据库路径")
+        return SQLiteBackend(path)
+    if kind == 'memory':
+        return MemoryBackend()
+    raise ValueError(f"未知的速率限制后端: {kind}")
@@ -2,94 +2,137 @@
 速率限制器 - 防止滥用和DoS攻击
 """
 
+import threading
 import time
-from collections import defaultdict, deque
-from threading import Lock
-from typing import Dict, Deque, Tuple
+from typing import Callable, Dict, Optional, Tuple
+
+from . import config
+from .rate_backends import BackendUnavailable, MemoryBackend, create_backend
 
 
 class RateLimiter:
-    """基于滑动窗口的速率限制器"""
-    
-    def __init__(self, max_per_minute: int = 30, max_per_hour: int = 500):
+    """基于分桶滑动窗口的速率限制器（可插拔存储后端 + 空闲客户端后台清理）"""
+
+    def __init__(self, max_per_minute: int = 30, max_per_hour: int = 500,
+                 backend=None, idle_timeout: float = 3600,
+                 evict_interval: float = 60,
+                 clock: Callable[[], float] = time.time):
         """
         初始化速率限制器
-        
+
         Args:
             max_per_minute: 每分钟最大请求数
             max_per_hour: 每小时最大请求数
+            backend: 计数存储后端，默认进程内存储（MemoryBackend）；
+                多进程部署时使用 SQLiteBackend 共享计数
+            idle_timeout: 客户端空闲多久（秒）后被清理，不应小于小时窗口
+            evict_interval: 后台清理间隔（秒），0 表示不启动清理线程
+            clock: 时钟函数（测试时可替换）
         """
         self.max_per_minute = max_per_minute
         self.max_per_hour = max_per_hour
-        
-        # 存储每个IP的请求时间戳
-        self.requests: Dict[str, Deque[float]] = defaultdict(deque)
-        self.lock = Lock()
-    
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.idle_timeout = idle_timeout
+        self.clock = clock
+
+        self.evict_interval = evict_interval
+
+        self._stop = threading.Event()
+        self._evictor = None
+        self.start_evictor()
+
+    def start_evictor(self):
+        """
+        启动后台清理线程（已在运行或未启用时不做任何事）
+
+        fork 出的子进程不继承线程，预加载应用的多进程部署需在 fork 后再次调用。
+        """
+        if self.evict_interval <= 0 or self._stop.is_set():
+            return
+        if self._evictor is not None and self._evictor.is_alive():
+            return
+        self._evictor = threading.Thread(
+            target=self._evict_loop,
+            args=(self.evict_interval,),
+            name="rate-limiter-evictor",
+            daemon=True,
+        )
+        self._evictor.start()
+
     def is_allowed(self, client_id: str) -> Tuple[bool, str]:
         """
         检查是否允许请求
-        
+
         Args:
             client_id: 客户端标识（通常是IP地址）
-        
+
         Returns:
             (是否允许, 拒绝原因)
+
+        Raises:
+            BackendUnavailable: 共享计数存储暂时不可用
         """
-        with self.lock:
-            now = time.time()
-            
-            # 清理过期的请求记录
-            self._cleanup_old_requests(client_id, now)
-            
-            # 检查分钟级限制
-            minute_ago = now - 60
-            recent_requests = [t for t in self.requests[client_id] if t > minute_ago]
-            if len(recent_requests) >= self.max_per_minute:
-                return False, f"超过速率限制：每分钟最多{self.max_per_minute}次请求"
-            
-            # 检查小时级限制
-            hour_ago = now - 3600
-            hourly_requests = [t for t in self.requests[client_id] if t > hour_ago]
-            if len(hourly_requests) >= self.max_per_hour:
-                return False, f"超过速率限制：每小时最多{self.max_per_hour}次请求"
-            
-            # 记录本次请求
-            self.requests[client_id].append(now)
-            
-            return True, ""
-    
-    def _cleanup_old_requests(self, client_id: str, now: float):
-        """清理1小时前的请求记录"""
-        hour_ago = now - 3600
-        while self.requests[client_id] and self.requests[client_id][0] < hour_ago:
-            self.requests[client_id].popleft()
-    
+        exceeded = self.backend.hit(
+            client_id, self.clock(), self.max_per_minute, self.max_per_hour
+        )
+
+        # 检查分钟级限制
+        if exceeded == 'minute':
+            return False, f"超过速率限制：每分钟最多{self.max_per_minute}次请求"
+
+        # 检查小时级限制
+        if exceeded == 'hour':
+            return False, f"超过速率限制：每小时最多{self.max_per_hour}次请求"
+
+        return True, ""
+
     def get_stats(self, client_id: str) -> Dict[str, int]:
         """获取客户端的请求统计"""
-        with self.lock:
-            now = time.time()
-            minute_ago = now - 60
-            hour_ago = now - 3600
-            
-            requests = self.requests.get(client_id, deque())
-            
-            return {
-                "last_minute": len([t for t in requests if t > minute_ago]),
-                "last_hour": len([t for t in requests if t > hour_ago]),
-                "remaining_minute": max(0, self.max_per_minute - len([t for t in requests if t > minute_ago])),
-                "remaining_hour": max(0, self.max_per_hour - len([t for t in requests if t > hour_ago])),
-            }
-    
+        last_minute, last_hour = self.backend.counts(client_id, self.clock())
+        return {
+            "last_minute": last_minute,
+            "last_hour": last_hour,
+            "remaining_minute": max(0, self.max_per_minute - last_minute),
+            "remaining_hour": max(0, self.max_per_hour - last_hour),
+        }
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        清理空闲客户端
+
+        Args:
+            now: 当前时间（与 clock 同一时钟），默认取当前时间
+
+        Returns:
+            清理的数量
+        """
+        if now is None:
+            now = self.clock()
+        return self.backend.evict_idle(now, self.idle_timeout)
+
+    def _evict_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.evict_idle()
+            except Exception:
+                pass
+
+    def client_count(self) -> int:
+        """当前跟踪的客户端数量"""
+        return self.backend.client_count()
+
+    def close(self):
+        """停止后台清理线程"""
+        self._stop.set()
+
     def reset(self, client_id: str = None):
         """重置限制（用于测试或管理）"""
-        with self.lock:
-            if client_id:
-                self.requests.pop(client_id, None)
-            else:
-                self.requests.clear()
+        self.backend.reset(client_id)
 
 
 # 全局速率限制器实例
-rate_limiter = RateLimiter(max_per_minute=30, max_per_hour=500)
-
+rate_limiter = RateLimiter(
+    max_per_minute=config.RATE_LIMIT_PER_MINUTE,
+    max_per_hour=config.RATE_LIMIT_PER_HOUR,
+    backend=create_backend(config.RATE_LIMIT_BACKEND, config.RATE_LIMIT_DB_PATH),
+)
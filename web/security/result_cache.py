@@ -0,0 +1,364 @@
+"""
+执行结果缓存 - 相同代码（且结果确定）直接返回上次的执行结果
+
+- 键 = sha256(沙箱配置指纹 + 代码)，沙箱限制或 Python 版本变化后自动失效
+- 使用随机数（含 numpy.random、sklearn）、时间、hash()/id()、集合等的代码结果不确定，不写入缓存
+- 只缓存成功结果与代码本身的异常；超时、资源超限等与运行环境有关的失败不缓存
+- 存储：MemoryResultStore（单进程）/ SQLiteResultStore（多个工作进程共享），
+  均支持 TTL 与 LRU 淘汰
+"""
+
+import ast
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import config
+
+# 导入即视为结果不确定的模块（按顶层包匹配）。sklearn 的划分与大多数估计器在未传
+# random_state 时使用全局随机数，无法静态判断每个调用是否固定了种子，整体视为不确定
+NONDETERMINISTIC_MODULES = frozenset({'random', 'time', 'datetime', 'secrets', 'uuid', 'sklearn'})
+
+# 出现即视为结果不确定的属性/函数名（如 np.random、df.sample、hash()）
+NONDETERMINISTIC_NAMES = frozenset({'random', 'sample', 'shuffle', 'hash', 'id',
+                                    'now', 'today', 'perf_counter', 'monotonic'})
+
+# 创建集合的内置函数：字符串等对象的集合迭代顺序随哈希随机化变化，打印或遍历的结果不确定
+SET_CONSTRUCTORS = frozenset({'set', 'frozenset'})
+
+
+def _nondeterministic_path(path: str) -> bool:
+    """完整的模块/属性路径是否指向不确定的来源（如 numpy.random.rand、random.choice）"""
+    parts = path.split('.')
+    return parts[0] in NONDETERMINISTIC_MODULES or 'random' in parts
+
+
+def _dotted_name(node: ast.AST, aliases: Dict[str, str]) -> Optional[str]:
+    """把 a.b.c 形式的表达式还原为完整路径（首个名字按导入别名展开），其他表达式返回 None"""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if not isinstance(node, ast.Name):
+        return None
+    parts.append(aliases.get(node.id, node.id))
+    return '.'.join(reversed(parts))
+
+
+def is_deterministic(code: str) -> bool:
+    """代码的执行结果是否只由代码本身决定（无法解析时返回 False）"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return False
+
+    # 导入绑定的名字 -> 完整路径（import numpy.random as npr: npr -> numpy.random）
+    aliases: Dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                if _nondeterministic_path(alias.name):
+                    return False
+                if alias.asname:
+                    aliases[alias.asname] = alias.name
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ''
+            if module and _nondeterministic_path(module):
+                return False
+            for alias in node.names:
+                path = f"{module}.{alias.name}" if module else alias.name
+                if alias.name in NONDETERMINISTIC_NAMES or _nondeterministic_path(path):
+                    return False
+                aliases[alias.asname or alias.name] = path
+
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Set, ast.SetComp)):
+            return False
+        if isinstance(node, ast.Attribute):
+            if node.attr in NONDETERMINISTIC_NAMES:
+                return False
+            path = _dotted_name(node, aliases)
+            if path is not None and _nondeterministic_path(path):
+                return False
+        elif isinstance(node, ast.Name):
+            if node.id in NONDETERMINISTIC_NAMES or node.id in SET_CONSTRUCTORS:
+                return False
+            if node.id in aliases and _nondeterministic_path(aliases[node.id]):
+                return False
+    return True
+
+
+def is_cacheable(result: Dict[str, Any]) -> bool:
+    """执行结果是否只取决于代码（排除超时、资源超限、进程异常等）"""
+    if "violations" in result:
+        return False  # 安全检查本身已有缓存
+    if result.get("success"):
+        return True
+    error = result.get("error", "")
+    return error.startswith("执行错误") and "TimeoutError" not in error and "MemoryError" not in error
+
+
+class MemoryResultStore:
+    """进程内 LRU + TTL 存储"""
+
+    def __init__(self, max_entries: int = 1024, ttl: float = 3600,
+                 clock: Callable[[], float] = time.time):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        now = self.clock()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            created, value = item
+            if now - created > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: str):
+        with self._lock:
+            self._data[key] = (self.clock(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteResultStore:
+    """
+    SQLite WAL 共享存储
+
+    读取命中时更新访问时间（同一条目 LRU_TOUCH_INTERVAL 秒内只更新一次，减少写入）；
+    每写入 EVICT_EVERY 条清理一次过期条目并按访问时间淘汰超出上限的条目。
+    """
+
+    LRU_TOUCH_INTERVAL = 60
+    EVICT_EVERY = 32
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS exec_results (
+            key      TEXT PRIMARY KEY,
+            result   TEXT NOT NULL,    -- JSON
+            created  REAL NOT NULL,
+            accessed REAL NOT NULL
+        )
+    """
+    _INDEX = "CREATE INDEX IF NOT EXISTS exec_results_accessed ON exec_results (accessed)"
+
+    def __init__(self, path: str, max_entries: int = 1024, ttl: float = 3600,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: 数据库文件路径（所有工作进程使用同一路径）
+            max_entries: 最多保留的条目数
+            ttl: 条目有效期（秒）
+            clock: 时钟函数（测试时可替换）
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._local = threading.local()
+        self._puts = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(self._SCHEMA)
+        conn.execute(self._INDEX)
+
+    def _conn(self) -> sqlite3.Connection:
+        """每个线程一个连接（sqlite3 连接不可跨线程共享）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        conn = self._conn()
+        now = self.clock()
+        row = conn.execute(
+            "SELECT result, created, accessed FROM exec_results WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        value, created, accessed = row
+        if now - created > self.ttl:
+            conn.execute("DELETE FROM exec_results WHERE key = ?", (key,))
+            return None
+        if now - accessed > self.LRU_TOUCH_INTERVAL:
+            conn.execute("UPDATE exec_results SET accessed = ? WHERE key = ?", (now, key))
+        return value
+
+    def put(self, key: str, value: str):
+        conn = self._conn()
+        now = self.clock()
+        conn.execute(
+            """
+            INSERT INTO exec_results (key, result, created, accessed) VALUES (?, ?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET result = excluded.result,
+                created = excluded.created, accessed = excluded.accessed
+            """,
+            (key, value, now, now),
+        )
+        self._puts += 1
+        if self._puts % self.EVICT_EVERY == 0:
+            self.evict(now)
+
+    def evict(self, now: Optional[float] = None) -> int:
+        """删除过期条目，并按访问时间淘汰超出上限的条目，返回删除行数"""
+        if now is None:
+            now = self.clock()
+        conn = self._conn()
+        removed = conn.execute(
+            "DELETE FROM exec_results WHERE created < ?", (now - self.ttl,)
+        ).rowcount
+        removed += conn.execute(
+            """
+            DELETE FROM exec_results WHERE key IN (
+                SELECT key FROM exec_results ORDER BY accessed DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (self.max_entries,),
+        ).rowcount
+        return removed
+
+    def size(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM exec_results").fetchone()[0]
+
+    def clear(self):
+        self._conn().execute("DELETE FROM exec_results")
+
+
+def create_store(kind: str = 'memory', path: Optional[str] = None,
+                 max_entries: int = 1024, ttl: float = 3600):
+    """
+    根据配置创建结果存储
+
+    Args:
+        kind: 'memory' 或 'sqlite'
+        path: SQLite 数据库路径（kind='sqlite' 时必填）
+        max_entries: 最多保留的条目数
+        ttl: 条目有效期（秒）
+    """
+    if kind == 'sqlite':
+        if not path:
+            raise ValueError("SQLite结果缓存需要数据库路径")
+        return SQLiteResultStore(path, max_entries=max_entries, ttl=ttl)
+    if kind == 'memory':
+        return MemoryResultStore(max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"未知的结果缓存存储: {kind}")
+
+
+class ResultCache:
+    """执行结果缓存"""
+
+    def __init__(self, store, fingerprint: str = ''):
+        """
+        Args:
+            store: MemoryResultStore 或 SQLiteResultStore
+            fingerprint: 沙箱配置指纹，参与缓存键计算
+        """
+        self.store = store
+        self.fingerprint = fingerprint
+        self._lock = threading.Lock()
+
+        # 统计（本进程）
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0  # 结果不确定或不可缓存而未写入
+
+    def key(self, code: str) -> str:
+        digest = hashlib.sha256(self.fingerprint.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(code.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        """查找缓存的执行结果（只有确定的结果会被写入，查找时无需再分析代码）"""
+        try:
+            value = self.store.get(self.key(code))
+        except sqlite3.Error:
+            value = None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        result = json.loads(value)
+        result["cached"] = True
+        return result
+
+    def put(self, code: str, result: Dict[str, Any]) -> bool:
+        """写入执行结果，返回是否写入（结果不确定或不可缓存时跳过）"""
+        if not is_cacheable(result) or not is_deterministic(code):
+            with self._lock:
+                self.skipped += 1
+            return False
+        value = json.dumps(result, ensure_ascii=False, separators=(',', ':'))
+        try:
+            self.store.put(self.key(code), value)
+        except sqlite3.Error:
+            return False
+        with self._lock:
+            self.stores += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        """命中率统计"""
+        with self._lock:
+            hits, misses, stores, skipped = self.hits, self.misses, self.stores, self.skipped
+        try:
+            size = self.store.size()
+        except sqlite3.Error:
+            size = None
+        total = hits + misses
+        return {
+            "size": size,
+            "hits": hits,
+            "misses": misses,
+            "stores": stores,
+            "skipped": skipped,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+    def clear(self):
+        """清空缓存与统计（用于测试或管理）"""
+        self.store.clear()
+        with self._lock:
+            self.hits = self.misses = self.stores = self.skipped = 0
+
+
+def _create_global_cache() -> ResultCache:
+    from .sandbox import sandbox
+    store = create_store(config.RESULT_CACHE_BACKEND, config.RESULT_CACHE_DB_PATH,
+                         max_entries=config.RESULT_CACHE_SIZE, ttl=config.RESULT_CACHE_TTL)
+    return ResultCache(store, fingerprint=sandbox.fingerprint())
+
+
+# 全局执行结果缓存实例
+result_cache = _create_global_cache()
@@ -9,15 +9,24 @@
 - Windows: 仅超时保护
 """
 
+import functools
+import os
 import sys
-import ast
+import json
+import marshal
 import platform
 import multiprocessing
+import threading
+import time
 import warnings
-from typing import Dict, Any, Tuple
-from io import StringIO
+from typing import Callable, Dict, Any, Iterable, Optional, Tuple, Union
 from contextlib import redirect_stdout, redirect_stderr
 
+from . import config
+from .analyzer import SecurityAnalyzer
+from .transport import make_emitter, receive_result, send_result
+from .usage import RunMeter, memory_baseline
+
 # 平台特定导入
 if sys.platform != 'win32':
     import resource
@@ -32,6 +41,80 @@ class SecurityError(Exception):
     pass
 
 
+class OutputLimitExceeded(BaseException):
+    """输出达到上限，终止执行（继承 BaseException，用户代码的 except Exception 无法吞掉）"""
+    pass
+
+
+class _OutputCapture:
+    """
+    有上限的输出缓冲
+
+    累计写入达到 limit 字节后只保留上限以内的部分，并抛出 OutputLimitExceeded 终止执行，
+    内存占用受输出上限约束。提供 emit 时遇到换行即把新输出实时转发给父进程。
+    提供 on_limit 时达到上限先调用它（执行进程中用于直接返回结果并退出，
+    裸 except 也无法让代码继续运行）。
+    """
+
+    encoding = 'utf-8'
+
+    def __init__(self, stream: str, limit: int,
+                 emit: Optional[Callable[[str, str], None]] = None,
+                 on_limit: Optional[Callable[[], None]] = None):
+        self.stream = stream
+        self.limit = limit
+        self.emit = emit
+        self.on_limit = on_limit
+        self.size = 0
+        self.truncated = False
+        self._parts = []
+        self._pending = []
+
+    def write(self, s: str) -> int:
+        if self.truncated:
+            raise OutputLimitExceeded(self.stream)
+        if not isinstance(s, str):
+            raise TypeError(f"write() argument must be str, not {type(s).__name__}")
+
+        n = len(s)
+        size = len(s.encode('utf-8', 'surrogatepass')) if not s.isascii() else n
+        if self.size + size > self.limit:
+            remaining = self.limit - self.size
+            s = s.encode('utf-8', 'surrogatepass')[:remaining].decode('utf-8', 'ignore')
+            self.truncated = True
+        self.size += size
+
+        self._parts.append(s)
+        if self.emit is not None:
+            self._pending.append(s)
+            if '\n' in s or self.truncated:
+                self.flush()
+        if self.truncated:
+            if self.on_limit is not None:
+                self.on_limit()
+            raise OutputLimitExceeded(self.stream)
+        return n
+
+    def writelines(self, lines):
+        for line in lines:
+            self.write(line)
+
+    def flush(self):
+        if self.emit is not None and self._pending:
+            text = ''.join(self._pending)
+            self._pending.clear()
+            self.emit(self.stream, text)
+
+    def isatty(self) -> bool:
+        return False
+
+    def getvalue(self) -> str:
+        value = ''.join(self._parts)
+        if self.truncated:
+            value += "\n... (输出被截断)"
+        return value
+
+
 class CodeSandbox:
     """代码沙箱 - 安全执行用户代码"""
     
@@ -52,6 +135,15 @@ class CodeSandbox:
         'globals', 'locals', 'delattr', 'setattr', 'getattr',
     }
     
+    # 允许的异常类（捕获与抛出标准异常；异常对象的 __traceback__ 等属性仍由模式检查禁止）
+    SAFE_EXCEPTIONS = (
+        'Exception', 'ValueError', 'TypeError', 'KeyError', 'IndexError',
+        'AttributeError', 'RuntimeError', 'StopIteration', 'ZeroDivisionError',
+        'ArithmeticError', 'AssertionError', 'ImportError', 'LookupError',
+        'ModuleNotFoundError', 'NameError', 'NotImplementedError',
+        'OverflowError', 'RecursionError', 'UnicodeError',
+    )
+
     # 允许的安全模块
     SAFE_MODULES = {
         'math', 'random', 'datetime', 'collections', 'itertools',
@@ -62,14 +154,58 @@ class CodeSandbox:
         'numpy', 'pandas', 'sklearn', 'jieba',
     }
     
+    # 危险代码模式（文本匹配）
+    DANGEROUS_PATTERNS = [
+        ('__', '禁止使用双下划线属性'),
+        ('exec(', '禁止使用exec'),
+        ('eval(', '禁止使用eval'),
+        ('compile(', '禁止使用compile'),
+        ('open(', '禁止使用open'),
+        ('file(', '禁止使用file'),
+        ('input(', '禁止使用input'),
+        ('__import__', '禁止使用__import__'),
+        ('subprocess', '禁止使用subprocess'),
+        ('os.system', '禁止使用os.system'),
+        ('os.popen', '禁止使用os.popen'),
+    ]
+    
     # 资源限制
     MAX_MEMORY_MB = 256  # 最大内存256MB
     MAX_CPU_TIME = 10    # 最大CPU时间10秒
     MAX_OUTPUT_SIZE = 10000  # 最大输出10KB
     
-    def __init__(self):
+    def __init__(self, pool_size: int = 0, max_runs_per_worker: int = 50,
+                 zygote: bool = False, preload_modules: Iterable[str] = ()):
+        """
+        初始化沙箱
+
+        Args:
+            pool_size: 预启动的工作进程数量，0 表示每次执行创建新进程
+            max_runs_per_worker: 每个工作进程最多执行次数，达到后回收
+            zygote: 是否使用孵化进程（预导入模块后每次 fork 执行），
+                仅在支持 fork 的平台生效，否则退回进程池
+            preload_modules: 孵化进程预导入的模块（需在 SAFE_MODULES 中）
+        """
         self.violations = []
         self.platform = sys.platform
+        self.pool_size = pool_size
+        self.max_runs_per_worker = max_runs_per_worker
+        self.zygote = zygote
+        self.preload_modules = tuple(m for m in preload_modules if m in self.SAFE_MODULES)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+        # 执行统计（独立进程模式的进程创建耗时、执行中的数量）
+        self.spawned = 0
+        self.spawn_seconds = 0.0
+        self.active = 0
+        self._stats_lock = threading.Lock()
+        self.analyzer = SecurityAnalyzer(
+            self.DANGEROUS_MODULES,
+            self.DANGEROUS_BUILTINS,
+            self.DANGEROUS_PATTERNS,
+            cache_size=config.ANALYSIS_CACHE_SIZE,
+        )
 
         # Windows平台警告
         if self.platform == 'win32':
@@ -83,64 +219,64 @@ class CodeSandbox:
     
     def check_imports(self, code: str) -> bool:
         """检查导入语句是否安全"""
-        try:
-            tree = ast.parse(code)
-        except SyntaxError as e:
-            raise SecurityError(f"语法错误: {e}")
-
-        for node in ast.walk(tree):
-            # 检查 import 语句
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    module = alias.name.split('.')[0]
-                    if module in self.DANGEROUS_MODULES:
-                        self.violations.append(f"禁止导入危险模块: {module}")
-                    # 注意：不检查是否在SAFE_MODULES中，只检查是否在黑名单
-
-            # 检查 from ... import 语句
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    module = node.module.split('.')[0]
-                    if module in self.DANGEROUS_MODULES:
-                        self.violations.append(f"禁止导入危险模块: {module}")
-
-            # 检查函数调用
-            elif isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name):
-                    if node.func.id in self.DANGEROUS_BUILTINS:
-                        self.violations.append(f"禁止使用危险函数: {node.func.id}")
-
+        analysis = self.analyzer.analyze(code)
+        if analysis.syntax_error:
+            raise SecurityError(analysis.syntax_error)
+        self.violations.extend(analysis.import_violations)
         return len(self.violations) == 0
     
     def check_code_patterns(self, code: str) -> bool:
         """检查代码中的危险模式"""
-        dangerous_patterns = [
-            ('__', '禁止使用双下划线属性'),
-            ('exec(', '禁止使用exec'),
-            ('eval(', '禁止使用eval'),
-            ('compile(', '禁止使用compile'),
-            ('open(', '禁止使用open'),
-            ('file(', '禁止使用file'),
-            ('input(', '禁止使用input'),
-            ('__import__', '禁止使用__import__'),
-            ('subprocess', '禁止使用subprocess'),
-            ('os.system', '禁止使用os.system'),
-            ('os.popen', '禁止使用os.popen'),
-        ]
-        
-        for pattern, message in dangerous_patterns:
-            if pattern in code:
-                self.violations.append(message)
-        
+        analysis = self.analyzer.analyze(code)
+        self.violations.extend(analysis.pattern_violations)
         return len(self.violations) == 0
     
-    def set_resource_limits(self):
+    def fingerprint(self) -> str:
+        """
+        沙箱配置指纹：Python/库版本、资源限制与安全规则，
+        任何一项变化都可能改变执行结果（用于结果缓存的键）
+        """
+        from importlib import metadata
+
+        versions = {}
+        for name in sorted(self.SAFE_MODULES):
+            try:
+                versions[name] = metadata.version(name if name != 'sklearn' else 'scikit-learn')
+            except metadata.PackageNotFoundError:
+                continue
+        return json.dumps({
+            "python": platform.python_version(),
+            "platform": self.platform,
+            "versions": versions,
+            "limits": [self.MAX_MEMORY_MB, self.MAX_CPU_TIME, self.MAX_OUTPUT_SIZE],
+            "modules": sorted(self.DANGEROUS_MODULES),
+            "builtins": sorted(self.DANGEROUS_BUILTINS),
+            "patterns": [pattern for pattern, _ in self.DANGEROUS_PATTERNS],
+        }, sort_keys=True)
+
+    def __getstate__(self):
+        # 执行器（含锁与管道）不随沙箱传入子进程
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state['_executor_lock'] = None
+        state['_stats_lock'] = None
+        state['analyzer'] = None
+        return state
+
+    def set_resource_limits(self, cpu_budget: Optional[int] = None,
+                            memory_baseline: int = 0):
         """
         设置资源限制（平台相关）
 
         - Linux: 完整的RLIMIT支持
         - macOS: 部分RLIMIT支持（某些限制可能被忽略）
         - Windows: 不支持（跳过）
+
+        Args:
+            cpu_budget: CPU时间硬上限（秒）。工作进程会复用多次，
+                此时硬上限为总预算，单次限制由 _execute_code 按次设置软上限
+            memory_baseline: 已占用的虚拟内存（字节）。孵化进程的子进程
+                继承了预导入模块的内存，上限在此基础上再加 MAX_MEMORY_MB
         """
         if sys.platform == 'win32':
             # Windows不支持resource模块
@@ -152,9 +288,10 @@ class CodeSandbox:
         try:
             # 限制内存（Linux完全支持，macOS可能部分支持）
             try:
+                memory_limit = memory_baseline + self.MAX_MEMORY_MB * 1024 * 1024
                 resource.setrlimit(
                     resource.RLIMIT_AS,
-                    (self.MAX_MEMORY_MB * 1024 * 1024, self.MAX_MEMORY_MB * 1024 * 1024)
+                    (memory_limit, memory_limit)
                 )
             except (ValueError, OSError) as e:
                 # macOS可能不支持RLIMIT_AS
@@ -164,86 +301,236 @@ class CodeSandbox:
                     raise
 
             # 限制CPU时间（Unix系统都支持）
+            cpu_hard = cpu_budget or self.MAX_CPU_TIME
             resource.setrlimit(
                 resource.RLIMIT_CPU,
-                (self.MAX_CPU_TIME, self.MAX_CPU_TIME)
+                (min(self.MAX_CPU_TIME, cpu_hard), cpu_hard)
             )
         except Exception as e:
             # 降级处理：即使资源限制失败，仍然依赖超时机制
             pass
     
-    def execute_safe(self, code: str, timeout: int = 10) -> Dict[str, Any]:
+    def execute_safe(self, code: str, timeout: int = 10,
+                     on_output: Optional[Callable[[str, str], None]] = None) -> Dict[str, Any]:
         """
         在安全环境中执行代码
         
         Args:
             code: 要执行的Python代码
             timeout: 超时时间（秒）
+            on_output: 实时输出回调 (stream, text)，stream 为 'stdout' 或 'stderr'，
+                执行期间按行回调
         
         Returns:
             执行结果字典
         """
-        # 1. 安全检查
-        self.violations = []
-        
-        if not self.check_imports(code):
+        # 1. 安全检查（相同代码命中缓存，跳过解析与编译）
+        analysis = self.analyzer.analyze(code)
+        if analysis.syntax_error:
+            raise SecurityError(analysis.syntax_error)
+
+        if analysis.import_violations:
+            self.violations = list(analysis.import_violations)
             return {
                 "success": False,
                 "error": "安全检查失败",
-                "violations": self.violations
+                "violations": list(analysis.import_violations)
             }
         
-        if not self.check_code_patterns(code):
+        if analysis.pattern_violations:
+            self.violations = list(analysis.pattern_violations)
             return {
                 "success": False,
                 "error": "代码包含危险模式",
-                "violations": self.violations
+                "violations": list(analysis.pattern_violations)
             }
+
+        self.violations = []
+        # 优先传递已编译的代码对象（marshal字节），子进程无需再次编译
+        if analysis.compiled is not None:
+            code = analysis.compiled
         
-        # 2. 使用多进程隔离执行
-        queue = multiprocessing.Queue()
+        with self._stats_lock:
+            self.active += 1
+        try:
+            return self._dispatch(code, timeout, on_output)
+        finally:
+            with self._stats_lock:
+                self.active -= 1
+
+    def _dispatch(self, code, timeout: int,
+                  on_output: Optional[Callable[[str, str], None]]) -> Dict[str, Any]:
+        """执行已通过安全检查的代码"""
+        # 2. 交给孵化进程或预启动的工作进程执行
+        executor = self._get_executor()
+        if executor is not None:
+            return executor.execute(code, timeout=timeout, on_output=on_output)
+
+        # 3. 未启用执行器：创建独立进程执行，结果经管道返回（等待期间持续读取）
+        started = time.perf_counter()
+        reader, writer = multiprocessing.Pipe(duplex=False)
         process = multiprocessing.Process(
             target=self._run_in_process,
-            args=(code, queue)
+            args=(code, writer, on_output is not None)
         )
-        
+
         process.start()
-        process.join(timeout=timeout)
-        
-        if process.is_alive():
+        writer.close()
+        with self._stats_lock:
+            self.spawned += 1
+            self.spawn_seconds += time.perf_counter() - started
+        try:
+            received = receive_result(reader, timeout, on_output, sentinel=process.sentinel)
+        except (EOFError, OSError):
+            received = False
+        finally:
+            reader.close()
+
+        if received is None:
             process.terminate()
             process.join()
             return {
                 "success": False,
                 "error": f"代码执行超时（超过{timeout}秒）"
             }
-        
-        # 3. 获取执行结果
-        if not queue.empty():
-            return queue.get()
+
+        # 4. 获取执行结果
+        process.join()
+        if received:
+            return received[0]
         else:
             return {
                 "success": False,
                 "error": "代码执行失败，未返回结果"
             }
 
-    def _run_in_process(self, code: str, queue: multiprocessing.Queue):
+    def stats(self) -> Dict[str, Any]:
+        """
+        执行统计：执行方式、执行中的数量、进程创建次数与累计耗时
+
+        孵化进程/进程池模式下合并执行器自身的统计。
+        """
+        executor = self._executor
+        with self._stats_lock:
+            info = {
+                "mode": "process",
+                "active": self.active,
+                "spawned": self.spawned,
+                "spawn_seconds": round(self.spawn_seconds, 6),
+            }
+        if executor is not None:
+            from .zygote import SandboxZygote
+
+            info.update(executor.stats())
+            info["mode"] = "zygote" if isinstance(executor, SandboxZygote) else "pool"
+        return info
+
+    def _get_executor(self):
+        """按需创建执行器：孵化进程优先，其次进程池（均未启用时返回None）"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = self._create_executor()
+        return self._executor
+
+    def _create_executor(self):
+        from .zygote import SandboxZygote, fork_supported
+        from .worker_pool import SandboxWorkerPool
+
+        if self.zygote and fork_supported():
+            return SandboxZygote(self, preload=self.preload_modules)
+        if self.pool_size > 0:
+            return SandboxWorkerPool(
+                self,
+                size=self.pool_size,
+                max_runs=self.max_runs_per_worker,
+            )
+        return None
+
+    def warmup(self):
+        """预先启动执行器，避免首个请求承担启动和模块导入开销"""
+        executor = self._get_executor()
+        if executor is not None:
+            executor.start()
+
+    def shutdown(self):
+        """关闭执行器"""
+        if self._executor is not None:
+            self._executor.shutdown()
+
+    def _run_in_process(self, code: Union[str, bytes], conn, stream: bool = False):
         """
         在独立进程中执行代码
 
         平台差异:
         - Unix: 使用SIGALRM信号超时
         - Windows: 依赖multiprocessing的超时机制
+
+        Args:
+            code: 要执行的代码
+            conn: 结果管道的发送端
+            stream: 是否实时发送输出
+        """
+        # 设置资源限制（Unix系统）；fork 出的进程继承父进程的虚拟内存，上限在此基础上计算
+        self.set_resource_limits(memory_baseline=memory_baseline())
+        emit = make_emitter(conn) if stream else None
+        try:
+            result, breached = self._execute_code(code, emit=emit,
+                                                  send=functools.partial(send_result, conn))
+            send_result(conn, result, breached)
+        except (OSError, ValueError):
+            pass  # 父进程已放弃等待（超时）
+        finally:
+            conn.close()
+
+    def _execute_code(self, code: Union[str, bytes], per_run_cpu: bool = False,
+                      emit: Optional[Callable[[str, str], None]] = None,
+                      send: Optional[Callable[[Dict[str, Any], bool], None]] = None
+                      ) -> Tuple[Dict[str, Any], bool]:
+        """
+        在当前（已隔离的）进程中执行代码
+
+        Args:
+            code: 要执行的代码（源码，或 marshal 后的代码对象）
+            per_run_cpu: 是否按次设置CPU软上限（复用的工作进程需要）
+            emit: 实时输出发送函数 (stream, text)，None 表示只在结束时返回输出
+            send: 结果发送函数 (result, breached)。提供时输出达到上限即发送截断的结果
+                并退出当前进程：用户代码用裸 except 吞掉 OutputLimitExceeded 后
+                继续循环打印，只能等到超时
+
+        Returns:
+            (执行结果字典, 是否触发资源超限)
         """
+        breached = False
+        on_limit = None
+        if send is not None:
+            def on_limit():
+                if sys.platform != 'win32' and signal is not None:
+                    signal.alarm(0)
+                result = self._output_limit_result(stdout_capture, stderr_capture)
+                result["usage"] = meter.finish(stdout_capture.size + stderr_capture.size)
+                try:
+                    send(result, True)
+                finally:
+                    os._exit(0)
+
+        # 捕获输出（有上限）
+        stdout_capture = _OutputCapture('stdout', self.MAX_OUTPUT_SIZE, emit, on_limit)
+        stderr_capture = _OutputCapture('stderr', self.MAX_OUTPUT_SIZE, emit, on_limit)
+        meter = RunMeter()
+
         try:
-            # 设置资源限制（Unix系统）
-            self.set_resource_limits()
+            if per_run_cpu:
+                self._set_run_cpu_limit()
 
             # 设置超时信号（仅Unix系统）
             if sys.platform != 'win32' and signal is not None:
                 signal.signal(signal.SIGALRM, self._timeout_handler)
                 signal.alarm(self.MAX_CPU_TIME)
 
+            if isinstance(code, bytes):
+                code = marshal.loads(code)
+
             # 创建受限的全局命名空间（允许导入）
             safe_globals = {
                 '__builtins__': self._get_safe_builtins(),
@@ -251,42 +538,76 @@ class CodeSandbox:
                 '__doc__': None,
             }
 
-            # 捕获输出
-            stdout_capture = StringIO()
-            stderr_capture = StringIO()
-
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                # 执行代码（允许导入，但已经通过AST检查过）
-                exec(code, safe_globals, safe_globals)
-
-            stdout = stdout_capture.getvalue()
-            stderr = stderr_capture.getvalue()
-
-            # 限制输出大小
-            if len(stdout) > self.MAX_OUTPUT_SIZE:
-                stdout = stdout[:self.MAX_OUTPUT_SIZE] + "\n... (输出被截断)"
-            if len(stderr) > self.MAX_OUTPUT_SIZE:
-                stderr = stderr[:self.MAX_OUTPUT_SIZE] + "\n... (输出被截断)"
-
-            queue.put({
+            try:
+                with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+                    # 执行代码（允许导入，但已经通过AST检查过）
+                    exec(code, safe_globals, safe_globals)
+            finally:
+                stdout_capture.flush()
+                stderr_capture.flush()
+
+            result = {
                 "success": True,
-                "stdout": stdout,
-                "stderr": stderr,
+                "stdout": stdout_capture.getvalue(),
+                "stderr": stderr_capture.getvalue(),
                 "returncode": 0
-            })
+            }
+
+        except OutputLimitExceeded:
+            # 输出达到上限即终止执行，返回已捕获的部分
+            result = self._output_limit_result(stdout_capture, stderr_capture)
 
         except MemoryError:
-            queue.put({
+            breached = True
+            result = {
                 "success": False,
                 "error": "内存超限（超过256MB）"
-            })
+            }
 
         except Exception as e:
-            queue.put({
+            breached = isinstance(e, TimeoutError)
+            result = {
                 "success": False,
                 "error": f"执行错误: {type(e).__name__}: {str(e)}",
                 "stderr": str(e)
-            })
+            }
+
+        finally:
+            if sys.platform != 'win32' and signal is not None:
+                signal.alarm(0)
+
+        # 本次执行的资源使用
+        try:
+            result["usage"] = meter.finish(stdout_capture.size + stderr_capture.size)
+        except MemoryError:
+            pass
+        return result, breached
+
+    def _output_limit_result(self, stdout_capture: _OutputCapture,
+                             stderr_capture: _OutputCapture) -> Dict[str, Any]:
+        """输出达到上限时的结果（包含已捕获的部分）"""
+        return {
+            "success": False,
+            "error": f"输出超过限制（最大{self.MAX_OUTPUT_SIZE}字节），已终止执行",
+            "stdout": stdout_capture.getvalue(),
+            "stderr": stderr_capture.getvalue(),
+            "truncated": True
+        }
+
+    def _set_run_cpu_limit(self):
+        """以已用CPU时间为基准，为本次执行设置CPU软上限"""
+        if resource is None:
+            return
+        try:
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = int(usage.ru_utime + usage.ru_stime) + 1
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            soft = used + self.MAX_CPU_TIME
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        except (ValueError, OSError):
+            pass
 
     def _timeout_handler(self, signum, frame):
         """超时处理器（仅Unix系统使用）"""
@@ -333,10 +654,8 @@ class CodeSandbox:
             'pow', 'print', 'property', 'range', 'repr', 'reversed', 'round',
             'set', 'slice', 'sorted', 'staticmethod', 'str', 'sum', 'super',
             'tuple', 'type', 'zip',
-            # 异常类
-            'Exception', 'ValueError', 'TypeError', 'KeyError', 'IndexError',
-            'AttributeError', 'RuntimeError', 'StopIteration', 'ZeroDivisionError',
         }
+        allowed.update(self.SAFE_EXCEPTIONS)
 
         for name in allowed:
             if hasattr(builtins, name):
@@ -344,11 +663,17 @@ class CodeSandbox:
 
         # 添加受限的__import__（通过AST已经检查过）
         safe_builtins['__import__'] = __import__
+        # class 语句编译为对 __build_class__ 的调用；类体与函数共用同一份受限内置函数，
+        # 用户代码无法直接引用它（双下划线由模式检查禁止）
+        safe_builtins['__build_class__'] = builtins.__build_class__
 
         return safe_builtins
 
 
-# 全局沙箱实例
-sandbox = CodeSandbox()
-
-
+# 全局沙箱实例（孵化进程优先，不支持 fork 时使用预启动的工作进程池）
+sandbox = CodeSandbox(
+    pool_size=config.SANDBOX_POOL_SIZE,
+    max_runs_per_worker=config.SANDBOX_WORKER_MAX_RUNS,
+    zygote=config.SANDBOX_ZYGOTE,
+    preload_modules=config.SANDBOX_PRELOAD_MODULES,
+)
@@ -0,0 +1,67 @@
+"""
+沙箱结果通道 - 父进程与执行子进程之间的消息约定
+
+子进程 -> 父进程:
+- ('chunk', 'stdout'|'stderr', text)  实时输出（仅在请求流式输出时发送）
+- ('result', result_dict, breached)   最终结果，breached 表示触发了资源超限
+
+消息经 multiprocessing Connection 传输：每条消息是带长度前缀的一帧，
+大消息的头部与数据分开写入，接收方按长度一次读入，不经过中转线程。
+父进程在等待期间持续读取，子进程不会因管道写满而阻塞。
+"""
+
+import time
+from multiprocessing.connection import wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+OutputCallback = Callable[[str, str], None]
+
+
+def make_emitter(conn) -> Callable[[str, str], None]:
+    """创建子进程中的实时输出发送函数"""
+    def emit(stream: str, text: str):
+        conn.send(('chunk', stream, text))
+    return emit
+
+
+def send_result(conn, result: Dict[str, Any], breached: bool = False):
+    """子进程发送最终结果"""
+    conn.send(('result', result, breached))
+
+
+def receive_result(conn, timeout: float,
+                   on_output: Optional[OutputCallback] = None,
+                   sentinel=None) -> Optional[Tuple[Dict[str, Any], bool]]:
+    """
+    父进程接收结果，期间把实时输出转交给 on_output
+
+    Args:
+        conn: 接收端
+        timeout: 超时时间（秒）
+        on_output: 实时输出回调 (stream, text)
+        sentinel: 子进程的 sentinel，子进程退出后不再等待到超时
+
+    Returns:
+        (结果字典, 是否资源超限)；超时返回 None
+
+    Raises:
+        EOFError/OSError: 子进程在返回结果前退出
+    """
+    handles = [conn] if sentinel is None else [conn, sentinel]
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        ready = wait(handles, remaining)
+        if not ready:
+            return None
+        if conn not in ready and not conn.poll(0):
+            # 子进程已退出且管道中没有剩余数据
+            raise EOFError("执行进程已退出")
+        message = conn.recv()
+        if message[0] == 'chunk':
+            if on_output is not None:
+                on_output(message[1], message[2])
+            continue
+        return message[1], message[2]
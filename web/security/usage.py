@@ -0,0 +1,202 @@
+"""
+资源使用统计 - 每次执行的耗时/CPU/内存/输出量，以及服务端汇总
+
+- RunMeter 在执行子进程内计量（墙钟时间、用户态/内核态CPU、峰值RSS）
+- 复用的工作进程在每次执行前重置峰值RSS（Linux /proc/self/clear_refs），按次统计
+- 峰值RSS扣除开始执行时的RSS（孵化进程预加载的 numpy/pandas 等由子进程继承，不计入用户代码），
+  扣除的部分以 baseline_rss_kb 单独返回
+- UsageStats 保留最近 N 次执行的样本，给出分位数，用于评估 MAX_MEMORY_MB / MAX_CPU_TIME
+"""
+
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from . import config
+
+if sys.platform != 'win32':
+    import resource
+else:
+    resource = None
+
+# 汇总的指标
+FIELDS = ('wall_ms', 'user_ms', 'system_ms', 'peak_rss_kb', 'output_bytes')
+
+
+def _reset_peak_rss():
+    """把峰值RSS（VmHWM）重置为当前RSS，仅 Linux 支持"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def _status_kb(field: str) -> Optional[int]:
+    """/proc/self/status 中的内存项（KB），仅 Linux 支持"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def memory_baseline() -> int:
+    """
+    当前进程已占用的虚拟内存（字节），仅 Linux 支持，取不到时为 0
+
+    fork 出的执行进程继承父进程的虚拟内存（预导入的模块、多线程服务的 malloc arena），
+    RLIMIT_AS 需在此基础上再加 MAX_MEMORY_MB，否则进程可能在运行用户代码前就已超限。
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[0])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _rss_kb() -> Optional[int]:
+    """当前进程的RSS（KB），取不到时退回峰值RSS"""
+    rss = _status_kb('VmRSS')
+    return rss if rss is not None else _peak_rss_kb()
+
+
+def _peak_rss_kb() -> Optional[int]:
+    """当前进程的峰值RSS（KB）"""
+    peak = _status_kb('VmHWM')
+    if peak is not None:
+        return peak
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS 的 ru_maxrss 单位是字节，Linux 是KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _cpu_times():
+    """当前进程的 (用户态, 内核态) CPU时间（秒）"""
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        return usage.ru_utime, usage.ru_stime
+    times = os.times()
+    return times.user, times.system
+
+
+class RunMeter:
+    """在执行进程内计量一次执行"""
+
+    def __init__(self):
+        _reset_peak_rss()
+        self._baseline_rss = _rss_kb()
+        self._cpu = _cpu_times()
+        self._start = time.perf_counter()
+
+    def finish(self, output_bytes: int = 0) -> Dict[str, Any]:
+        """结束计量，返回本次执行的资源使用"""
+        wall = time.perf_counter() - self._start
+        user, system = _cpu_times()
+        peak = _peak_rss_kb()
+        if peak is not None and self._baseline_rss is not None:
+            peak = max(peak - self._baseline_rss, 0)
+        return {
+            "wall_ms": round(wall * 1000, 2),
+            "user_ms": round((user - self._cpu[0]) * 1000, 2),
+            "system_ms": round((system - self._cpu[1]) * 1000, 2),
+            "peak_rss_kb": peak,
+            "baseline_rss_kb": self._baseline_rss,
+            "output_bytes": output_bytes,
+        }
+
+
+class UsageStats:
+    """服务端资源使用汇总（最近 N 次执行的滑动样本）"""
+
+    def __init__(self, sample_size: int = 1000):
+        """
+        Args:
+            sample_size: 保留的最近样本数
+        """
+        self.sample_size = sample_size
+        self._samples: Dict[str, Deque[float]] = {
+            field: deque(maxlen=sample_size) for field in FIELDS
+        }
+        self._lock = threading.Lock()
+
+        # 累计统计
+        self.runs = 0
+        self.totals = {field: 0.0 for field in FIELDS}
+        self.maxima = {field: 0.0 for field in FIELDS}
+
+    def record(self, usage: Optional[Dict[str, Any]]):
+        """记录一次执行的资源使用（缺失的指标忽略）"""
+        if not usage:
+            return
+        with self._lock:
+            self.runs += 1
+            for field in FIELDS:
+                value = usage.get(field)
+                if value is None:
+                    continue
+                self._samples[field].append(value)
+                self.totals[field] += value
+                if value > self.maxima[field]:
+                    self.maxima[field] = value
+
+    def summary(self) -> Dict[str, Any]:
+        """各指标的累计值与最近样本的分位数"""
+        with self._lock:
+            samples = {field: sorted(values) for field, values in self._samples.items()}
+            runs = self.runs
+            totals = dict(self.totals)
+            maxima = dict(self.maxima)
+
+        metrics = {}
+        for field in FIELDS:
+            values = samples[field]
+            metrics[field] = {
+                "total": round(totals[field], 2),
+                "max": maxima[field],
+                "mean": round(sum(values) / len(values), 2) if values else 0,
+                "p50": _percentile(values, 0.50),
+                "p95": _percentile(values, 0.95),
+                "p99": _percentile(values, 0.99),
+            }
+        return {
+            "runs": runs,
+            "samples": len(samples['wall_ms']),
+            "limits": {
+                "max_memory_mb": config.MAX_MEMORY_MB,
+                "max_cpu_time": config.MAX_CPU_TIME,
+                "max_output_size": config.MAX_OUTPUT_SIZE,
+            },
+            "metrics": metrics,
+        }
+
+    def reset(self):
+        """清空统计（用于测试）"""
+        with self._lock:
+            for values in self._samples.values():
+                values.clear()
+            self.runs = 0
+            self.totals = {field: 0.0 for field in FIELDS}
+            self.maxima = {field: 0.0 for field in FIELDS}
+
+
+def _percentile(values, q: float):
+    """已排序样本的分位数（最近秩法）"""
+    if not values:
+        return 0
+    index = min(len(values) - 1, max(0, math.ceil(q * len(values)) - 1))
+    return values[index]
+
+
+# 全局资源使用汇总
+usage_stats = UsageStats(sample_size=config.USAGE_SAMPLE_SIZE)
@@ -0,0 +1,278 @@
+"""
+沙箱工作进程池 - 预先启动的执行进程，避免每次运行都创建新进程
+
+- 工作进程启动时即设置好资源限制（内存、CPU总预算）
+- 每次执行后撤销用户代码对已导入模块的修改，新导入的模块也一并移除
+- 每个工作进程执行 N 次后回收，防止用户代码残留的状态累积
+- 任何一次超时、内存超限或CPU超限都会立即回收该进程并补充新进程
+"""
+
+import atexit
+import contextvars
+import functools
+import multiprocessing
+import queue
+import random
+import sys
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .transport import OutputCallback, make_emitter, receive_result, send_result
+from .usage import memory_baseline
+
+if sys.platform != 'win32':
+    import signal
+else:
+    signal = None
+
+
+class _ModuleState:
+    """
+    工作进程启动时的模块状态，每次执行后恢复
+
+    复用的工作进程依次执行不同用户的代码。用户代码可以改写已导入模块的属性
+    （如 math.pi = 3、builtins.print = ...）或导入新模块，不恢复的话会影响
+    之后其他用户的运行结果。这里记录 sys.modules 与各模块命名空间的浅拷贝，
+    执行后删除新增的模块与属性、还原被改写的属性；每次在新的 contextvars 上下文
+    副本中执行，执行后重置 decimal 上下文（上下文对象可被原地修改），
+    全局随机数生成器重新播种（避免上一位用户的 seed 决定之后的随机序列）。
+
+    模块内可变对象的原地修改无法逐一撤销，仍由 max_runs 回收兜底。
+    """
+
+    def __init__(self):
+        self.modules = dict(sys.modules)
+        self.namespaces = {
+            name: (module.__dict__, dict(module.__dict__))
+            for name, module in self.modules.items()
+            if isinstance(getattr(module, '__dict__', None), dict)
+        }
+
+    def restore_namespace(self, name: str):
+        """还原单个模块的命名空间（只用字典方法，内置函数可能已被改写）"""
+        namespace, saved = self.namespaces[name]
+        for key in namespace.keys() - saved.keys():
+            del namespace[key]
+        namespace.update(saved)
+
+    def restore(self):
+        """还原 sys.modules 与全部模块命名空间，重置 decimal 上下文与随机数生成器"""
+        for name in [name for name in sys.modules if name not in self.modules]:
+            del sys.modules[name]
+        sys.modules.update(self.modules)
+        for name in self.namespaces:
+            self.restore_namespace(name)
+
+        decimal = sys.modules.get('decimal')
+        if decimal is not None:
+            decimal.setcontext(decimal.Context())
+        random.seed()
+        numpy_random = sys.modules.get('numpy.random')
+        if numpy_random is not None:
+            numpy_random.seed()
+
+
+def _worker_main(conn, sandbox, cpu_budget: int):
+    """
+    工作进程主循环：接收代码 -> 执行 -> 返回结果 -> 恢复模块状态
+
+    收到 None 或管道关闭时退出；发生资源超限时返回结果后主动退出。
+    """
+    # fork 出的工作进程继承了父进程的虚拟内存（如多线程 Web 服务的 malloc arena），
+    # 与孵化进程一样在此基础上再加 MAX_MEMORY_MB
+    sandbox.set_resource_limits(cpu_budget=cpu_budget, memory_baseline=memory_baseline())
+    state = _ModuleState()
+
+    while True:
+        try:
+            request = conn.recv()
+        except (EOFError, OSError):
+            break
+        if request is None:
+            break
+
+        code, stream = request
+        emit = make_emitter(conn) if stream else None
+        try:
+            result, breached = contextvars.copy_context().run(
+                sandbox._execute_code, code, per_run_cpu=True, emit=emit,
+                send=functools.partial(send_result, conn))
+            # 返回结果本身要用到内置函数，先还原 builtins；其余模块在返回后还原
+            state.restore_namespace('builtins')
+            send_result(conn, result, breached)
+        except (OSError, ValueError):
+            break
+        if breached:
+            break
+        state.restore()
+
+    conn.close()
+
+
+class _Worker:
+    """单个工作进程及其通信管道"""
+
+    def __init__(self, process: multiprocessing.Process, conn):
+        self.process = process
+        self.conn = conn
+        self.runs = 0
+
+    def stop(self, grace: float = 0.5):
+        """停止工作进程（先礼后兵）"""
+        try:
+            if self.process.is_alive():
+                self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(grace)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class SandboxWorkerPool:
+    """预启动的沙箱工作进程池"""
+
+    def __init__(self, sandbox, size: int = 5, max_runs: int = 50):
+        """
+        初始化进程池
+
+        Args:
+            sandbox: 提供资源限制与执行逻辑的 CodeSandbox 实例
+            size: 工作进程数量
+            max_runs: 每个工作进程最多执行次数，达到后回收
+        """
+        self.sandbox = sandbox
+        self.size = max(1, size)
+        self.max_runs = max(1, max_runs)
+        # CPU总预算：单次限制 × 最大执行次数，再留一次余量
+        self.cpu_budget = sandbox.MAX_CPU_TIME * (self.max_runs + 1)
+
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._workers = set()
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+        # 统计
+        self.spawned = 0
+        self.recycled = 0
+        self.spawn_seconds = 0.0  # 创建工作进程的累计耗时
+
+    def start(self):
+        """启动全部工作进程（可重复调用）"""
+        with self._lock:
+            if self._started or self._closed:
+                return
+            self._started = True
+            for _ in range(self.size):
+                self._idle.put(self._spawn())
+        atexit.register(self.shutdown)
+
+    def _spawn(self) -> _Worker:
+        """创建一个新的工作进程（调用方需持有锁或处于启动阶段）"""
+        started = time.perf_counter()
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = multiprocessing.Process(
+            target=_worker_main,
+            args=(child_conn, self.sandbox, self.cpu_budget),
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+
+        worker = _Worker(process, parent_conn)
+        self._workers.add(worker)
+        self.spawned += 1
+        self.spawn_seconds += time.perf_counter() - started
+        return worker
+
+    def _retire(self, worker: _Worker):
+        """回收工作进程并补充一个新进程"""
+        worker.stop()
+        with self._lock:
+            self._workers.discard(worker)
+            self.recycled += 1
+            if self._closed:
+                return
+            replacement = self._spawn()
+        self._idle.put(replacement)
+
+    def execute(self, code, timeout: int = 10,
+                on_output: Optional[OutputCallback] = None) -> Dict[str, Any]:
+        """
+        将代码交给空闲工作进程执行
+
+        Args:
+            code: 已通过安全检查的代码（源码或 marshal 字节）
+            timeout: 超时时间（秒）
+            on_output: 实时输出回调 (stream, text)
+
+        Returns:
+            执行结果字典（与 CodeSandbox.execute_safe 格式一致）
+        """
+        self.start()
+        worker = self._idle.get()
+        while not worker.process.is_alive():
+            # 空闲期间意外退出的进程直接补充
+            self._retire(worker)
+            worker = self._idle.get()
+        retire = True
+
+        try:
+            worker.conn.send((code, on_output is not None))
+            received = receive_result(worker.conn, timeout, on_output,
+                                      sentinel=worker.process.sentinel)
+            if received is not None:
+                result, retire = received
+            else:
+                result = {
+                    "success": False,
+                    "error": f"代码执行超时（超过{timeout}秒）"
+                }
+        except (EOFError, OSError):
+            result = self._dead_worker_result(worker)
+        else:
+            worker.runs += 1
+            retire = retire or worker.runs >= self.max_runs
+
+        if retire:
+            self._retire(worker)
+        else:
+            self._idle.put(worker)
+        return result
+
+    def _dead_worker_result(self, worker: _Worker) -> Dict[str, Any]:
+        """工作进程意外退出时，根据退出信号生成错误信息"""
+        worker.process.join(1)
+        exitcode = worker.process.exitcode
+        if signal is not None and exitcode == -signal.SIGXCPU:
+            error = "CPU时间超限"
+        else:
+            error = "代码执行失败，未返回结果"
+        return {"success": False, "error": error}
+
+    def stats(self) -> Dict[str, int]:
+        """进程池状态"""
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "alive": sum(1 for w in list(self._workers) if w.process.is_alive()),
+            "spawned": self.spawned,
+            "spawn_seconds": round(self.spawn_seconds, 6),
+            "recycled": self.recycled,
+        }
+
+    def shutdown(self):
+        """关闭进程池"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop(grace=0.1)
+
@@ -0,0 +1,245 @@
+"""
+沙箱孵化进程（Zygote）- 预导入重型模块，每次执行 fork 一个写时复制子进程
+
+- 孵化进程启动时一次性导入 numpy/pandas/sklearn/jieba 等允许的重型模块
+- 每次执行从孵化进程 fork 子进程，子进程继承已导入的模块，毫秒级启动
+- 子进程执行一次即退出，执行之间互不影响
+- 仅支持提供 fork 的平台（Linux/macOS）
+"""
+
+import atexit
+import functools
+import importlib
+import os
+import sys
+import tempfile
+import threading
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, Iterable, List, Optional
+
+from .transport import OutputCallback, make_emitter, receive_result, send_result
+from .usage import memory_baseline
+
+if sys.platform != 'win32':
+    import signal
+else:
+    signal = None
+
+
+def fork_supported() -> bool:
+    """当前平台是否支持 fork"""
+    return hasattr(os, 'fork')
+
+
+def _preload(modules: Iterable[str]) -> List[str]:
+    """导入可用的重型模块，返回成功导入的模块名"""
+    # 沙箱内只需单线程数值计算，避免 BLAS 线程池与 fork 冲突
+    for var in ('OPENBLAS_NUM_THREADS', 'OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ.setdefault(var, '1')
+
+    loaded = []
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception:
+            continue
+        loaded.append(name)
+    return loaded
+
+
+def _run_child(conn, sandbox, baseline: int):
+    """fork 出的子进程：执行一次代码后退出"""
+    try:
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        conn.send(os.getpid())
+        code, stream = conn.recv()
+        sandbox.set_resource_limits(memory_baseline=baseline)
+        emit = make_emitter(conn) if stream else None
+        result, breached = sandbox._execute_code(code, emit=emit,
+                                                 send=functools.partial(send_result, conn))
+        send_result(conn, result, breached)
+    except BaseException:
+        pass
+    finally:
+        os._exit(0)
+
+
+def _zygote_main(address: str, authkey: bytes, ready_conn, sandbox, modules):
+    """孵化进程主循环：预导入模块后，为每个连接 fork 一个子进程"""
+    loaded = _preload(modules)
+    baseline = memory_baseline()
+
+    # 子进程由内核自动回收
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+
+    listener = Listener(address, family='AF_UNIX', authkey=authkey)
+    ready_conn.send(loaded)
+    ready_conn.close()
+
+    while True:
+        try:
+            conn = listener.accept()
+        except Exception:
+            continue
+
+        pid = os.fork()
+        if pid == 0:
+            listener.close()
+            _run_child(conn, sandbox, baseline)
+        conn.close()
+
+
+class SandboxZygote:
+    """孵化进程客户端：负责启动孵化进程并提交执行请求"""
+
+    FORK_TIMEOUT = 5  # 等待子进程就绪的最长时间（秒）
+
+    def __init__(self, sandbox, preload: Iterable[str] = ()):
+        """
+        初始化孵化进程客户端
+
+        Args:
+            sandbox: 提供资源限制与执行逻辑的 CodeSandbox 实例
+            preload: 需要在孵化进程中预导入的模块
+        """
+        self.sandbox = sandbox
+        self.preload = tuple(preload)
+        self.preloaded: List[str] = []
+
+        self._authkey = os.urandom(16)
+        self._address = None
+        self._process = None
+        self._lock = threading.Lock()
+        self._closed = False
+        self._atexit_registered = False
+
+        # 统计
+        self.runs = 0
+        self.restarts = 0
+        self.startup_seconds = 0.0
+        self.spawn_seconds = 0.0  # 每次 fork 到子进程就绪的累计耗时
+
+    def start(self):
+        """启动孵化进程（已运行时直接返回）"""
+        with self._lock:
+            if self._closed:
+                return
+            if self._process is not None and self._process.is_alive():
+                return
+            if self._process is not None:
+                self.restarts += 1
+            self._start_locked()
+            if not self._atexit_registered:
+                atexit.register(self.shutdown)
+                self._atexit_registered = True
+
+    def _start_locked(self):
+        started = time.perf_counter()
+        self._remove_socket()
+        tmpdir = tempfile.mkdtemp(prefix='sandbox-zygote-')
+        self._address = os.path.join(tmpdir, 'zygote.sock')
+
+        ready_recv, ready_send = Pipe(duplex=False)
+        self._process = Process(
+            target=_zygote_main,
+            args=(self._address, self._authkey, ready_send, self.sandbox, self.preload),
+            daemon=True,
+        )
+        self._process.start()
+        ready_send.close()
+        # 预导入可能需要数秒（pandas/sklearn）
+        self.preloaded = ready_recv.recv()
+        ready_recv.close()
+        self.startup_seconds = time.perf_counter() - started
+
+    def _connect(self):
+        """连接孵化进程；孵化进程异常退出时重启一次"""
+        self.start()
+        try:
+            return Client(self._address, family='AF_UNIX', authkey=self._authkey)
+        except OSError:
+            with self._lock:
+                if self._process is not None:
+                    self._process.kill()
+                    self._process.join()
+            self.start()
+            return Client(self._address, family='AF_UNIX', authkey=self._authkey)
+
+    def execute(self, code, timeout: int = 10,
+                on_output: Optional[OutputCallback] = None) -> Dict[str, Any]:
+        """
+        fork 一个子进程执行代码
+
+        Args:
+            code: 已通过安全检查的代码（源码或 marshal 字节）
+            timeout: 超时时间（秒）
+            on_output: 实时输出回调 (stream, text)
+
+        Returns:
+            执行结果字典（与 CodeSandbox.execute_safe 格式一致）
+        """
+        started = time.perf_counter()
+        conn = self._connect()
+        self.runs += 1
+        try:
+            if not conn.poll(self.FORK_TIMEOUT):
+                return {"success": False, "error": "沙箱进程启动超时"}
+            pid = conn.recv()
+            self.spawn_seconds += time.perf_counter() - started
+            conn.send((code, on_output is not None))
+            received = receive_result(conn, timeout, on_output)
+            if received is not None:
+                return received[0]
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+            return {
+                "success": False,
+                "error": f"代码执行超时（超过{timeout}秒）"
+            }
+        except (EOFError, OSError):
+            # 子进程被资源限制（如 SIGXCPU）终止
+            return {
+                "success": False,
+                "error": "代码执行异常终止（可能超出CPU或内存限制）"
+            }
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """孵化进程状态"""
+        return {
+            "alive": self._process is not None and self._process.is_alive(),
+            "preloaded": list(self.preloaded),
+            "runs": self.runs,
+            "spawned": self.runs,
+            "spawn_seconds": round(self.spawn_seconds, 6),
+            "restarts": self.restarts,
+            "startup_seconds": round(self.startup_seconds, 3),
+        }
+
+    def shutdown(self):
+        """关闭孵化进程"""
+        with self._lock:
+            self._closed = True
+            if self._process is not None and self._process.is_alive():
+                self._process.kill()
+                self._process.join()
+            self._remove_socket()
+
+    def _remove_socket(self):
+        """删除孵化进程的 Unix socket 及其临时目录"""
+        if not self._address:
+            return
+        try:
+            os.unlink(self._address)
+        except OSError:
+            pass
+        try:
+            os.rmdir(os.path.dirname(self._address))
+        except OSError:
+            pass
+        self._address = None
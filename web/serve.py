@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Python学习平台 - 生产环境启动
+
+- 优先使用 gunicorn：单个工作进程 × 多线程（gthread），主进程预加载应用（preload），
+  工作进程 fork 后预热沙箱执行器，预热完成才开始接收请求
+- 默认只启动 1 个工作进程，线程数按执行并发与排队上限计算。异步任务（JobManager）、
+  准入控制、/metrics 统计与孵化进程都在工作进程内存中：多个工作进程时任务的状态/事件
+  请求可能落到别的进程而返回 404，实际并发变为 进程数 × MAX_CONCURRENT_EXECUTIONS，
+  /metrics 只反映应答的那个进程，且每个进程各有一个预加载 numpy/pandas 的孵化进程。
+  因此多工作进程（--workers / WEB_WORKERS 大于 1）暂不支持，启动时给出警告；
+  需要按 CPU 核数启动时须显式指定 --workers auto（或 WEB_WORKERS=auto）
+- 平滑重启：kill -HUP <主进程PID>，逐个替换工作进程（预加载的应用代码不变，
+  升级代码请重启服务或使用 USR2）
+- gunicorn 不可用时（如 Windows）退回多线程 Werkzeug 服务（无调试器、无自动重载）
+- 启动前构建静态资源（assets.py），页面引用带内容哈希的预压缩文件
+
+使用方式:
+    python serve.py                       # 默认 0.0.0.0:$PORT（8080）
+    python serve.py --threads 16
+    python serve.py --workers auto        # 按 CPU 核数启动（不受支持，见上文）
+    python serve.py --server werkzeug     # 强制使用单进程多线程服务
+"""
+
+import argparse
+import os
+
+DEFAULT_PORT = 8080
+
+DEFAULT_WORKERS = 1
+
+MULTI_WORKER_WARNING = (
+    "⚠️  多个工作进程暂不支持：异步任务与准入控制在各进程内存中，"
+    "任务的状态/事件请求可能返回 404，实际并发为 进程数 × MAX_CONCURRENT_EXECUTIONS，"
+    "/metrics 只反映单个进程"
+)
+
+
+def cpu_count() -> int:
+    """当前进程可用的 CPU 核数（考虑 CPU 亲和性限制）"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def parse_workers(value: str) -> int:
+    """解析工作进程数：正整数，或 auto 表示可用 CPU 核数"""
+    if value.strip().lower() == 'auto':
+        return max(1, cpu_count())
+    return max(1, int(value))
+
+
+def worker_count() -> int:
+    """
+    工作进程数：WEB_WORKERS 环境变量（整数或 auto），默认 1
+
+    代码执行在沙箱子进程中进行，Web 工作进程本身主要在等待，单进程多线程即可；
+    异步任务、准入控制等状态在进程内存中，多进程部署暂不支持（见模块说明），
+    按 CPU 核数启动须显式设置 WEB_WORKERS=auto。
+    """
+    value = os.environ.get('WEB_WORKERS')
+    if value:
+        return parse_workers(value)
+    return DEFAULT_WORKERS
+
+
+def thread_count() -> int:
+    """
+    每个工作进程的线程数：WEB_THREADS 环境变量，
+    默认可同时执行与排队的请求数再加少量线程处理静态资源与查询接口
+    """
+    value = os.environ.get('WEB_THREADS')
+    if value:
+        return max(1, int(value))
+    from security import config
+    return config.MAX_CONCURRENT_EXECUTIONS + config.EXECUTION_QUEUE_SIZE + 4
+
+
+def post_fork(server, worker):
+    """gunicorn 钩子：工作进程 fork 后恢复后台线程并预热沙箱"""
+    import app as web_app
+    web_app.warm_up()
+    server.log.info("工作进程 %s 预热完成", worker.pid)
+
+
+def when_ready(server):
+    server.log.info("🚀 Python学习平台已启动（%s 个工作进程）", server.cfg.workers)
+
+
+def gunicorn_options(host: str, port: int, workers: int, threads: int) -> dict:
+    """gunicorn 配置"""
+    from security import config
+    return {
+        'bind': f'{host}:{port}',
+        'workers': workers,
+        'threads': threads,
+        'worker_class': 'gthread',
+        'preload_app': True,
+        # 批量评分最长 GRADE_TOTAL_TIMEOUT 秒，留出余量
+        'timeout': config.GRADE_TOTAL_TIMEOUT + 30,
+        'graceful_timeout': config.MAX_EXECUTION_TIME + 5,
+        'keepalive': 5,
+        'accesslog': '-',
+        'post_fork': post_fork,
+        'when_ready': when_ready,
+    }
+
+
+def run_gunicorn(host: str, port: int, workers: int, threads: int):
+    from gunicorn.app.base import BaseApplication
+
+    class PlatformApplication(BaseApplication):
+        def load_config(self):
+            for key, value in gunicorn_options(host, port, workers, threads).items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app import app
+            return app
+
+    PlatformApplication().run()
+
+
+def run_threaded(host: str, port: int):
+    """单进程多线程服务（gunicorn 不可用时）"""
+    from werkzeug.serving import run_simple
+    import app as web_app
+
+    web_app.warm_up()
+    print("🚀 Python学习平台已启动（单进程多线程模式）")
+    print(f"📖 访问地址: http://localhost:{port}")
+    run_simple(host, port, web_app.app, threaded=True,
+               use_reloader=False, use_debugger=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Python学习平台 - 生产环境启动')
+    parser.add_argument('--host', default='0.0.0.0', help='监听地址（默认: 0.0.0.0）')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', DEFAULT_PORT)),
+                        help='监听端口（默认: $PORT 或 8080）')
+    parser.add_argument('--workers', type=parse_workers,
+                        help='工作进程数，auto 表示CPU核数（默认: 1；大于1暂不支持，见模块说明）')
+    parser.add_argument('--threads', type=int, help='每个工作进程的线程数')
+    parser.add_argument('--server', choices=['auto', 'gunicorn', 'werkzeug'], default='auto',
+                        help='WSGI 服务（默认: 有 gunicorn 时使用 gunicorn）')
+    parser.add_argument('--skip-assets', action='store_true',
+                        help='不构建静态资源（已预先执行 python assets.py build 时）')
+    args = parser.parse_args(argv)
+
+    if not args.skip_assets:
+        import assets
+        manifest = assets.build()
+        print(f"📦 静态资源已构建（{len(manifest)} 个文件）")
+
+    server = args.server
+    if server == 'auto':
+        try:
+            import gunicorn  # noqa: F401
+            server = 'gunicorn'
+        except ImportError:
+            server = 'werkzeug'
+
+    if server == 'gunicorn':
+        workers = args.workers or worker_count()
+        if workers > 1:
+            print(MULTI_WORKER_WARNING)
+            # 至少让速率限制计数在进程间共享（可用环境变量显式指定）
+            os.environ.setdefault('RATE_LIMIT_BACKEND', 'sqlite')
+        run_gunicorn(args.host, args.port, workers, args.threads or thread_count())
+    else:
+        run_threaded(args.host, args.port)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,10 +6,28 @@ class PythonLearningApp {
         this.currentQuestion = null;
         this.editor = null;
         this.originalCode = '';
+        this.judgeSpecs = [];
+        this.clientId = this.loadClientId();
         
         this.init();
     }
     
+    // 客户端标识（保存在浏览器本地，用于查询自己的提交记录）
+    loadClientId() {
+        const key = 'pylearn-client-id';
+        try {
+            let id = localStorage.getItem(key);
+            if (!id) {
+                id = Array.from(crypto.getRandomValues(new Uint8Array(16)),
+                    b => b.toString(16).padStart(2, '0')).join('');
+                localStorage.setItem(key, id);
+            }
+            return id;
+        } catch (error) {
+            return null;
+        }
+    }
+    
     async init() {
         // 初始化CodeMirror编辑器
         this.editor = CodeMirror.fromTextArea(document.getElementById('codeEditor'), {
@@ -28,6 +46,7 @@ class PythonLearningApp {
         
         // 加载题目列表
         await this.loadQuestions();
+        await this.loadJudgeSpecs();
     }
     
     bindEvents() {
@@ -37,6 +56,7 @@ class PythonLearningApp {
         
         // 按钮
         document.getElementById('runCodeBtn').addEventListener('click', () => this.runCode());
+        document.getElementById('judgeCodeBtn').addEventListener('click', () => this.judgeCode());
         document.getElementById('resetCodeBtn').addEventListener('click', () => this.resetCode());
         document.getElementById('showHintBtn').addEventListener('click', () => this.showHint());
         document.getElementById('showAnswerBtn').addEventListener('click', () => this.showAnswer());
@@ -84,6 +104,16 @@ class PythonLearningApp {
         });
     }
     
+    async loadJudgeSpecs() {
+        try {
+            const response = await fetch('/api/judge');
+            const data = await response.json();
+            this.judgeSpecs = data.specs || [];
+        } catch (error) {
+            console.error('加载评测列表失败:', error);
+        }
+    }
+    
     filterQuestions() {
         const category = document.getElementById('categoryFilter').value;
         const difficulty = document.getElementById('difficultyFilter').value;
@@ -117,6 +147,10 @@ class PythonLearningApp {
             // 设置代码
             this.editor.setValue(data.code);
             
+            // 支持性能评测的题目显示评测按钮
+            const judgeable = this.judgeSpecs.some(spec => spec.set_id === data.id);
+            document.getElementById('judgeCodeBtn').style.display = judgeable ? '' : 'none';
+            
             // 高亮当前题目
             document.querySelectorAll('.question-item').forEach(item => {
                 item.classList.toggle('active', item.dataset.id === questionId);
@@ -138,30 +172,171 @@ class PythonLearningApp {
         // 显示加载状态
         outputEl.innerHTML = '<div class="output-info">⏳ 正在执行代码...</div>';
         
+        if (this.jobStream) {
+            this.jobStream.close();
+            this.jobStream = null;
+        }
+        
         try {
-            const response = await fetch('/api/run', {
+            // 提交异步任务，立即返回任务ID
+            const headers = { 'Content-Type': 'application/json' };
+            if (this.clientId) {
+                headers['X-Client-Id'] = this.clientId;
+            }
+            const response = await fetch('/api/jobs', {
                 method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ code }),
+                headers,
+                body: JSON.stringify({
+                    code,
+                    set_id: this.currentQuestion ? this.currentQuestion.id : null,
+                }),
             });
             
             const data = await response.json();
             
-            if (data.success) {
-                this.showOutput(data.stdout, 'success');
-            } else {
-                const errorMsg = data.stderr || data.error || '未知错误';
-                this.showOutput(errorMsg, 'error');
+            if (response.status !== 202) {
+                this.showOutput(data.error || '未知错误', 'error');
+                return;
             }
             
+            this.streamJob(data);
+            
         } catch (error) {
             console.error('执行代码失败:', error);
             this.showOutput('执行失败: ' + error.message, 'error');
         }
     }
     
+    streamJob(job) {
+        // 订阅任务事件流，边执行边显示输出
+        let output = '';
+        const source = new EventSource(job.events_url);
+        this.jobStream = source;
+        
+        const append = (event) => {
+            output += JSON.parse(event.data);
+            this.showOutput(output, 'info');
+        };
+        source.addEventListener('stdout', append);
+        source.addEventListener('stderr', append);
+        
+        source.addEventListener('result', (event) => {
+            source.close();
+            this.jobStream = null;
+            this.showResult(JSON.parse(event.data));
+        });
+        
+        source.onerror = () => {
+            // 连接断开时浏览器会带 Last-Event-ID 自动重连；任务已过期则停止
+            if (source.readyState === EventSource.CLOSED) {
+                this.jobStream = null;
+                this.pollJob(job.status_url);
+            }
+        };
+    }
+    
+    async pollJob(statusUrl) {
+        // 事件流不可用时轮询任务状态
+        try {
+            const response = await fetch(statusUrl);
+            const data = await response.json();
+            if (!response.ok) {
+                this.showOutput(data.error || '未知错误', 'error');
+            } else if (data.result) {
+                this.showResult(data.result);
+            } else {
+                this.showOutput(data.stdout + data.stderr || '⏳ 正在执行代码...', 'info');
+                setTimeout(() => this.pollJob(statusUrl), 500);
+            }
+        } catch (error) {
+            this.showOutput('执行失败: ' + error.message, 'error');
+        }
+    }
+    
+    async judgeCode() {
+        if (!this.currentQuestion) return;
+        const specs = this.judgeSpecs.filter(spec => spec.set_id === this.currentQuestion.id);
+        if (specs.length === 0) return;
+        
+        const outputEl = document.getElementById('outputContent');
+        outputEl.innerHTML = '<div class="output-info">⏳ 正在评测（放大规模输入，与参考答案对比）...</div>';
+        
+        const lines = [];
+        let passed = true;
+        for (const spec of specs) {
+            try {
+                const response = await fetch('/api/judge', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json',
+                    },
+                    body: JSON.stringify({
+                        set_id: spec.set_id,
+                        function: spec.function,
+                        code: this.editor.getValue(),
+                    }),
+                });
+                const report = await response.json();
+                passed = passed && Boolean(report.passed);
+                lines.push(this.formatJudgeReport(spec, report));
+            } catch (error) {
+                passed = false;
+                lines.push(`❌ ${spec.function}: 评测失败 ${error.message}`);
+            }
+        }
+        this.showOutput(lines.join('\n\n'), passed ? 'success' : 'error');
+    }
+    
+    formatJudgeReport(spec, report) {
+        const verdicts = {
+            accepted: '✅ 通过',
+            wrong_answer: '❌ 结果错误',
+            too_slow: '🐢 耗时超出阈值',
+            too_much_memory: '🧠 内存超出阈值',
+            timeout: '⏰ 执行超时',
+            error: '❌ 执行失败',
+        };
+        const head = `${verdicts[report.verdict] || '❌ 无法评测'}  ${spec.function} — ${spec.description}`;
+        if (!report.cases) {
+            return `${head}\n${report.error || ''}`;
+        }
+        const rows = report.cases.map(c => {
+            const mark = c.correct ? '✓' : '✗';
+            const ms = (c.seconds * 1000).toFixed(2);
+            const refMs = (c.reference_seconds * 1000).toFixed(2);
+            let row = `  ${mark} ${c.case}: ${ms} ms（参考 ${refMs} ms，×${c.time_ratio}），内存 ×${c.memory_ratio}`;
+            if (!c.correct) {
+                row += `\n      输出: ${c.output}\n      期望: ${c.expected}`;
+            }
+            return row;
+        });
+        const limits = `耗时 ×${report.time_ratio}（阈值 ×${report.thresholds.time_ratio}），` +
+            `内存 ×${report.memory_ratio}（阈值 ×${report.thresholds.memory_ratio}）`;
+        return [head, ...rows, `  ${limits}`].join('\n');
+    }
+    
+    showResult(data) {
+        if (data.success) {
+            this.showOutput(data.stdout + this.formatUsage(data.usage), 'success');
+        } else {
+            // 失败时同时显示已产生的输出（如输出超限被终止）
+            const errorMsg = data.stderr || data.error || '未知错误';
+            const text = data.stdout ? `${data.stdout}\n${errorMsg}` : errorMsg;
+            this.showOutput(text, 'error');
+        }
+    }
+    
+    formatUsage(usage) {
+        // 本次执行的资源使用
+        if (!usage) return '';
+        const parts = [`⏱ 耗时 ${usage.wall_ms} ms`, `CPU ${(usage.user_ms + usage.system_ms).toFixed(1)} ms`];
+        if (usage.peak_rss_kb) {
+            parts.push(`内存峰值 ${(usage.peak_rss_kb / 1024).toFixed(1)} MB`);
+        }
+        parts.push(`输出 ${usage.output_bytes} 字节`);
+        return '\n' + parts.join(' · ');
+    }
+
     showOutput(text, type = 'info') {
         const outputEl = document.getElementById('outputContent');
         const className = `output-${type}`;
@@ -190,15 +365,28 @@ class PythonLearningApp {
         this.showOutput(hintText, 'info');
     }
 
-    showAnswer() {
-        if (!this.currentQuestion || !this.currentQuestion.answer_code) {
+    async showAnswer() {
+        if (!this.currentQuestion || !this.currentQuestion.has_answer) {
             alert('该题目暂无答案');
             return;
         }
 
-        if (confirm('查看答案将显示完整解答。确定要查看吗？')) {
-            this.editor.setValue(this.currentQuestion.answer_code);
+        if (!confirm('查看答案将显示完整解答。确定要查看吗？')) return;
+
+        // 答案单独请求（题目详情不含答案），同一题目只请求一次
+        const question = this.currentQuestion;
+        try {
+            if (question.answer_code === undefined) {
+                const response = await fetch(`/api/question/${question.id}/answer`);
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                question.answer_code = (await response.json()).answer_code;
+            }
+            if (this.currentQuestion !== question) return;
+            this.editor.setValue(question.answer_code);
             this.showOutput('✅ 已加载答案代码。建议先尝试自己完成，再查看答案学习。', 'info');
+        } catch (error) {
+            console.error('加载答案失败:', error);
+            this.showError('加载答案失败，请重试');
         }
     }
 
@@ -0,0 +1,286 @@
+"""
+提交记录 - 每次执行的代码哈希、题目、结果分类、耗时与客户端标识保存到 SQLite（WAL）
+
+- 请求线程只把记录放入内存队列，后台线程按批（一个事务）写入，请求路径不等待磁盘同步；
+  队列满时丢弃并计数，不阻塞请求
+- 索引支持"某客户端最近 N 次提交"与按题目的统计
+- 超过保留期的记录由写入线程定期清理
+"""
+
+import hashlib
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# 提交结果分类
+VERDICTS = ('success', 'error', 'timeout', 'rejected')
+
+
+def classify(result: Dict[str, Any]) -> str:
+    """执行结果分类：success / error / timeout / rejected（安全检查未通过）"""
+    if result.get("success"):
+        return 'success'
+    if "violations" in result:
+        return 'rejected'
+    if "超时" in (result.get("error") or ''):
+        return 'timeout'
+    return 'error'
+
+
+def code_hash(code: str) -> str:
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+class SubmissionStore:
+    """
+    提交记录存储
+
+    每个线程一个连接；写入只在后台线程进行，每批最多 BATCH_SIZE 条，
+    队列为空时最多等待 FLUSH_INTERVAL 秒再写入。
+    """
+
+    BATCH_SIZE = 500
+    FLUSH_INTERVAL = 0.5
+    PRUNE_EVERY = 200  # 每写入多少批清理一次过期记录
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS submissions (
+            id          INTEGER PRIMARY KEY,
+            created     REAL NOT NULL,
+            client_id   TEXT NOT NULL,
+            set_id      TEXT,
+            code_hash   TEXT NOT NULL,
+            verdict     TEXT NOT NULL,
+            cached      INTEGER NOT NULL,
+            queue_ms    REAL,
+            run_ms      REAL,
+            peak_rss_kb INTEGER
+        )
+    """
+    _INDEXES = (
+        # 某客户端最近 N 次提交
+        "CREATE INDEX IF NOT EXISTS submissions_client ON submissions (client_id, created)",
+        # 按题目统计（覆盖索引，统计时不回表）
+        "CREATE INDEX IF NOT EXISTS submissions_set "
+        "ON submissions (set_id, verdict, client_id, run_ms)",
+        # 按时间清理
+        "CREATE INDEX IF NOT EXISTS submissions_created ON submissions (created)",
+    )
+    _INSERT = """
+        INSERT INTO submissions (created, client_id, set_id, code_hash, verdict, cached,
+                                 queue_ms, run_ms, peak_rss_kb)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    def __init__(self, path: str, max_queue: int = 10000, retention_days: float = 30,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            path: 数据库文件路径（所有工作进程使用同一路径）
+            max_queue: 等待写入的记录上限，超出时丢弃
+            retention_days: 记录保留天数（0 表示不清理）
+            clock: 时钟函数（测试时可替换）
+        """
+        self.path = path
+        self.retention = retention_days * 86400
+        self.clock = clock
+        self._local = threading.local()
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        self._unwritten = 0  # 已入队但未提交的记录数
+        self._cond = threading.Condition()
+        self._stop = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+
+        # 统计（本进程）
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.errors = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._conn()
+        conn.execute(self._SCHEMA)
+        for index in self._INDEXES:
+            conn.execute(index)
+
+    def _conn(self) -> sqlite3.Connection:
+        """每个线程一个连接（sqlite3 连接不可跨线程共享）"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or getattr(self._local, 'pid', None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def start_writer(self):
+        """
+        启动后台写入线程（已在运行或已关闭时不做任何事）
+
+        fork 出的子进程不继承线程，预加载应用的多进程部署需在 fork 后再次调用。
+        检查与启动在锁内完成，多个请求线程同时首次提交时只启动一个写入线程。
+        """
+        with self._cond:
+            if self._stop.is_set():
+                return
+            if self._writer is not None and self._writer.is_alive():
+                return
+            self._writer = threading.Thread(target=self._write_loop,
+                                            name="submission-writer", daemon=True)
+            self._writer.start()
+
+    def record(self, client_id: str, set_id: Optional[str], code: str, verdict: str,
+               queue_ms: Optional[float] = None, run_ms: Optional[float] = None,
+               peak_rss_kb: Optional[int] = None, cached: bool = False) -> bool:
+        """
+        记录一次提交（只入队，不等待写入），返回是否入队（队列满或已关闭时为 False）
+
+        Args:
+            client_id: 客户端标识
+            set_id: 题目编号（未知时为 None）
+            code: 提交的代码（只保存哈希）
+            verdict: 结果分类（见 classify）
+            queue_ms: 排队等待时间（毫秒）
+            run_ms: 执行耗时（毫秒）
+            peak_rss_kb: 执行进程的峰值内存（KB）
+            cached: 是否直接取自结果缓存
+        """
+        row = (self.clock(), client_id, set_id, code_hash(code), verdict, int(cached),
+               queue_ms, run_ms, peak_rss_kb)
+        with self._cond:
+            if self._stop.is_set():
+                return False
+            try:
+                self._queue.put_nowait(row)
+            except queue.Full:
+                self.dropped += 1
+                return False
+            self._unwritten += 1
+            self.recorded += 1
+        self.start_writer()
+        return True
+
+    def _write_loop(self):
+        while not self._stop.is_set() or not self._queue.empty():
+            try:
+                first = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+
+    def _write(self, batch: List[tuple]):
+        """一个事务写入一批记录（失败时丢弃该批并计数）"""
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN")
+            conn.executemany(self._INSERT, batch)
+            conn.execute("COMMIT")
+            written = len(batch)
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            written = 0
+        with self._cond:
+            self._unwritten -= len(batch)
+            self.written += written
+            self.errors += len(batch) - written
+            self.batches += 1
+            prune = self.retention > 0 and self.batches % self.PRUNE_EVERY == 0
+            self._cond.notify_all()
+        if prune:
+            self.prune()
+
+    def flush(self, timeout: Optional[float] = 5) -> bool:
+        """等待已入队的记录全部写入，返回是否在 timeout 秒内完成"""
+        self.start_writer()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._unwritten > 0:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = 5):
+        """停止接收记录，写完队列中的记录后结束写入线程"""
+        with self._cond:
+            self._stop.set()
+        if self._writer is not None:
+            self._writer.join(timeout)
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """删除超过保留期的记录，返回删除行数"""
+        if self.retention <= 0:
+            return 0
+        if now is None:
+            now = self.clock()
+        return self._conn().execute(
+            "DELETE FROM submissions WHERE created < ?", (now - self.retention,)
+        ).rowcount
+
+    def recent(self, client_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """某客户端最近 limit 次提交（新的在前）"""
+        cursor = self._conn().execute(
+            """
+            SELECT id, created, set_id, code_hash, verdict, cached, queue_ms, run_ms, peak_rss_kb
+            FROM submissions WHERE client_id = ?
+            ORDER BY created DESC, id DESC LIMIT ?
+            """,
+            (client_id, limit),
+        )
+        columns = [item[0] for item in cursor.description]
+        runs = [dict(zip(columns, row)) for row in cursor]
+        for run in runs:
+            run["cached"] = bool(run["cached"])
+        return runs
+
+    def set_stats(self, set_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """按题目统计提交数、通过率、提交人数与平均耗时（set_id 为 None 时统计全部题目）"""
+        where, params = ("WHERE set_id = ?", (set_id,)) if set_id else ("WHERE set_id IS NOT NULL", ())
+        rows = self._conn().execute(
+            f"""
+            SELECT set_id, COUNT(*), SUM(verdict = 'success'), COUNT(DISTINCT client_id),
+                   COUNT(DISTINCT CASE WHEN verdict = 'success' THEN client_id END),
+                   AVG(run_ms)
+            FROM submissions {where}
+            GROUP BY set_id ORDER BY set_id
+            """,
+            params,
+        ).fetchall()
+        return [
+            {
+                "set_id": set_id,
+                "submissions": total,
+                "passed": passed,
+                "pass_rate": round(passed / total, 4) if total else 0.0,
+                "clients": clients,
+                "solved_by": solved_by,
+                "avg_run_ms": round(avg_run_ms, 2) if avg_run_ms is not None else None,
+            }
+            for set_id, total, passed, clients, solved_by, avg_run_ms in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """写入统计（本进程）"""
+        with self._cond:
+            return {
+                "recorded": self.recorded,
+                "written": self.written,
+                "dropped": self.dropped,
+                "errors": self.errors,
+                "batches": self.batches,
+                "queue_depth": self._unwritten,
+            }
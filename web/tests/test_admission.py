@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+准入控制测试 - 验证并发上限、排队与快速失败
+"""
+
+import sys
+import os
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from security.admission import AdmissionController, AdmissionRejected
+
+
+def test_queue_full_fails_fast():
+    """测试队列已满时立即拒绝"""
+    controller = AdmissionController(max_concurrent=1, max_queue=0, queue_timeout=1)
+
+    with controller.slot():
+        try:
+            controller.acquire()
+        except AdmissionRejected as e:
+            assert e.retry_after >= 1
+        else:
+            raise AssertionError("队列已满时应拒绝")
+
+    assert controller.stats()["rejected"] == 1
+    print("✅ 队列满时快速失败")
+
+
+def test_queue_timeout():
+    """测试排队超时"""
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=0.1)
+
+    with controller.slot():
+        try:
+            controller.acquire()
+        except AdmissionRejected:
+            pass
+        else:
+            raise AssertionError("排队超时时应拒绝")
+
+    stats = controller.stats()
+    assert stats["timed_out"] == 1 and stats["queue_depth"] == 0
+    print("✅ 排队超时生效")
+
+
+def test_waiter_admitted_after_release():
+    """测试释放名额后排队请求被放行"""
+    controller = AdmissionController(max_concurrent=1, max_queue=1, queue_timeout=5)
+    controller.acquire()
+    waited = []
+
+    def waiter():
+        with controller.slot() as w:
+            waited.append(w)
+
+    t = threading.Thread(target=waiter)
+    t.start()
+    while controller.stats()["queue_depth"] == 0:
+        pass
+    controller.release()
+    t.join(2)
+
+    assert len(waited) == 1 and waited[0] > 0
+    assert controller.stats()["active"] == 0
+    print("✅ 排队请求在名额释放后执行")
+
+
+if __name__ == '__main__':
+    test_queue_full_fails_fast()
+    test_queue_timeout()
+    test_waiter_admitted_after_release()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+静态资源构建测试 - 验证压缩、内容哈希命名、预压缩与 manifest
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from assets import AssetManifest, build, minify_css, minify_js
+
+
+def test_minify_css():
+    """测试CSS注释与空白被去掉、选择器保持不变"""
+    source = "/* 标题 */\n.card  > h1 {\n    color: red;\n    margin: 0 auto;\n}\na :hover { top: 0 }\n"
+    assert minify_css(source) == ".card>h1{color:red;margin:0 auto}a :hover{top:0}\n"
+    print("✅ CSS压缩正确")
+
+
+def test_minify_js():
+    """测试JS注释被去掉，字符串、正则与模板字符串原样保留"""
+    source = (
+        "// 注释\n"
+        "const url = 'http://x/*y*/';  /* 块注释 */\n"
+        "const re = /\\/\\/[a-z]/g;\n"
+        "const n = a / b / c;\n"
+        "const html = `\n    <div>${ items.map(i => `<p>${i}</p>`).join('') }</div>\n`;\n"
+    )
+    result = minify_js(source)
+    assert '注释' not in result
+    assert "'http://x/*y*/'" in result
+    assert "/\\/\\/[a-z]/g" in result
+    assert "a / b / c" in result
+    assert "`\n    <div>${ items.map(i => `<p>${i}</p>`).join('') }</div>\n`" in result
+    print("✅ JS压缩保留字符串、正则与模板字符串")
+
+
+def test_build_and_manifest():
+    """测试构建产物带哈希命名、预压缩可解压，manifest 生效"""
+    with tempfile.TemporaryDirectory() as d:
+        static = Path(d)
+        (static / 'css').mkdir()
+        (static / 'css' / 'style.css').write_text("body {\n  margin: 0;\n}\n", encoding='utf-8')
+        (static / 'logo.png').write_bytes(b'\x89PNG')
+
+        manifest = AssetManifest(static)
+        assert manifest.url('css/style.css') == '/static/css/style.css'
+
+        mapping = build(static)
+        built = mapping['css/style.css']
+        assert list(mapping) == ['css/style.css']
+        assert built.startswith('dist/css/style.') and built.endswith('.css')
+
+        content = (static / built).read_bytes()
+        assert content == b"body{margin:0}\n"
+        assert gzip.decompress((static / (built + '.gz')).read_bytes()) == content
+        assert json.loads((static / 'dist' / 'manifest.json').read_text()) == mapping
+
+        assert manifest.url('css/style.css') == '/static/' + built
+        assert manifest.is_built(built)
+        assert not manifest.is_built('css/style.css')
+
+        # 内容不变时文件名不变，内容变化后换名
+        assert build(static) == mapping
+        (static / 'css' / 'style.css').write_text("body { margin: 1px; }\n", encoding='utf-8')
+        assert build(static)['css/style.css'] != built
+        assert not (static / built).exists()
+    print("✅ 构建产物与manifest正确")
+
+
+if __name__ == '__main__':
+    test_minify_css()
+    test_minify_js()
+    test_build_and_manifest()
+    print("\n🎉 所有测试通过！")
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+题目目录缓存测试 - 验证缓存命中、文件变化失效与ETag
+"""
+
+import sys
+import os
+import gzip
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from werkzeug.datastructures import Accept
+
+from catalog import QuestionCatalog
+from compression import choose_encoding
+
+META = {"X": {"name": "测试", "category": "基础", "difficulty": "⭐", "time": "1分钟"}}
+
+
+def _names(code):
+    return [{"name": line.split()[1]} for line in code.splitlines() if line.startswith("def ")]
+
+
+def test_catalog_invalidation():
+    """测试文件变化后缓存失效、内容不变时ETag不变"""
+    with tempfile.TemporaryDirectory() as d:
+        blank = Path(d) / "set_X_blank.py"
+        blank.write_text("def a():\n    pass\n", encoding="utf-8")
+
+        catalog = QuestionCatalog(Path(d), META, extract=_names, check_interval=0)
+        catalog.warm()
+        first = catalog.question("X")
+        assert first.payload["functions"] == [{"name": "a():"}]
+        assert first.payload["has_answer"] is False
+        assert catalog.answer("X") is None
+        assert catalog.question("X") is first, "未变化时应直接命中缓存"
+
+        os.utime(blank, ns=(0, 0))
+        assert catalog.question("X").etag == first.etag, "仅mtime变化时ETag不变"
+
+        blank.write_text("def b():\n    pass\n", encoding="utf-8")
+        second = catalog.question("X")
+        assert second.etag != first.etag
+        assert second.payload["functions"] == [{"name": "b():"}]
+
+        blank.unlink()
+        assert catalog.question("X") is None
+        assert catalog.listing().payload == {"questions": []}
+    print("✅ 题目缓存随文件变化失效")
+
+
+def test_answer_split_and_precompressed():
+    """测试答案单独缓存、预压缩响应体，仅答案变化时题目详情的ETag不变"""
+    with tempfile.TemporaryDirectory() as d:
+        blank = Path(d) / "set_X_blank.py"
+        answers = Path(d) / "set_X_answers.py"
+        blank.write_text("def a():\n    pass\n" * 200, encoding="utf-8")
+        answers.write_text("def a():\n    return 1\n", encoding="utf-8")
+
+        catalog = QuestionCatalog(Path(d), META, extract=_names, check_interval=0)
+        catalog.warm()
+        question = catalog.question("X")
+        answer = catalog.answer("X")
+        assert question.payload["has_answer"] is True
+        assert "answer_code" not in question.payload
+        assert answer.payload["answer_code"] == "def a():\n    return 1\n"
+
+        assert gzip.decompress(question.encoded["gzip"]) == question.body
+        assert len(question.encoded["gzip"]) < len(question.body)
+        assert answer.encoded == {}, "小响应体不压缩"
+
+        answers.write_text("def a():\n    return 2\n", encoding="utf-8")
+        assert catalog.question("X").etag == question.etag
+        assert catalog.answer("X").etag != answer.etag
+    print("✅ 答案单独缓存，响应体已预压缩")
+
+
+def test_choose_encoding():
+    """测试按 Accept-Encoding 选择压缩编码"""
+    assert choose_encoding(Accept([("gzip", 1), ("deflate", 1)])) == "gzip"
+    assert choose_encoding(Accept([("gzip", 0)])) is None
+    assert choose_encoding(Accept([("*", 1)]), available=["gzip"]) == "gzip"
+    assert choose_encoding(Accept([("gzip", 1)]), available=[]) is None
+    print("✅ 压缩编码协商正确")
+
+
+if __name__ == '__main__':
+    test_catalog_invalidation()
+    test_answer_split_and_precompressed()
+    test_choose_encoding()
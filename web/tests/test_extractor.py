@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+函数提取测试 - 验证AST提取的签名、方法与文档字符串
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from extractor import extract_functions
+
+CODE = '''
+class Cache:
+    """简易缓存"""
+
+    def get(self, key: str,
+            default=None) -> int:
+        """单行文档"""
+        return default
+
+
+async def fetch(url: str, *, retries: int = 3):
+    pass
+
+
+def ____placeholder(a, b):
+    """
+    多行
+    文档
+    """
+'''
+
+
+def test_extract_ast():
+    """测试类、方法、异步函数与多行签名"""
+    functions = extract_functions(CODE)
+    by_name = {f["name"]: f for f in functions}
+
+    assert [f["name"] for f in functions] == ["Cache", "get", "fetch", "____placeholder"]
+    assert by_name["Cache"]["kind"] == "class" and by_name["Cache"]["docstring"] == "简易缓存"
+
+    get = by_name["get"]
+    assert get["kind"] == "method" and get["parent"] == "Cache"
+    assert get["signature"] == "def get(self, key: str, default=None) -> int"
+    assert get["docstring"] == "单行文档"
+    assert (get["line"], get["end_line"]) == (5, 8)
+
+    assert by_name["fetch"]["kind"] == "async_function"
+    assert by_name["fetch"]["params"] == "url: str, *, retries: int=3"
+    assert by_name["____placeholder"]["docstring"] == "多行\n文档"
+    assert extract_functions(CODE) is functions, "相同内容应命中缓存"
+    print("✅ AST函数提取正确")
+
+
+def test_extract_syntax_error_fallback():
+    """测试语法错误时退回正则扫描"""
+    functions = extract_functions('def ok(a, b):\n    """说明"""\n    return (\n')
+    assert [(f["name"], f["params"], f["docstring"]) for f in functions] == [("ok", "a, b", "说明")]
+    print("✅ 语法错误时退回正则扫描")
+
+
+if __name__ == '__main__':
+    test_extract_ast()
+    test_extract_syntax_error_fallback()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+批量评分测试 - 验证样板代码处理、逐套隔离与超时
+"""
+
+import sys
+import os
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from grader import Grader, GradeError, prepare_program, unsupported_sets
+from security import config
+from security.sandbox import CodeSandbox
+from security.zygote import fork_supported
+
+PASSING = '''"""套题"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+def add(a: Point, b: Point) -> Point:
+    return Point(a.x + b.x, a.y + b.y)
+
+
+def _run_self_tests():
+    assert add(Point(1, 2), Point(3, 4)) == Point(4, 6)
+    print("[X 答案版] 自检断言：全部通过")
+
+
+if __name__ == "__main__":
+    _run_self_tests()
+'''
+
+FAILING = '''
+def double(x):
+    return x * 3
+
+
+def _run_self_tests():
+    assert double(2) == 4, "double(2) 应为 4"
+'''
+
+LOOPING = '''
+def _run_self_tests():
+    while True:
+        pass
+'''
+
+
+def test_prepare_program():
+    """测试去掉样板代码并追加自检调用"""
+    program = prepare_program(PASSING)
+    assert "__future__" not in program and "__name__" not in program
+    assert program.rstrip().endswith("_run_self_tests()")
+
+    with pytest.raises(GradeError):
+        prepare_program("def f():\n    pass\n")
+    with pytest.raises(GradeError):
+        prepare_program("def _run_self_tests(:\n")
+    print("✅ 评分程序生成正确")
+
+
+def test_grade_batch():
+    """测试一批套题逐套评分：通过、失败、超时、安全拒绝、无效"""
+    sandbox = CodeSandbox(pool_size=1)
+    grader = Grader(lambda code, timeout: sandbox.execute_safe(code, timeout=timeout),
+                    set_timeout=2, total_timeout=30)
+    try:
+        report = grader.grade({
+            "P": PASSING,
+            "F": FAILING,
+            "L": LOOPING,
+            "R": "import os\n\ndef _run_self_tests():\n    pass\n",
+            "N": "print(1)\n",
+            "P2": PASSING,
+        })
+    finally:
+        sandbox.shutdown()
+
+    status = {r["set_id"]: r["status"] for r in report["results"]}
+    assert status == {"P": "passed", "F": "failed", "L": "timeout",
+                      "R": "rejected", "N": "invalid", "P2": "passed"}
+    assert report["passed"] == 2 and report["total"] == 6
+    failed = report["results"][1]
+    assert "AssertionError" in failed["error"]
+    print("✅ 逐套评分结果正确，超时不影响后续套题")
+
+
+def test_grade_total_budget():
+    """测试整批时间预算用完后剩余套题被跳过"""
+    sandbox = CodeSandbox()
+    grader = Grader(lambda code, timeout: sandbox.execute_safe(code, timeout=timeout),
+                    set_timeout=1, total_timeout=1)
+    report = grader.grade({"L": LOOPING, "P": PASSING})
+    assert [r["status"] for r in report["results"]] == ["timeout", "skipped"]
+    print("✅ 超出整批预算的套题被跳过")
+
+
+EXERCISES_DIR = Path(__file__).resolve().parents[2] / "interview_exercises"
+
+
+def test_grade_reference_answers():
+    """测试用真实的参考答案评分：支持评分的套题全部通过，其余直接标记为 unsupported"""
+    # 与 /api/grade 相同的执行器：孵化进程预导入数据科学库
+    sandbox = CodeSandbox(zygote=fork_supported(), preload_modules=config.SANDBOX_PRELOAD_MODULES)
+    set_ids = sorted(path.name[len("set_"):-len("_answers.py")]
+                     for path in EXERCISES_DIR.glob("set_*_answers.py"))
+    unsupported = unsupported_sets(EXERCISES_DIR, set_ids, sandbox.analyzer.analyze)
+    assert "J" not in unsupported and "K" not in unsupported
+    assert "禁止使用双下划线属性" in unsupported["C"]
+    assert "禁止导入危险模块: threading" in unsupported["H"]
+
+    calls = []
+
+    def run(code, timeout):
+        calls.append(code)
+        return sandbox.execute_safe(code, timeout=timeout)
+
+    grader = Grader(run, set_timeout=30, total_timeout=600)
+    try:
+        report = grader.grade({set_id: (EXERCISES_DIR / f"set_{set_id}_answers.py").read_text(encoding='utf-8')
+                               for set_id in set_ids}, unsupported=unsupported)
+    finally:
+        sandbox.shutdown()
+    status = {r["set_id"]: r["status"] for r in report["results"]}
+    gradable = [set_id for set_id in set_ids if set_id not in unsupported]
+    failed = {set_id: r.get("error") for set_id, r in zip(set_ids, report["results"])
+              if set_id in gradable and r["status"] != "passed"}
+    assert not failed, failed
+    assert all(status[set_id] == "unsupported" for set_id in unsupported)
+    assert len(calls) == len(gradable), "不支持评分的套题不应执行"
+    print(f"✅ {len(gradable)} 套参考答案评分通过，{len(unsupported)} 套不支持评分: "
+          f"{', '.join(sorted(unsupported))}")
+
+
+if __name__ == '__main__':
+    test_prepare_program()
+    test_grade_batch()
+    test_grade_total_budget()
+    test_grade_reference_answers()
+    print("\n🎉 所有测试通过！")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+异步执行任务测试
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from jobs import JobManager, JobRejected, FINISHED
+
+
+def _fake_run(code, on_output):
+    """模拟执行：逐行输出后返回结果"""
+    lines = code.splitlines()
+    for line in lines:
+        on_output('stdout', line + '\n')
+    return {"success": True, "stdout": ''.join(l + '\n' for l in lines), "stderr": "", "returncode": 0}
+
+
+def _wait(job, timeout=5):
+    deadline = time.time() + timeout
+    while not job.done and time.time() < deadline:
+        time.sleep(0.01)
+    assert job.done
+
+
+def test_job_events_and_polling():
+    """测试任务事件序列与轮询结果"""
+    print("\n测试任务事件...")
+
+    manager = JobManager(_fake_run, workers=2, max_pending=4)
+    job = manager.submit("a\nb")
+    _wait(job)
+
+    events = job.events_after(0)
+    assert [e[1] for e in events] == ['status', 'status', 'stdout', 'stdout', 'result']
+    assert [e[0] for e in events] == [1, 2, 3, 4, 5]
+
+    # Last-Event-ID 续传：只返回之后的事件
+    assert [e[1] for e in job.events_after(4)] == ['result']
+
+    info = manager.get(job.id).to_dict()
+    assert info["status"] == FINISHED
+    assert info["stdout"] == "a\nb\n"
+    assert info["result"]["success"]
+    manager.shutdown()
+    print("✅ 事件序列与轮询结果正确")
+
+
+def test_job_rejected_when_full():
+    """测试待执行任务达到上限时拒绝提交"""
+    print("\n测试任务上限...")
+
+    gate = threading.Event()
+
+    def blocking_run(code, on_output):
+        gate.wait(5)
+        return {"success": True, "stdout": "", "stderr": ""}
+
+    manager = JobManager(blocking_run, workers=1, max_pending=2)
+    jobs = [manager.submit("x"), manager.submit("y")]
+    with pytest.raises(JobRejected) as exc:
+        manager.submit("z")
+    assert exc.value.retry_after >= 1
+    assert manager.stats()["rejected"] == 1
+
+    gate.set()
+    for job in jobs:
+        _wait(job)
+    assert manager.stats()["pending"] == 0
+    manager.shutdown()
+    print("✅ 超出上限的任务被拒绝")
+
+
+def test_job_expiry():
+    """测试结束的任务过期后被清理"""
+    print("\n测试任务过期...")
+
+    manager = JobManager(_fake_run, workers=1, max_pending=4, ttl=0)
+    job = manager.submit("a")
+    _wait(job)
+    time.sleep(0.01)
+    manager.submit("b")  # 提交时清理过期任务
+    assert manager.get(job.id) is None
+    manager.shutdown()
+    print("✅ 过期任务已清理")
+
+
+def test_sandbox_streams_output():
+    """测试沙箱逐行回调输出"""
+    print("\n测试实时输出...")
+
+    from security.sandbox import CodeSandbox
+
+    chunks = []
+    sandbox = CodeSandbox(pool_size=1)
+    try:
+        result = sandbox.execute_safe("print('one')\nprint('two')",
+                                      on_output=lambda stream, text: chunks.append((stream, text)))
+    finally:
+        sandbox.shutdown()
+
+    assert result["success"]
+    assert chunks == [('stdout', 'one\n'), ('stdout', 'two\n')]
+    print("✅ 输出按行实时回调")
+
+
+if __name__ == '__main__':
+    test_job_events_and_polling()
+    test_job_rejected_when_full()
+    test_job_expiry()
+    test_sandbox_streams_output()
+    print("\n🎉 所有测试通过！")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+性能评测测试 - 验证代码提取、正确性比对与效率阈值
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import pytest
+
+from judge import Judge, JudgeError, JudgeSpec, extract_program
+from security.sandbox import CodeSandbox
+
+ANSWERS = '''"""答案版"""
+
+from __future__ import annotations
+
+from typing import List
+
+
+def helper(x):
+    return x
+
+
+def total(xs: List[int]) -> int:
+    return sum(helper(x) for x in xs)
+
+
+if __name__ == "__main__":
+    print(total([1, 2]))
+'''
+
+SPEC = JudgeSpec("T", "total", "求和", """
+def cases(rng):
+    xs = [rng.randint(0, 100) for _ in range(20000)]
+    return [("sample", ([1, 2, 3],)), ("large", (xs,))]
+""", requires=("helper",), time_ratio=20.0, memory_ratio=3.0, repeat=2)
+
+
+def _judge(d):
+    (Path(d) / "set_T_answers.py").write_text(ANSWERS, encoding="utf-8")
+    sandbox = CodeSandbox()
+    return Judge(Path(d), run=lambda code: sandbox.execute_safe(code, timeout=10),
+                 specs={SPEC.key: SPEC})
+
+
+def test_extract_program():
+    """测试只提取被测函数、依赖定义与 import"""
+    program = extract_program(ANSWERS, ["total"], optional=["helper", "absent"])
+    assert "__" not in program, "应去掉 __future__ 与 __main__ 样板代码"
+    assert "from typing import List" in program
+    assert "def helper" in program and "def total" in program
+
+    with pytest.raises(JudgeError):
+        extract_program(ANSWERS, ["missing"])
+    with pytest.raises(JudgeError):
+        extract_program("def total(:\n", ["total"])
+    print("✅ 代码提取正确")
+
+
+def test_judge_verdicts():
+    """测试通过、结果错误、内存超出阈值"""
+    with tempfile.TemporaryDirectory() as d:
+        judge = _judge(d)
+
+        report = judge.evaluate("T", "total", ANSWERS)
+        assert report["verdict"] == "accepted", report
+        assert report["passed"] and [c["case"] for c in report["cases"]] == ["sample", "large"]
+
+        wrong = "def total(xs):\n    return sum(xs) + 1\n"
+        report = judge.evaluate("T", "total", wrong)
+        assert report["verdict"] == "wrong_answer"
+        assert report["cases"][0]["output"] == "7" and report["cases"][0]["expected"] == "6"
+
+        hungry = "def total(xs):\n    copies = [list(xs) for _ in range(50)]\n    return sum(copies[0])\n"
+        report = judge.evaluate("T", "total", hungry)
+        assert report["verdict"] == "too_much_memory", report
+        assert report["memory_ratio"] > 3.0
+
+        report = judge.evaluate("T", "total", "def total(xs):\n    import os\n    return 0\n")
+        assert report["verdict"] == "error" and report["violations"]
+
+        with pytest.raises(JudgeError):
+            judge.evaluate("T", "other", ANSWERS)
+    print("✅ 评测结论正确")
+
+
+if __name__ == '__main__':
+    test_extract_program()
+    test_judge_verdicts()
+    print("\n🎉 所有测试通过！")
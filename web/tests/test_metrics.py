@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+运行指标测试
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from metrics import MetricsRegistry, gauge
+
+
+def test_counter_across_threads():
+    """测试多线程计数（按线程分片，采集时相加）"""
+    print("\n测试多线程计数...")
+
+    registry = MetricsRegistry()
+    requests = registry.counter('requests_total', '请求数', ('route',))
+
+    def work():
+        for _ in range(1000):
+            requests.inc('/api/run')
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert requests.value('/api/run') == 8000
+    print("✅ 8个线程共计数 8000")
+
+
+def test_dead_thread_shards_folded():
+    """测试已退出线程的分片合并后计数不丢失"""
+    print("\n测试分片合并...")
+
+    registry = MetricsRegistry()
+    counter = registry.counter('events_total', '事件数')
+    counter.FOLD_THRESHOLD = 4
+
+    for _ in range(20):
+        t = threading.Thread(target=counter.inc)
+        t.start()
+        t.join()
+
+    assert len(counter._shards) <= 4
+    assert counter.value() == 20
+    print("✅ 短生命周期线程的分片已合并")
+
+
+def test_histogram():
+    """测试直方图分桶"""
+    print("\n测试直方图...")
+
+    registry = MetricsRegistry()
+    latency = registry.histogram('latency_seconds', '耗时', buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        latency.observe(value)
+
+    _, kind, _, samples = latency.collect()
+    buckets = {s[0]['le']: s[1] for s in samples if s[2] == '_bucket'}
+    assert kind == 'histogram'
+    assert buckets == {'0.1': 2, '1': 3, '+Inf': 4}
+    assert latency.count() == 4
+    print("✅ 分桶计数为累计值")
+
+
+def test_render():
+    """测试 Prometheus 文本格式与采集函数"""
+    print("\n测试文本格式...")
+
+    registry = MetricsRegistry(namespace='app')
+    registry.counter('runs_total', '执行数', ('outcome',)).inc('success', amount=3)
+    registry.register_collector(lambda: [gauge('queue_depth', '排队数', 2),
+                                         gauge('missing', '无数据', None)])
+
+    def broken():
+        raise RuntimeError("boom")
+    registry.register_collector(broken)
+
+    text = registry.render()
+    assert '# TYPE app_runs_total counter' in text
+    assert 'app_runs_total{outcome="success"} 3' in text
+    assert 'app_queue_depth 2' in text
+    assert '\napp_missing ' not in text
+    assert 'app_collector_errors 1' in text
+    print("✅ 输出格式正确，采集失败不影响其他指标")
+
+
+if __name__ == '__main__':
+    test_counter_across_threads()
+    test_dead_thread_shards_folded()
+    test_histogram()
+    test_render()
+    print("\n🎉 所有测试通过！")
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+速率限制器测试 - 验证分钟/小时限制与空闲客户端清理
+"""
+
+import sys
+import os
+import tempfile
+import multiprocessing
+import sqlite3
+import threading
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from security.rate_limiter import RateLimiter
+from security.rate_backends import BackendUnavailable, SQLiteBackend
+
+
+class FakeClock:
+    """可手动拨动的时钟"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_minute_limit():
+    """测试分钟级限制及窗口滑出后恢复"""
+    clock = FakeClock()
+    limiter = RateLimiter(max_per_minute=3, max_per_hour=100, evict_interval=0, clock=clock)
+
+    for _ in range(3):
+        assert limiter.is_allowed("1.1.1.1")[0]
+    allowed, reason = limiter.is_allowed("1.1.1.1")
+    assert not allowed and "每分钟" in reason
+    assert limiter.is_allowed("2.2.2.2")[0], "不同客户端互不影响"
+
+    clock.now += 61
+    assert limiter.is_allowed("1.1.1.1")[0], "窗口滑出后应恢复"
+    print("✅ 分钟级限制生效")
+
+
+def test_hour_limit_and_stats():
+    """测试小时级限制与统计"""
+    clock = FakeClock()
+    limiter = RateLimiter(max_per_minute=100, max_per_hour=5, evict_interval=0, clock=clock)
+
+    for _ in range(5):
+        assert limiter.is_allowed("ip")[0]
+        clock.now += 20
+    allowed, reason = limiter.is_allowed("ip")
+    assert not allowed and "每小时" in reason
+
+    stats = limiter.get_stats("ip")
+    assert stats["last_hour"] == 5 and stats["remaining_hour"] == 0
+    assert stats["last_minute"] == 2
+
+    clock.now += 3600
+    assert limiter.get_stats("ip")["last_hour"] == 0
+    print("✅ 小时级限制与统计正确")
+
+
+def test_idle_eviction():
+    """测试空闲客户端被清理"""
+    clock = FakeClock()
+    limiter = RateLimiter(evict_interval=0, idle_timeout=3600, clock=clock)
+
+    for i in range(1000):
+        limiter.is_allowed(f"10.0.{i // 256}.{i % 256}")
+    assert limiter.client_count() == 1000
+
+    clock.now += 1800
+    limiter.is_allowed("active")
+    assert limiter.evict_idle(clock.now + 1801) == 1000
+    assert limiter.client_count() == 1
+    print("✅ 空闲客户端清理生效")
+
+
+def _hit_shared(path, n, out):
+    limiter = RateLimiter(max_per_minute=n, max_per_hour=1000,
+                          backend=SQLiteBackend(path), evict_interval=0)
+    out.put(sum(limiter.is_allowed("shared")[0] for _ in range(n)))
+
+
+def test_sqlite_backend_shared_across_processes():
+    """测试SQLite后端在多个进程间共享计数"""
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "rate.db")
+        out = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=_hit_shared, args=(path, 10, out)) for _ in range(3)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        allowed = sum(out.get() for _ in procs)
+        assert allowed == 10, f"三个进程合计只应放行10次，实际 {allowed}"
+
+        limiter = RateLimiter(max_per_minute=10, backend=SQLiteBackend(path), evict_interval=0)
+        assert limiter.get_stats("shared")["last_minute"] == 10
+        limiter.reset()
+        assert limiter.client_count() == 0
+    print("✅ SQLite后端跨进程共享计数")
+
+
+def test_sqlite_backend_rollback_on_error():
+    """测试计数过程中出错时回滚，不提交写了一半的计数"""
+
+    class FailingBackend(SQLiteBackend):
+        def _hit(self, conn, client_id, now, max_per_minute, max_per_hour):
+            super()._hit(conn, client_id, now, max_per_minute, max_per_hour)
+            raise sqlite3.OperationalError("disk I/O error")
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "rate.db")
+        failing = FailingBackend(path)
+        try:
+            failing.hit("alice", 1000.0, 10, 100)
+        except BackendUnavailable as e:
+            assert isinstance(e.__cause__, sqlite3.OperationalError)
+        else:
+            raise AssertionError("应抛出 BackendUnavailable")
+        assert not failing._conn().in_transaction
+        assert SQLiteBackend(path).counts("alice", 1000.0) == (0, 0)
+        assert failing.counts("alice", 1000.0) == (0, 0)
+    print("✅ SQLite后端出错时回滚")
+
+
+def test_sqlite_backend_busy():
+    """测试其他进程长时间持有写锁时抛出 BackendUnavailable，锁释放后恢复计数"""
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "rate.db")
+        backend = SQLiteBackend(path, busy_timeout=0.1)
+        holder = sqlite3.connect(path, isolation_level=None)
+        holder.execute("BEGIN IMMEDIATE")
+        try:
+            backend.hit("alice", 1000.0, 10, 100)
+        except BackendUnavailable:
+            pass
+        else:
+            raise AssertionError("写锁被占用时应抛出 BackendUnavailable")
+        finally:
+            holder.execute("ROLLBACK")
+            holder.close()
+
+        assert not backend._conn().in_transaction
+        assert backend.hit("alice", 1000.0, 10, 100) is None
+        assert backend.counts("alice", 1000.0) == (1, 1)
+    print("✅ SQLite后端锁等待超时时报告不可用")
+
+
+def test_evictor_restart():
+    """测试清理线程可在 fork 后重新启动（已运行或已关闭时不重复启动）"""
+    print("\n测试清理线程重启...")
+
+    limiter = RateLimiter(evict_interval=60)
+    first = limiter._evictor
+    limiter.start_evictor()
+    assert limiter._evictor is first
+
+    # 模拟 fork 后的子进程：线程对象还在，但线程已不存在
+    limiter._evictor = threading.Thread(target=lambda: None)
+    limiter.start_evictor()
+    assert limiter._evictor is not first and limiter._evictor.is_alive()
+
+    limiter.close()
+    stopped = limiter._evictor
+    limiter.start_evictor()
+    assert limiter._evictor is stopped
+    print("✅ 清理线程按需重启")
+
+
+if __name__ == '__main__':
+    test_minute_limit()
+    test_hour_limit_and_stats()
+    test_idle_eviction()
+    test_sqlite_backend_shared_across_processes()
+    test_sqlite_backend_rollback_on_error()
+    test_sqlite_backend_busy()
+    test_evictor_restart()
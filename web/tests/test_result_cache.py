@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+执行结果缓存测试
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from security.result_cache import (
+    MemoryResultStore, ResultCache, SQLiteResultStore, is_cacheable, is_deterministic,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_determinism():
+    """测试结果确定性判断"""
+    print("\n测试确定性判断...")
+
+    assert is_deterministic("print(sum(range(10)))")
+    assert is_deterministic("import math\nprint(math.sqrt(2))")
+    assert not is_deterministic("import random\nprint(random.randint(1, 6))")
+    assert not is_deterministic("from datetime import datetime\nprint(datetime.now())")
+    assert not is_deterministic("import numpy as np\nprint(np.random.rand())")
+    assert not is_deterministic("print(hash('abc'))")
+    assert not is_deterministic("print(")
+    print("✅ 使用随机数/时间/hash的代码被识别为不确定")
+
+    # 子模块与别名
+    assert not is_deterministic("from numpy.random import rand\nprint(rand())")
+    assert not is_deterministic("import numpy.random as npr\nprint(npr.rand())")
+    assert not is_deterministic("from numpy import random as rnd\nprint(rnd.rand())")
+    assert not is_deterministic("import numpy as np\nrng = np.random.default_rng()\nprint(rng.integers(9))")
+    assert not is_deterministic("import pandas as pd\nprint(pd.DataFrame({'a': [1, 2]}).sample(1))")
+    assert is_deterministic("import numpy as np\nprint(np.arange(3).sum())")
+    print("✅ numpy/pandas 的随机数（子模块、别名导入）被识别为不确定")
+
+    # sklearn 未固定 random_state 时结果随机
+    code = ("from sklearn.model_selection import train_test_split\n"
+            "X_train, X_test = train_test_split(list(range(10)))\nprint(X_test)")
+    assert not is_deterministic(code)
+    assert not is_deterministic("import sklearn.cluster as cl\nprint(cl.KMeans(2))")
+    print("✅ sklearn 代码被识别为不确定")
+
+    # 集合的迭代顺序随哈希随机化变化
+    assert not is_deterministic('print({"a", "b"})')
+    assert not is_deterministic("print(set('abc'))")
+    assert not is_deterministic("print({c for c in 'abc'})")
+    assert is_deterministic("print({'a': 1, 'b': 2})")
+    print("✅ 打印集合的代码被识别为不确定")
+
+
+def test_cacheable_results():
+    """测试只缓存由代码决定的结果"""
+    print("\n测试可缓存结果...")
+
+    assert is_cacheable({"success": True, "stdout": "1\n"})
+    assert is_cacheable({"success": False, "error": "执行错误: ZeroDivisionError: division by zero"})
+    assert not is_cacheable({"success": False, "error": "执行超时（10秒）"})
+    assert not is_cacheable({"success": False, "error": "执行错误: MemoryError: "})
+    assert not is_cacheable({"success": False, "error": "安全检查失败", "violations": ["x"]})
+    print("✅ 超时、资源超限与安全违规不缓存")
+
+
+def test_memory_store_lru_ttl():
+    """测试内存存储的 LRU 与 TTL"""
+    print("\n测试内存存储...")
+
+    clock = FakeClock()
+    store = MemoryResultStore(max_entries=2, ttl=60, clock=clock)
+    store.put("a", "1")
+    store.put("b", "2")
+    assert store.get("a") == "1"   # a 变为最近使用
+    store.put("c", "3")            # 淘汰 b
+    assert store.get("b") is None
+    assert store.get("a") == "1" and store.get("c") == "3"
+
+    clock.now += 61
+    assert store.get("a") is None
+    print("✅ LRU 淘汰与过期正确")
+
+
+def test_sqlite_store_shared():
+    """测试 SQLite 存储在多个实例（工作进程）间共享并按上限淘汰"""
+    print("\n测试SQLite存储...")
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'results.db')
+        clock = FakeClock()
+        first = SQLiteResultStore(path, max_entries=3, ttl=60, clock=clock)
+        second = SQLiteResultStore(path, max_entries=3, ttl=60, clock=clock)
+
+        first.put("k", '{"success": true}')
+        assert second.get("k") == '{"success": true}'
+
+        for i in range(5):
+            clock.now += 1
+            first.put(f"k{i}", "{}")
+        assert first.evict() == 3
+        assert second.size() == 3 and second.get("k") is None
+
+        clock.now += 61
+        assert second.get("k4") is None
+    print("✅ 跨实例共享、淘汰与过期正确")
+
+
+def test_result_cache_hits():
+    """测试命中统计与不确定代码跳过"""
+    print("\n测试结果缓存...")
+
+    cache = ResultCache(MemoryResultStore(), fingerprint="v1")
+    code = "print(1)"
+    assert cache.get(code) is None
+    assert cache.put(code, {"success": True, "stdout": "1\n"})
+    hit = cache.get(code)
+    assert hit["stdout"] == "1\n" and hit["cached"] is True
+
+    assert not cache.put("import random\nprint(random.random())", {"success": True})
+    assert ResultCache(cache.store, fingerprint="v2").get(code) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["stores"] == 1 and stats["skipped"] == 1
+    assert stats["hit_rate"] == 0.5
+    print(f"✅ 缓存统计: {stats}")
+
+
+if __name__ == '__main__':
+    test_determinism()
+    test_cacheable_results()
+    test_memory_store_lru_ttl()
+    test_sqlite_store_shared()
+    test_result_cache_hits()
+    print("\n🎉 所有测试通过！")
@@ -140,6 +140,218 @@ def test_code_patterns():
         print(f"✅ 成功阻止模式: {code}")
 
 
+def test_analysis_cache():
+    """测试相同代码复用安全检查结论与编译结果"""
+    sandbox = CodeSandbox()
+    code = "print(sum(range(5)))"
+
+    first = sandbox.execute_safe(code)
+    second = sandbox.execute_safe(code)
+    first.pop("usage"), second.pop("usage")  # 资源使用每次不同
+    assert first == second and first["stdout"] == "10\n"
+    stats = sandbox.analyzer.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert sandbox.analyzer.analyze(code).compiled is not None
+    print("✅ 安全检查结论与编译结果被缓存")
+
+    result = sandbox.execute_safe("import os\nx.__class__")
+    assert result["violations"] == ["禁止导入危险模块: os"], "导入违规优先报告"
+    result = sandbox.execute_safe("x.__class__")
+    assert result["violations"] == ["禁止使用双下划线属性"]
+    print("✅ 违规项与原检查顺序一致")
+
+
+def test_worker_pool():
+    """测试工作进程池复用与回收"""
+    sandbox = CodeSandbox(pool_size=1, max_runs_per_worker=2)
+    try:
+        for _ in range(3):
+            result = sandbox.execute_safe("print(sum(range(10)))")
+            assert result["success"] and result["stdout"] == "45\n"
+        stats = sandbox._executor.stats()
+        assert stats["recycled"] >= 1, "达到最大执行次数后应回收工作进程"
+        print("✅ 工作进程复用与回收生效")
+
+        result = sandbox.execute_safe("while True:\n    pass", timeout=1)
+        assert not result["success"], "应该超时"
+        result = sandbox.execute_safe("print('ok')")
+        assert result["success"], "超时后应补充新的工作进程"
+        print("✅ 超时后工作进程被替换")
+    finally:
+        sandbox.shutdown()
+
+
+def test_worker_pool_isolation():
+    """测试复用的工作进程中，上一次执行对模块的修改不影响下一次执行"""
+    sandbox = CodeSandbox(pool_size=1, max_runs_per_worker=50)
+    try:
+        result = sandbox.execute_safe("import math\nmath.pi = 3\nmath.answer = 42\nprint(math.pi)")
+        assert result["success"] and result["stdout"] == "3\n"
+        result = sandbox.execute_safe(
+            "import math\nprint(math.pi > 3)\ntry:\n    math.answer\nexcept AttributeError:\n    print('gone')")
+        assert result["stdout"] == "True\ngone\n", "每次执行应互不影响"
+
+        sandbox.execute_safe("import builtins\nbuiltins.len = abs")
+        result = sandbox.execute_safe("print(len([1, 2]))")
+        assert result["stdout"] == "2\n", "内置函数应被还原"
+
+        sandbox.execute_safe("import decimal\ndecimal.getcontext().prec = 3")
+        result = sandbox.execute_safe("import decimal\nprint(decimal.Decimal(1) / 7)")
+        assert result["stdout"] == "0.1428571428571428571428571429\n", "decimal 上下文应被重置"
+
+        sandbox.execute_safe("import random\nrandom.seed(1)")
+        first = sandbox.execute_safe("import random\nprint(random.random())")["stdout"]
+        sandbox.execute_safe("import random\nrandom.seed(1)")
+        second = sandbox.execute_safe("import random\nprint(random.random())")["stdout"]
+        assert first != second, "上一次执行设置的随机种子不应延续"
+
+        assert sandbox._executor.stats()["recycled"] == 0, "以上执行应复用同一个工作进程"
+        print("✅ 工作进程复用时执行隔离生效")
+    finally:
+        sandbox.shutdown()
+
+
+def test_zygote():
+    """测试孵化进程：每次执行fork独立子进程"""
+    from security.zygote import fork_supported
+    if not fork_supported():
+        print("⚠️  当前平台不支持fork，跳过孵化进程测试")
+        return
+
+    sandbox = CodeSandbox(zygote=True, preload_modules=['math', 'json'])
+    try:
+        sandbox.warmup()
+        result = sandbox.execute_safe("import math\nmath.pi = 3\nprint(math.pi)")
+        assert result["success"] and result["stdout"] == "3\n"
+        result = sandbox.execute_safe("import math\nprint(math.pi > 3)")
+        assert result["stdout"] == "True\n", "每次执行应互不影响"
+        print("✅ 孵化进程执行隔离生效")
+
+        result = sandbox.execute_safe("while True:\n    pass", timeout=1)
+        assert not result["success"], "应该超时"
+        assert sandbox.execute_safe("print(1)")["success"]
+        print("✅ 孵化进程超时保护生效")
+    finally:
+        sandbox.shutdown()
+
+
+def test_output_limit():
+    """测试输出达到上限后立即终止执行并返回已捕获的部分"""
+    sandbox = CodeSandbox()
+    result = sandbox.execute_safe("while True:\n    print('x' * 100)", timeout=5)
+    assert not result["success"]
+    assert result.get("truncated"), "应标记输出被截断"
+    assert "超时" not in result["error"], "应在超时前终止"
+    assert len(result["stdout"].encode('utf-8')) <= sandbox.MAX_OUTPUT_SIZE + 64
+    assert result["stdout"].startswith('x' * 100)
+    print("✅ 输出上限生效，返回截断的输出")
+
+    # 用户代码 except Exception 无法吞掉输出上限
+    code = "while True:\n    try:\n        print('中' * 7)\n    except Exception:\n        pass"
+    result = sandbox.execute_safe(code, timeout=5)
+    assert result.get("truncated") and "超时" not in result["error"]
+    print("✅ 无法通过捕获异常绕过输出上限")
+
+    # 裸 except 能吞掉 BaseException：达到上限后执行进程直接返回结果并退出
+    from security.zygote import fork_supported
+    code = "while True:\n    try:\n        print('x' * 1000)\n    except:\n        pass"
+    sandboxes = [sandbox, CodeSandbox(pool_size=1)]
+    if fork_supported():
+        sandboxes.append(CodeSandbox(zygote=True, preload_modules=['math']))
+    try:
+        for each in sandboxes:
+            chunks = []
+            result = each.execute_safe(code, timeout=5, on_output=lambda stream, text: chunks.append(text))
+            assert result.get("truncated") and "超时" not in result["error"], result.get("error")
+            assert result["stdout"].startswith('x' * 1000) and chunks
+            assert each.execute_safe("print('ok')")["stdout"] == "ok\n", "之后的执行不受影响"
+    finally:
+        for each in sandboxes[1:]:
+            each.shutdown()
+    print("✅ 裸 except 也无法绕过输出上限")
+
+
+def test_large_result():
+    """测试大结果经管道可靠返回（父进程在等待期间持续读取）"""
+    sandbox = CodeSandbox()
+    sandbox.MAX_OUTPUT_SIZE = 8 * 1024 * 1024
+    result = sandbox.execute_safe("print('y' * (4 * 1024 * 1024))", timeout=10)
+    assert result["success"], result.get("error")
+    assert len(result["stdout"]) == 4 * 1024 * 1024 + 1
+    print("✅ 4MB 输出完整返回")
+
+
+def test_class_statements_and_exceptions():
+    """测试放开 class 语句与标准异常类后，受限内置函数与双下划线禁令仍然有效"""
+    sandbox = CodeSandbox()
+
+    allowed = [
+        ("class A:\n    x = 1\nprint(A.x)", "1\n"),
+        ("from dataclasses import dataclass\n@dataclass\nclass P:\n    x: int\nprint(P(2).x)", "2\n"),
+        ("try:\n    assert 1 == 2\nexcept AssertionError:\n    print('caught')", "caught\n"),
+        ("try:\n    import missing_mod\nexcept ImportError:\n    print('missing')", "missing\n"),
+    ]
+    for code, stdout in allowed:
+        result = sandbox.execute_safe(code)
+        assert result["success"], (code, result)
+        assert result["stdout"] == stdout
+    print("✅ class 语句与标准异常类可用")
+
+    # 类体与函数一样只能看到受限的内置函数
+    for code in ("class A:\n    f = open", "class A:\n    g = getattr", "class A:\n    v = vars"):
+        result = sandbox.execute_safe(code)
+        assert not result["success"] and "NameError" in result["error"], (code, result)
+
+    # 通过类或异常对象访问双下划线属性仍被禁止
+    for code in ("class A:\n    def __init__(self):\n        pass",
+                 "class A:\n    pass\nA.__subclasses__()",
+                 "try:\n    1 / 0\nexcept ZeroDivisionError as e:\n    e.__traceback__",
+                 "b = __build_class__"):
+        result = sandbox.execute_safe(code)
+        assert result.get("violations") == ["禁止使用双下划线属性"], (code, result)
+    print("✅ 类体无法取得危险内置函数，双下划线属性仍被禁止")
+
+
+def test_deeply_nested_code():
+    """测试嵌套过深的代码在分析阶段被拒绝或留到执行时报错，不会让Web进程抛出异常"""
+    sandbox = CodeSandbox()
+    for code in ("-" * 100000 + "1", "x = a" + "[0]" * 20000):
+        try:
+            sandbox.execute_safe(code)
+        except SecurityError as e:
+            assert "嵌套过深" in str(e)
+        else:
+            raise AssertionError("嵌套过深的代码应被拒绝")
+
+    # 能解析但编译时递归过深：不缓存编译结果，留到执行进程中重新编译
+    code = "x = " + "lambda: " * 2000 + "1"
+    assert sandbox.analyzer.analyze(code).compiled is None
+    assert "success" in sandbox.execute_safe(code)
+    print("✅ 嵌套过深的代码被安全处理")
+
+
+def test_memory_limit_over_inherited_baseline():
+    """测试 fork 出的执行进程在继承的虚拟内存之上再加内存上限：父进程很大时仍能运行，上限仍然生效"""
+    import mmap
+    if not os.path.exists('/proc/self/statm'):
+        print("⚠️  当前平台无法读取虚拟内存，跳过")
+        return
+
+    reserved = mmap.mmap(-1, 512 * 1024 * 1024)  # 只占地址空间，不占物理内存
+    try:
+        for sandbox in (CodeSandbox(), CodeSandbox(pool_size=1)):
+            try:
+                result = sandbox.execute_safe("x = bytearray(100 * 1024 * 1024)\nprint(len(x))")
+                assert result["success"], result
+                result = sandbox.execute_safe("x = bytearray(400 * 1024 * 1024)")
+                assert not result["success"], "超过 MAX_MEMORY_MB 的分配应失败"
+            finally:
+                sandbox.shutdown()
+    finally:
+        reserved.close()
+    print("✅ 内存上限按继承的虚拟内存计算")
+
+
 def run_all_tests():
     """运行所有测试"""
     print("=" * 60)
@@ -164,6 +376,31 @@ def run_all_tests():
         
         print("\n6️⃣  测试危险模式...")
         test_code_patterns()
+
+        print("\n7️⃣  测试安全检查缓存...")
+        test_analysis_cache()
+
+        print("\n8️⃣  测试工作进程池...")
+        test_worker_pool()
+        test_worker_pool_isolation()
+
+        print("\n9️⃣  测试孵化进程...")
+        test_zygote()
+
+        print("\n🔟 测试输出上限...")
+        test_output_limit()
+
+        print("\n1️⃣1️⃣ 测试大结果返回...")
+        test_large_result()
+
+        print("\n1️⃣2️⃣ 测试 class 语句与异常类...")
+        test_class_statements_and_exceptions()
+
+        print("\n1️⃣3️⃣ 测试嵌套过深的代码...")
+        test_deeply_nested_code()
+
+        print("\n1️⃣4️⃣ 测试继承虚拟内存时的内存上限...")
+        test_memory_limit_over_inherited_baseline()
         
         print("\n" + "=" * 60)
         print("✅ 所有安全测试通过！")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+生产环境启动配置测试
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import serve
+from security import config
+
+
+def test_worker_and_thread_counts():
+    """测试工作进程数与线程数的默认值和环境变量覆盖"""
+    print("\n测试工作进程数...")
+
+    saved = {name: os.environ.pop(name, None) for name in ('WEB_WORKERS', 'WEB_THREADS')}
+    try:
+        assert serve.worker_count() == 1, "进程内状态（任务、准入控制）要求默认单工作进程"
+        assert serve.thread_count() > config.MAX_CONCURRENT_EXECUTIONS + config.EXECUTION_QUEUE_SIZE
+
+        os.environ['WEB_WORKERS'] = '3'
+        os.environ['WEB_THREADS'] = '0'
+        assert serve.worker_count() == 3
+        assert serve.thread_count() == 1
+
+        os.environ['WEB_WORKERS'] = 'auto'
+        assert serve.worker_count() == serve.cpu_count()
+    finally:
+        for name, value in saved.items():
+            os.environ.pop(name, None)
+            if value is not None:
+                os.environ[name] = value
+    print("✅ 默认 1 个工作进程，环境变量可覆盖（auto 为CPU核数）")
+
+
+def test_workers_flag():
+    """测试 --workers 参数：整数或显式的 auto"""
+    print("\n测试--workers参数...")
+
+    assert serve.parse_workers('2') == 2
+    assert serve.parse_workers('0') == 1
+    assert serve.parse_workers('auto') == serve.cpu_count() >= 1
+    try:
+        serve.parse_workers('many')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("非法的进程数应报错")
+    print("✅ --workers 接受整数与 auto")
+
+
+def test_gunicorn_options():
+    """测试 gunicorn 配置：预加载、fork 后预热、超时覆盖批量评分"""
+    print("\n测试gunicorn配置...")
+
+    options = serve.gunicorn_options('127.0.0.1', 8080, workers=2, threads=8)
+    assert options['bind'] == '127.0.0.1:8080'
+    assert options['preload_app'] is True
+    assert options['worker_class'] == 'gthread'
+    assert options['post_fork'] is serve.post_fork
+    assert options['timeout'] > config.GRADE_TOTAL_TIMEOUT
+    print("✅ 配置正确")
+
+
+if __name__ == '__main__':
+    test_worker_and_thread_counts()
+    test_workers_flag()
+    test_gunicorn_options()
+    print("\n🎉 所有测试通过！")
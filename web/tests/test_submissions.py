@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+提交记录测试 - 验证批量写入、最近提交查询、按题目统计与过期清理
+"""
+
+import sys
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from submissions import SubmissionStore, classify, code_hash
+
+
+def test_classify():
+    """测试执行结果分类"""
+    assert classify({"success": True}) == 'success'
+    assert classify({"success": False, "error": "安全检查失败", "violations": ["os"]}) == 'rejected'
+    assert classify({"success": False, "error": "执行超时（10秒）"}) == 'timeout'
+    assert classify({"success": False, "error": "执行错误: ZeroDivisionError"}) == 'error'
+    print("✅ 结果分类正确")
+
+
+def test_recent_runs():
+    """测试最近提交按时间倒序、只返回本客户端的记录"""
+    with tempfile.TemporaryDirectory() as d:
+        now = [1000.0]
+        store = SubmissionStore(os.path.join(d, 'submissions.db'), clock=lambda: now[0])
+        for i in range(5):
+            now[0] += 1
+            store.record('alice', 'A', f"print({i})", 'success', queue_ms=0.5, run_ms=12.0)
+        store.record('bob', 'A', "1/0", 'error')
+        assert store.flush()
+
+        runs = store.recent('alice', limit=3)
+        assert [run["code_hash"] for run in runs] == [code_hash(f"print({i})") for i in (4, 3, 2)]
+        assert runs[0]["verdict"] == 'success' and runs[0]["cached"] is False
+        assert runs[0]["run_ms"] == 12.0
+        assert len(store.recent('bob')) == 1
+        assert store.recent('carol') == []
+        store.close()
+    print("✅ 最近提交查询正确")
+
+
+def test_set_stats():
+    """测试按题目统计提交数、通过率与人数"""
+    with tempfile.TemporaryDirectory() as d:
+        store = SubmissionStore(os.path.join(d, 'submissions.db'))
+        store.record('alice', 'A', "x", 'error', run_ms=10.0)
+        store.record('alice', 'A', "y", 'success', run_ms=20.0)
+        store.record('bob', 'A', "z", 'timeout', run_ms=30.0)
+        store.record('bob', 'B', "w", 'success', cached=True)
+        store.record('bob', None, "v", 'success')
+        assert store.flush()
+
+        stats = {item["set_id"]: item for item in store.set_stats()}
+        assert set(stats) == {'A', 'B'}
+        assert stats['A']["submissions"] == 3
+        assert stats['A']["passed"] == 1
+        assert stats['A']["clients"] == 2
+        assert stats['A']["solved_by"] == 1
+        assert stats['A']["avg_run_ms"] == 20.0
+        assert stats['B']["avg_run_ms"] is None
+        assert [item["set_id"] for item in store.set_stats('B')] == ['B']
+        store.close()
+    print("✅ 按题目统计正确")
+
+
+def test_batched_concurrent_writes():
+    """测试多线程提交由后台线程分批写入、不丢记录"""
+    with tempfile.TemporaryDirectory() as d:
+        store = SubmissionStore(os.path.join(d, 'submissions.db'))
+
+        def work(n):
+            for i in range(500):
+                store.record(f"client-{n}", 'A', f"{n}-{i}", 'success')
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        enqueue_seconds = time.perf_counter() - started
+        assert store.flush(timeout=30)
+
+        stats = store.stats()
+        assert stats["written"] == 4000 and stats["dropped"] == 0
+        assert stats["batches"] < 4000
+        assert store.set_stats('A')[0]["submissions"] == 4000
+        store.close()
+    print(f"✅ 4000条提交分 {stats['batches']} 批写入（入队耗时 {enqueue_seconds:.3f}秒）")
+
+
+def test_single_writer_thread():
+    """测试多个线程同时首次提交时只启动一个写入线程"""
+
+    class CountingStore(SubmissionStore):
+        loops = 0
+
+        def _write_loop(self):
+            with self._cond:
+                self.loops += 1
+            super()._write_loop()
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # 频繁切换线程，放大检查与启动之间的竞争窗口
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            for attempt in range(20):
+                store = CountingStore(os.path.join(d, f'submissions-{attempt}.db'))
+                barrier = threading.Barrier(16)
+
+                def work(n):
+                    barrier.wait()
+                    store.record(f"client-{n}", 'A', str(n), 'success')
+
+                threads = [threading.Thread(target=work, args=(n,)) for n in range(16)]
+                for t in threads:
+                    t.start()
+                for t in threads:
+                    t.join()
+                assert store.flush(timeout=10)
+                store.close()
+                assert store.loops == 1, f"第{attempt}轮启动了 {store.loops} 个写入线程"
+                assert store.stats()["written"] == 16
+    finally:
+        sys.setswitchinterval(interval)
+    print("✅ 并发首次提交只启动一个写入线程")
+
+
+def test_queue_full_and_prune():
+    """测试队列满时丢弃、关闭后不再接收、过期记录清理"""
+    with tempfile.TemporaryDirectory() as d:
+        now = [0.0]
+        store = SubmissionStore(os.path.join(d, 'submissions.db'), max_queue=2,
+                                retention_days=1, clock=lambda: now[0])
+        store._stop.set()  # 不启动写入线程，记录留在队列中
+        assert not store.record('alice', 'A', "x", 'success')
+        store._stop.clear()
+
+        store.start_writer = lambda: None
+        assert store.record('alice', 'A', "x", 'success')
+        assert store.record('alice', 'A', "y", 'success')
+        assert not store.record('alice', 'A', "z", 'success')
+        assert store.stats()["dropped"] == 1
+
+        del store.start_writer
+        assert store.flush()
+        now[0] = 86400 * 2
+        assert store.prune() == 2
+        store.close()
+        assert not store.record('alice', 'A', "w", 'success')
+    print("✅ 队列满丢弃、过期清理正确")
+
+
+if __name__ == '__main__':
+    test_classify()
+    test_recent_runs()
+    test_set_stats()
+    test_batched_concurrent_writes()
+    test_single_writer_thread()
+    test_queue_full_and_prune()
+    print("\n🎉 所有测试通过！")
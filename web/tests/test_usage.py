@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+资源使用统计测试
+"""
+
+import sys
+from pathlib import Path
+
+# 添加父目录到路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from security.sandbox import CodeSandbox
+from security.usage import UsageStats
+
+
+def test_run_reports_usage():
+    """测试执行结果包含资源使用"""
+    print("\n测试执行资源使用...")
+
+    sandbox = CodeSandbox()
+    result = sandbox.execute_safe("x = sum(range(10 ** 6))\nprint(x)")
+    usage = result["usage"]
+    assert set(usage) == {"wall_ms", "user_ms", "system_ms", "peak_rss_kb",
+                          "baseline_rss_kb", "output_bytes"}
+    assert usage["wall_ms"] > 0
+    assert usage["output_bytes"] == len("499999500000\n")
+    print(f"✅ 资源使用: {usage}")
+
+
+def test_pool_peak_rss_per_run():
+    """测试复用的工作进程按次统计峰值内存"""
+    print("\n测试按次峰值内存...")
+
+    sandbox = CodeSandbox(pool_size=1)
+    try:
+        big = sandbox.execute_safe("x = bytearray(64 * 1024 * 1024)\nprint(len(x))")
+        small = sandbox.execute_safe("print(1)")
+    finally:
+        sandbox.shutdown()
+
+    assert big["usage"]["peak_rss_kb"] >= 64 * 1024
+    if Path('/proc/self/clear_refs').exists():
+        assert small["usage"]["peak_rss_kb"] < big["usage"]["peak_rss_kb"]
+    print("✅ 峰值内存按次统计")
+
+
+def test_peak_rss_excludes_preloaded_modules():
+    """测试峰值内存不包含孵化进程预加载、子进程继承的内存"""
+    print("\n测试峰值内存扣除基线...")
+
+    sandbox = CodeSandbox()
+    try:
+        usage = sandbox.execute_safe("print(1)")["usage"]
+    finally:
+        sandbox.shutdown()
+
+    if Path('/proc/self/status').exists():
+        assert usage["baseline_rss_kb"] > 0
+        assert usage["peak_rss_kb"] < 16 * 1024, usage
+        assert usage["peak_rss_kb"] < usage["baseline_rss_kb"]
+    print(f"✅ print(1) 峰值 {usage['peak_rss_kb']}KB（基线 {usage['baseline_rss_kb']}KB 不计入）")
+
+
+def test_usage_summary():
+    """测试服务端汇总与分位数"""
+    print("\n测试资源使用汇总...")
+
+    stats = UsageStats(sample_size=100)
+    for i in range(1, 101):
+        stats.record({"wall_ms": float(i), "user_ms": 1.0, "system_ms": 0.0,
+                      "peak_rss_kb": 1000 + i, "output_bytes": 10})
+    stats.record(None)
+
+    summary = stats.summary()
+    wall = summary["metrics"]["wall_ms"]
+    assert summary["runs"] == 100
+    assert wall["p50"] == 50 and wall["p95"] == 95 and wall["max"] == 100
+    assert summary["metrics"]["output_bytes"]["total"] == 1000
+    assert summary["limits"]["max_memory_mb"] == 256
+    print("✅ 汇总与分位数正确")
+
+
+if __name__ == '__main__':
+    test_run_reports_usage()
+    test_pool_peak_rss_per_run()
+    test_peak_rss_excludes_preloaded_modules()
+    test_usage_summary()
+    print("\n🎉 所有测试通过！")
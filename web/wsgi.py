@@ -0,0 +1,10 @@
+"""
+WSGI 入口 - 供其他 WSGI 服务器使用，例如:
+
+    gunicorn -c python:serve wsgi:application --preload
+
+以 serve 模块作为 gunicorn 配置时同样会在 fork 后调用 post_fork 预热沙箱；
+其他服务器下沙箱执行器在首次执行时启动。推荐直接运行 serve.py。
+"""
+
+from app import app as application, warm_up  # noqa: F401